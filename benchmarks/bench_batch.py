@@ -0,0 +1,80 @@
+"""
+Batch conversion against the scalar path: times convert_columns and
+convert_units over the same archive, for every windchill mode.  That
+they agree row by row is checked by tests/test_batch.py.
+
+The batch is timed from raw string columns, which still pay for
+parsing every value, and, with NumPy installed, from columns already
+stored as NumPy arrays of the input types, which is all array work.
+
+Usage: python -m benchmarks.bench_batch [packets]
+"""
+import random
+import sys
+import time
+
+from pyecowitt import (
+    EcoWittListener,
+    WINDCHILL_OLD,
+    WINDCHILL_NEW,
+    WINDCHILL_HYBRID,
+)
+from pyecowitt.batch import (
+    convert_columns,
+    numpy,
+    packets_to_columns,
+)
+from pyecowitt.convert import INPUT_CASTS
+from pyecowitt.fake_client import paramset_b
+
+
+def archive(count, seed=1):
+    """count uploads of paramset_b's shape, values on a random walk."""
+    rnd = random.Random(seed)
+    packet = dict(paramset_b, humidity1=50, temp1f=60.0,
+                  windspeedmph=5.0, tempf=40.0)
+    packets = []
+    for _ in range(count):
+        for key, value in packet.items():
+            if type(value) is float:
+                packet[key] = round(max(0.0, value + rnd.uniform(-1, 1)), 1)
+            elif type(value) is int and key.startswith("humid"):
+                packet[key] = min(100, max(1, value + rnd.randint(-2, 2)))
+        packets.append({k: str(v) for k, v in packet.items()})
+    return packets
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    packets = archive(count)
+    # archives are usually stored by column already
+    raw_columns = packets_to_columns(packets)
+    typed_columns = None
+    if numpy is not None:
+        typed_columns = {
+            key: numpy.array(list(map(INPUT_CASTS[key], values)))
+            if INPUT_CASTS.get(key) in (int, float) else values
+            for key, values in raw_columns.items()}
+    ws = EcoWittListener()
+
+    for mode in (WINDCHILL_OLD, WINDCHILL_NEW, WINDCHILL_HYBRID):
+        ws.set_windchill(mode)
+        t = time.perf_counter()
+        scalar = [ws.convert_units(dict(p)) for p in packets]
+        t_scalar = time.perf_counter() - t
+
+        t = time.perf_counter()
+        columns = convert_columns(raw_columns, mode)
+        t_batch = time.perf_counter() - t
+
+        line = ("windchill {0}: {1} packets, scalar {2:.2f} us/packet,"
+                " batch {3:.2f} us/packet".format(
+                    mode, count, t_scalar / count * 1e6,
+                    t_batch / count * 1e6))
+        if typed_columns is not None:
+            t = time.perf_counter()
+            convert_columns(typed_columns, mode)
+            t_typed = time.perf_counter() - t
+            line += ", from numpy {0:.2f} us/packet".format(
+                t_typed / count * 1e6)
+        print(line)
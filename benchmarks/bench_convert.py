@@ -0,0 +1,44 @@
+"""
+Per-packet timing of EcoWittListener.convert_units using the
+fake_client.py paramsets, next to the convert_units the package had
+before conversion plans (legacy_convert.py) on the same payloads.
+The current converter also derives heat index, feels like, VPD and
+absolute humidity, which the baseline did not; both sides are timed as
+they are.
+
+Usage: python -m benchmarks.bench_convert [iterations]
+"""
+import sys
+import timeit
+
+from pyecowitt import EcoWittListener
+from pyecowitt.fake_client import paramset_a, paramset_b
+
+from .fixtures import as_posted
+from .legacy_convert import LegacyConverter
+
+
+def bench(convert_units, payload, iterations):
+    """Return the best per-packet time in microseconds."""
+    # convert_units works in place, so every run gets a fresh copy; the
+    # cost of the copy is measured separately and subtracted.
+    copy_t = min(timeit.repeat(lambda: dict(payload), number=iterations,
+                               repeat=5))
+    conv_t = min(timeit.repeat(lambda: convert_units(dict(payload)),
+                               number=iterations, repeat=5))
+    return (conv_t - copy_t) / iterations * 1e6
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ws = EcoWittListener()
+    legacy = LegacyConverter(ws.windchill_type)
+    print("{0:12s} {1:>5s} {2:>12s} {3:>12s} {4:>8s}".format(
+        "payload", "keys", "baseline us", "current us", "speedup"))
+    for name, paramset in [("paramset_a", paramset_a),
+                           ("paramset_b", paramset_b)]:
+        payload = as_posted(paramset)
+        old = bench(legacy.convert_units, payload, iterations)
+        new = bench(ws.convert_units, payload, iterations)
+        print("{0:12s} {1:5d} {2:12.2f} {3:12.2f} {4:7.2f}x".format(
+            name, len(paramset), old, new, old / new))
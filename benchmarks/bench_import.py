@@ -0,0 +1,65 @@
+"""
+Import cost of each part of the package, with python -X importtime.
+
+Every import runs in a fresh interpreter, n times; the figure kept is
+the cumulative time of everything the import pulled in, the package
+__init__ included, but not the interpreter's own startup.
+The package is byte-compiled first so that no run pays for compiling.
+Also shows whether aiohttp or asyncio came along.
+
+Usage: python -m benchmarks.bench_import [n]
+"""
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+
+import pyecowitt
+
+MODULES = (
+    "pyecowitt",
+    "pyecowitt.sensor_map",
+    "pyecowitt.convert",
+    "pyecowitt.batch",
+    "pyecowitt.station",
+    "pyecowitt.ecowitt",
+)
+HEAVY = ("asyncio", "aiohttp")
+
+
+def import_time(module):
+    """Return (cumulative microseconds, heavy modules loaded) for one
+    import of module in a new interpreter."""
+    code = "import sys, {0}; print(' '.join(m for m in {1!r} " \
+           "if m in sys.modules))".format(module, HEAVY)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=True)
+    usec = None
+    for line in proc.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) != 3 or fields[2].startswith("  "):
+            continue
+        # top level imports: site's are startup, the rest are ours
+        if fields[2].strip() == "site":
+            usec = 0
+        elif usec is not None:
+            usec += int(fields[1])
+    if usec is None:
+        raise RuntimeError("no importtime output for " + module)
+    return usec, proc.stdout.split()
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    compileall.compile_dir(os.path.dirname(pyecowitt.__file__), quiet=1)
+    print("{0:24s} {1:>10s} {2:>10s}  {3}".format(
+        "module", "min ms", "median ms", "loads"))
+    for module in MODULES:
+        times = []
+        for _ in range(runs):
+            usec, heavy = import_time(module)
+            times.append(usec / 1000)
+        print("{0:24s} {1:10.2f} {2:10.2f}  {3}".format(
+            module, min(times), statistics.median(times),
+            " ".join(heavy) or "-"))
@@ -0,0 +1,46 @@
+"""
+Memory used by the sensor registry, per sensor and per station, measured
+with tracemalloc.
+
+Usage: python -m benchmarks.bench_memory [stations]
+"""
+import sys
+import tracemalloc
+
+from pyecowitt import EcoWittListener
+from pyecowitt.fake_client import paramset_b
+
+
+def station_payload(n):
+    """paramset_b as posted by the n'th station."""
+    payload = {k: str(v) for k, v in paramset_b.items()}
+    payload["PASSKEY"] = "{0:032X}".format(n)
+    return payload
+
+
+def measure(stations):
+    """Return (bytes, sensor count) for one registry per station."""
+    listeners = [EcoWittListener() for _ in range(stations)]
+    payloads = [listeners[0].convert_units(station_payload(n))
+                for n in range(stations)]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for ws, payload in zip(listeners, payloads):
+        ws.parse_ws_data(payload)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    used = sum(stat.size_diff for stat in after.compare_to(before,
+                                                           "filename"))
+    sensors = sum(len(ws.sensors) for ws in listeners)
+    return used, sensors
+
+
+if __name__ == "__main__":
+    stations = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    used, sensors = measure(stations)
+    print("{0} stations, {1} sensors, {2} bytes".format(
+        stations, sensors, used))
+    print("per station: {0:.0f} bytes".format(used / stations))
+    print("per sensor: {0:.0f} bytes".format(used / sensors))
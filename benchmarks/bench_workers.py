@@ -0,0 +1,163 @@
+"""
+Ingest throughput of EcoWittListener with 1..N worker processes sharing
+the port with SO_REUSEPORT.
+
+Each run starts a listener in its own process, then several client
+processes post paramset_b as fast as the server acknowledges it.
+
+Only decoding and converting run in the workers.  Routing, station
+state, history and stats, storage and listener dispatch stay in the
+listener's own process, so that process's core is the ceiling however
+many workers there are.  Each run prints the CPU, as a share of one
+core, of the listener process and of every worker (from /proc, so on
+Linux only), which shows which side is saturated.
+
+Usage: python -m benchmarks.bench_workers [max_workers] [seconds]
+"""
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import time
+import urllib.parse
+
+import aiohttp
+
+from pyecowitt import EcoWittListener
+from pyecowitt.fake_client import paramset_b
+
+PORT = 4299
+CONCURRENCY = 32
+SERIAL_STAGES = ("routing", "station state", "history/stats", "storage",
+                 "listener dispatch")
+
+
+def serve(workers):
+    ws = EcoWittListener(port=PORT, fast_decode=True, multi_station=True,
+                         workers=workers)
+    asyncio.run(ws.listen())
+
+
+def _stat(pid):
+    """The fields of /proc/<pid>/stat after the command name."""
+    with open("/proc/{0}/stat".format(pid)) as f:
+        return f.read().rsplit(")", 1)[1].split()
+
+
+def cpu_seconds(pid):
+    """CPU time pid has used, user plus system, or None."""
+    try:
+        fields = _stat(pid)
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def worker_pids(pid):
+    """The ingest worker processes pid has spawned."""
+    pids = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            ppid = int(_stat(entry)[1])
+            with open("/proc/{0}/cmdline".format(entry), "rb") as f:
+                cmdline = f.read()
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid and b"spawn_main" in cmdline:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def cpu_share(before, after, seconds):
+    """Per-process CPU over a run, as a percentage of one core."""
+    if before is None or after is None:
+        return None
+    return (after - before) / seconds * 100
+
+
+def wait_for_port():
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", PORT)).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+
+
+async def blast(client, seconds):
+    body = urllib.parse.urlencode(dict(paramset_b,
+                                       PASSKEY="{0:032X}".format(client)))
+    headers = {"Content-type": "application/x-www-form-urlencoded"}
+    url = "http://127.0.0.1:{0}/".format(PORT)
+    deadline = time.monotonic() + seconds
+    count = 0
+
+    async def one():
+        nonlocal count
+        while time.monotonic() < deadline:
+            async with session.post(url, data=body, headers=headers) as r:
+                await r.read()
+                if r.status == 200:
+                    count += 1
+
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*[one() for _ in range(CONCURRENCY)])
+    return count
+
+
+def client_main(client, seconds):
+    return asyncio.run(blast(client, seconds))
+
+
+def run(workers, clients, seconds):
+    """Return (packets/sec, listener process CPU %, [worker CPU %])."""
+    server = multiprocessing.Process(target=serve, args=(workers,))
+    server.start()
+    try:
+        wait_for_port()
+        pids = [server.pid]
+        if workers > 1:
+            pids.extend(worker_pids(server.pid))
+        before = [cpu_seconds(pid) for pid in pids]
+        start = time.monotonic()
+        with multiprocessing.Pool(clients) as pool:
+            counts = pool.starmap(client_main,
+                                  [(c, seconds) for c in range(clients)])
+        elapsed = time.monotonic() - start
+        after = [cpu_seconds(pid) for pid in pids]
+    finally:
+        server.terminate()
+        server.join()
+        # give a supervisor's workers time to release the port
+        time.sleep(0.5)
+    shares = [cpu_share(b, a, elapsed) for b, a in zip(before, after)]
+    return sum(counts) / seconds, shares[0], shares[1:]
+
+
+def percent(share):
+    return "n/a" if share is None else "{0:.0f}%".format(share)
+
+
+if __name__ == "__main__":
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    clients = max(1, os.cpu_count() // 2)
+    print("{0} cpus, {1} client processes".format(os.cpu_count(), clients))
+    print("single process in the listener, whatever the workers: " +
+          ", ".join(SERIAL_STAGES))
+    workers = 1
+    while workers <= max_workers:
+        rate, parent, shares = run(workers, clients, seconds)
+        print("{0} workers: {1:.0f} packets/sec, cpu: listener {2}"
+              "{3}".format(workers, rate, percent(parent),
+                           ", workers " + " ".join(map(percent, shares))
+                           if shares else ""))
+        workers *= 2
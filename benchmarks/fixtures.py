@@ -0,0 +1,82 @@
+"""
+Reproducible payloads for the benchmarks.
+
+paramset_a and paramset_b are the fake_client.py uploads; maximal has a
+plausible value for every SENSOR_MAP key, so it exercises every
+conversion step and every sensor at once.  Payloads are as posted: all
+values are strings.
+"""
+from pyecowitt.fake_client import paramset_a, paramset_b
+from pyecowitt.sensor_map import MAP_STYPE, SENSOR_MAP
+
+# a raw value per stype, as a gateway would post it
+STYPE_SAMPLES = {
+    "pressure_hpa": "1012.4",
+    "pressure_inhg": "29.785",
+    "rate_mm": "0.0",
+    "rate_inches": "0.118",
+    "humidity": "52",
+    "degree": "260",
+    "speed_kph": "11.1",
+    "speed_mph": "6.9",
+    "speed_mps": "3.1",
+    "temperature_c": "19.3",
+    "temperature_f": "66.8",
+    "watt_meters_squared": "375.53",
+    "uv_index": "3",
+    "pm25": "8.0",
+    "timestamp": "1605541824",
+    "count": "3",
+    "distance_km": "14",
+    "distance_miles": "9",
+    "binary": "0",
+    "pm10": "24.7",
+    "voltage": "1.40",
+    "battery_percentage": "5",
+    "length_inches": "6.268",
+    "length_mm": "159.2",
+    "co2_ppm": "455",
+    "pressure_kpa": "0.064",
+    "absolute_humidity": "7.77",
+}
+INTERNAL_SAMPLES = {
+    "PASSKEY": paramset_b["PASSKEY"],
+    "stationtype": "EasyWeatherV1.5.4",
+    "dateutc": "2020-11-16+15:30:24",
+    "freq": "868M",
+    "model": "HP1000SE-PRO_Pro_V1.6.0",
+    "mac": "AA:BB:CC:DD:EE:FF",
+    "fields": "",
+    "runtime": "12345",
+    "ws90_ver": "126",
+}
+
+
+def as_posted(paramset):
+    """A gateway posts every value as a string."""
+    return {k: str(v) for k, v in paramset.items()}
+
+
+def maximal():
+    """A payload with every SENSOR_MAP key."""
+    payload = {}
+    for key, entry in SENSOR_MAP.items():
+        if key in INTERNAL_SAMPLES:
+            payload[key] = INTERNAL_SAMPLES[key]
+        else:
+            payload[key] = STYPE_SAMPLES[entry[MAP_STYPE].name]
+    return payload
+
+
+def station_payload(payload, n):
+    """payload as posted by the n'th station."""
+    payload = dict(payload)
+    payload["PASSKEY"] = "{0:032X}".format(n)
+    return payload
+
+
+PAYLOADS = {
+    "paramset_a": as_posted(paramset_a),
+    "paramset_b": as_posted(paramset_b),
+    "maximal": maximal(),
+}
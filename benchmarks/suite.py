@@ -0,0 +1,220 @@
+"""
+Benchmark suite for the ingest hot paths.
+
+Covers convert_units and parse_ws_data on each fixture payload,
+find_sensor at several registry sizes, and the whole handler through
+aiohttp's test client.  For each it reports packets/sec, p50 and p99
+latency, and, from a separate tracemalloc pass, the peak bytes allocated
+while handling one packet and the blocks still held after it.  The
+handler's allocation figures include the test client's own.
+
+Usage: python -m benchmarks.suite [-n iterations] [-o results.json]
+                                  [-c baseline.json] [-k filter]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import time
+import tracemalloc
+import urllib.parse
+
+from aiohttp.test_utils import RawTestServer, TestClient
+
+import pyecowitt
+from pyecowitt import EcoWittListener, EcoWittSensor
+
+from .fixtures import PAYLOADS
+
+REGISTRY_SIZES = (10, 100, 1000, 10000)
+# calls traced per case for allocations; tracing is slow
+ALLOC_ITERATIONS = 200
+
+
+def summarize(latencies_ns, total_ns):
+    """packets/sec and latency percentiles from per-call times."""
+    latencies_ns = sorted(latencies_ns)
+    n = len(latencies_ns)
+    return {
+        "iterations": n,
+        "packets_per_sec": n / (total_ns / 1e9),
+        "p50_us": latencies_ns[n // 2] / 1e3,
+        "p99_us": latencies_ns[min(n - 1, n * 99 // 100)] / 1e3,
+    }
+
+
+def time_calls(func, inputs):
+    """Time func(x) for each x in inputs."""
+    clock = time.perf_counter_ns
+    latencies = []
+    start = clock()
+    for x in inputs:
+        t = clock()
+        func(x)
+        latencies.append(clock() - t)
+    return latencies, clock() - start
+
+
+def trace_calls(func, inputs):
+    """Mean peak bytes and retained blocks per call of func(x)."""
+    tracemalloc.start()
+    peak = 0
+    before = tracemalloc.take_snapshot()
+    for x in inputs:
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func(x)
+        peak += tracemalloc.get_traced_memory()[1] - current
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff
+                 for stat in after.compare_to(before, "filename"))
+    n = len(inputs)
+    return {"alloc_peak_bytes": peak / n, "retained_blocks": blocks / n}
+
+
+def bench_sync(func, make_input, iterations):
+    # inputs are built up front, outside the timed and traced calls
+    result = summarize(*time_calls(func, [make_input(i)
+                                          for i in range(iterations)]))
+    result.update(trace_calls(func, [make_input(i)
+                                     for i in range(ALLOC_ITERATIONS)]))
+    return result
+
+
+def bench_convert_units(payload, iterations):
+    ws = EcoWittListener()
+    # convert_units works in place
+    return bench_sync(ws.convert_units, lambda i: dict(payload), iterations)
+
+
+def bench_parse_ws_data(payload, iterations):
+    ws = EcoWittListener()
+    data = ws.convert_units(dict(payload))
+    # steady state: every sensor already registered
+    ws.parse_ws_data(data)
+    return bench_sync(ws.parse_ws_data, lambda i: data, iterations)
+
+
+def bench_find_sensor(size, iterations):
+    ws = EcoWittListener()
+    keys = ["sensor{0}".format(n) for n in range(size)]
+    for key in keys:
+        ws.sensors.add(EcoWittSensor(key, key, 0, "internal"))
+    return bench_sync(ws.find_sensor, lambda i: keys[i * 7919 % size],
+                      iterations)
+
+
+async def _bench_handler(payload, iterations, fast_decode):
+    ws = EcoWittListener(fast_decode=fast_decode)
+    body = urllib.parse.urlencode(payload).encode("ascii")
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    async with TestClient(RawTestServer(ws.handler)) as client:
+        async def post():
+            async with client.post("/", data=body, headers=headers) as r:
+                await r.read()
+
+        await post()
+        clock = time.perf_counter_ns
+        latencies = []
+        start = clock()
+        for _ in range(iterations):
+            t = clock()
+            await post()
+            latencies.append(clock() - t)
+        result = summarize(latencies, clock() - start)
+
+        tracemalloc.start()
+        peak = 0
+        before = tracemalloc.take_snapshot()
+        for _ in range(ALLOC_ITERATIONS):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await post()
+            peak += tracemalloc.get_traced_memory()[1] - current
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff
+                 for stat in after.compare_to(before, "filename"))
+    result["alloc_peak_bytes"] = peak / ALLOC_ITERATIONS
+    result["retained_blocks"] = blocks / ALLOC_ITERATIONS
+    return result
+
+
+def bench_handler(payload, iterations, fast_decode=False):
+    return asyncio.run(_bench_handler(payload, iterations, fast_decode))
+
+
+def cases(iterations):
+    """Yield (name, thunk) for every benchmark."""
+    for name, payload in PAYLOADS.items():
+        yield ("convert_units/" + name,
+               lambda p=payload: bench_convert_units(p, iterations))
+    for name, payload in PAYLOADS.items():
+        yield ("parse_ws_data/" + name,
+               lambda p=payload: bench_parse_ws_data(p, iterations))
+    for size in REGISTRY_SIZES:
+        yield ("find_sensor/{0}".format(size),
+               lambda s=size: bench_find_sensor(s, iterations))
+    # a request is ~100x a conversion; keep the run time sane
+    requests = max(1, iterations // 20)
+    for name, payload in PAYLOADS.items():
+        yield ("handler/" + name,
+               lambda p=payload: bench_handler(p, requests))
+        yield ("handler_fast/" + name,
+               lambda p=payload: bench_handler(p, requests, True))
+
+
+def run(iterations, name_filter=None):
+    results = {}
+    for name, thunk in cases(iterations):
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = thunk()
+        report(name, results[name])
+    return {
+        "version": pyecowitt.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "iterations": iterations,
+        "results": results,
+    }
+
+
+def report(name, result, baseline=None):
+    line = ("{0:28} {1:>10.0f}/s  p50 {2:>8.1f}us  p99 {3:>8.1f}us  "
+            "peak {4:>8.0f}B  retained {5:>5.1f}").format(
+                name, result["packets_per_sec"], result["p50_us"],
+                result["p99_us"], result["alloc_peak_bytes"],
+                result["retained_blocks"])
+    if baseline is not None:
+        line += "  {0:+.1f}%".format(
+            (result["packets_per_sec"] / baseline["packets_per_sec"] - 1)
+            * 100)
+    print(line)
+
+
+def compare(current, baseline):
+    print("\nvs {0} (python {1}):".format(baseline["version"],
+                                           baseline["python"]))
+    for name, result in current["results"].items():
+        report(name, result, baseline["results"].get(name))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--iterations", type=int, default=20000)
+    parser.add_argument("-o", "--output", help="save results as JSON")
+    parser.add_argument("-c", "--compare",
+                        help="JSON results to compare packets/sec with")
+    parser.add_argument("-k", "--filter",
+                        help="only run benchmarks whose name contains this")
+    args = parser.parse_args()
+
+    current = run(args.iterations, args.filter)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(current, json.load(f))
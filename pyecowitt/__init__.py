@@ -13,12 +13,43 @@ __license__ = "Apache 2.0"
 
 __copyright__ = "Copyright (c) 2020,2021 Tim Rightnour"
 
-from .ecowitt import (
-    EcoWittSensor,
-    EcoWittListener,
-    WINDCHILL_OLD,
-    WINDCHILL_NEW,
-    WINDCHILL_HYBRID,
-)
+# name -> submodule defining it.  Imported on first use, so the sensor
+# map and the conversion math load without aiohttp and asyncio.
+_LAZY = {
+    "EcoWittSensor": "registry",
+    "EcoWittSensorRegistry": "registry",
+    "EcoWittStation": "station",
+    "EcoWittHistoryLog": "storage",
+    "EcoWittListener": "ecowitt",
+    "WINDCHILL_OLD": "convert",
+    "WINDCHILL_NEW": "convert",
+    "WINDCHILL_HYBRID": "convert",
+    "LISTENER_COALESCE": "dispatch",
+    "LISTENER_DROP_NEWEST": "dispatch",
+    "LISTENER_DROP_OLDEST": "dispatch",
+    "INGEST_DROP_OLDEST": "ingest",
+    "INGEST_REJECT": "ingest",
+    "PROFILE_CPROFILE": "profiling",
+    "PROFILE_SAMPLING": "profiling",
+    "SYSTEM_METRIC": "sensor_map",
+    "SYSTEM_IMPERIAL": "sensor_map",
+    "SYSTEM_METRIC_MS": "sensor_map",
+}
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(
+            __name__, name))
+    from importlib import import_module
+    value = getattr(import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 if __name__ == '__main__': print(__version__)
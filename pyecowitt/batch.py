@@ -0,0 +1,159 @@
+"""
+Batch conversion of archived uploads, a column at a time.
+
+Reprocessing history through convert_units pays for a dict, a plan
+lookup and every step dispatch once per packet.  convert_columns takes
+columns keyed by the raw Ecowitt field names instead (lists, stdlib
+arrays or NumPy arrays), and runs each conversion step once over whole
+columns.
+
+With NumPy installed, casts, unit scaling and the derived values are
+array operations, rounded exactly as round() rounds; the few rows where
+NumPy's exp, log or pow could tip a value over a rounding tie are redone
+in Python, so results match the scalar path exactly (see
+convert._vectorized).  Without it, or for a step with no array
+version, the step runs per value with the scalar math.  Neither path
+uses the converter's derived value caches.
+"""
+
+from array import array
+
+from .convert import (
+    CONVERSION_STEPS,
+    WINDCHILL_HYBRID,
+    select_steps,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _as_list(column):
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return column.tolist()
+    return list(column)
+
+
+_TYPECODES = {float: 'd', int: 'q'}
+
+
+def _cast_column(column, cast):
+    """Apply a step's cast to a column, as a NumPy array for int and
+    float when NumPy is available."""
+    dtype = None
+    if numpy is not None:
+        dtype = {float: numpy.float64, int: numpy.int64}.get(cast)
+    if dtype is None:
+        return list(map(cast, _as_list(column)))
+    if isinstance(column, array):
+        column = _to_numpy(column)
+    if isinstance(column, numpy.ndarray) and column.dtype.kind in "biuf":
+        return column.astype(dtype)
+    # strings, as posted: parsed by int() and float() themselves
+    return numpy.fromiter(map(cast, _as_list(column)), dtype, len(column))
+
+
+def _from_numpy(column):
+    """A NumPy result column as a stdlib array, for callers that did not
+    pass NumPy in."""
+    typecode = {'f': 'd', 'i': 'q'}.get(column.dtype.kind)
+    if typecode is None:
+        return column.tolist()
+    return array(typecode, column.astype(typecode).tobytes())
+
+
+def _pack(values):
+    """Store a column as array('d'), array('q') or, if mixed, a list."""
+    types = set(map(type, values))
+    if len(types) == 1:
+        typecode = _TYPECODES.get(types.pop())
+        if typecode is not None:
+            return array(typecode, values)
+    return values
+
+
+def _to_numpy(column):
+    if isinstance(column, array):
+        return numpy.frombuffer(column, dtype=column.typecode)
+    return column
+
+
+def packets_to_columns(packets):
+    """Turn a list of packets of one shape into columns of raw values."""
+    if not packets:
+        return {}
+    keys = list(packets[0])
+    shape = set(keys)
+    for packet in packets:
+        if set(packet) != shape:
+            raise ValueError("packets_to_columns needs packets of one shape")
+    return {key: [packet[key] for packet in packets] for key in keys}
+
+
+def columns_to_packets(columns):
+    """Turn columns back into a list of packets, one dict per row."""
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+def convert_columns(columns, windchill_type=WINDCHILL_HYBRID,
+                    steps=CONVERSION_STEPS, systems=None):
+    """Convert columns of raw values, returning a new dict of columns.
+
+    The result has the same keys, in the same order, that convert_units
+    would give each row; systems limits them to those unit systems, as
+    EcoWittConverter does.  Numeric columns come back as stdlib arrays, or
+    as NumPy arrays if any input column was one.  Rows where a derived
+    value does not apply (an empty lightning reading) hold None.
+    """
+    use_numpy = numpy is not None and any(
+        isinstance(column, numpy.ndarray) for column in columns.values())
+    length = None
+    out = {}
+    for key, column in columns.items():
+        out[key] = column
+        if length is None:
+            length = len(column)
+        elif len(column) != length:
+            raise ValueError("column %s has a different length" % key)
+
+    casts = []
+    derived = []
+    steps, drops = select_steps(steps, out, systems)
+    for inputs, outputs, cast, func, columns_func in steps:
+        if cast is not None:
+            casts.append((inputs[0], cast))
+        if columns_func is not None:
+            derived.append((inputs, outputs, columns_func))
+            # reserve the key order convert_units would produce
+            for key in outputs:
+                out[key] = None
+
+    for key, cast in casts:
+        out[key] = _cast_column(out[key], cast)
+
+    for inputs, outputs, columns_func in derived:
+        args = [out[key] for key in inputs]
+        vector = getattr(columns_func, "vector", None)
+        if vector is not None and numpy is not None and all(
+                isinstance(arg, numpy.ndarray) for arg in args):
+            # NaNs and infinities are the scalar path's to report
+            with numpy.errstate(all="ignore"):
+                results = vector(numpy, windchill_type, *args)
+        else:
+            results = columns_func(windchill_type,
+                                   *(_as_list(arg) for arg in args))
+        for key, values in zip(outputs, results):
+            out[key] = values
+    for key in drops:
+        del out[key]
+
+    for key, values in out.items():
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            out[key] = values if use_numpy else _from_numpy(values)
+        else:
+            packed = _pack(_as_list(values))
+            out[key] = _to_numpy(packed) if use_numpy else packed
+    return out
@@ -0,0 +1,894 @@
+"""
+Unit conversion for Ecowitt payloads.
+
+A gateway posts the exact same set of keys every interval, so instead of
+probing for every known key on every packet, the conversion steps are
+compiled once into a table, and an execution plan is cached per packet
+shape (the frozen set of keys it contains).
+"""
+
+import functools
+import math
+from operator import itemgetter
+from urllib.parse import parse_qsl, unquote_plus
+
+from .sensor_map import MAP_SYSTEM, SENSOR_MAP
+
+WINDCHILL_OLD = 0
+WINDCHILL_NEW = 1
+WINDCHILL_HYBRID = 2
+
+# math stolen from:
+# https://github.com/iz0qwm/ecowitt_http_gateway/blob/master/index.php
+MPH_KMH = 1.60934
+# MPH_KTS = 0.868976
+MPH_MS = 0.44707
+IN_HPA = 33.86
+IN_MM = 25.4
+KM_MI = 0.6213712
+
+# channel suffixes of the temperature/humidity pairs we compute dewpoints for
+DEWPOINT_CHANNELS = ['', 'in', '1', '2', '3', '4', '5', '6', '7', '8']
+
+# entries in each derived value cache; a gateway's readings move slowly at
+# 0.1F / 1% resolution, so most packets repeat recent inputs
+DERIVED_CACHE_SIZE = 1024
+
+
+def ftoc(f):
+    """Convert f to c."""
+    F = float(f)
+    return round((F - 32.0) * 5.0 / 9.0, 2)
+
+
+def ctof(c):
+    """Convert c to f."""
+    return round((c * 9.0 / 5.0) + 32.0, 2)
+
+
+def dew_point_c(t_air_c, rel_humidity):
+    """Compute the dew point in degrees Celsius
+    FROM https://gist.github.com/sourceperl/45587ea99ff123745428
+    :param t_air_c: current ambient temperature in degrees Celsius
+    :type t_air_c: float
+    :param rel_humidity: relative humidity in %
+    :type rel_humidity: float
+    :return: the dew point in degrees Celsius
+    :rtype: float
+    """
+    A = 17.27
+    B = 237.7
+    alpha = ((A * t_air_c) / (B + t_air_c)) + math.log(rel_humidity / 100.0)
+    return round((B * alpha) / (A - alpha), 2)
+
+
+def _wind_chill_old(f, mph):
+    old = round((91.4 - (0.474677 - 0.020425 * mph + 0.303107
+                         * math.sqrt(mph)) * (91.4 - f)), 2)
+    # don't return a windchill higher than the temp.
+    return f if old > f else old
+
+
+def _wind_chill_new(f, mph):
+    new = round((35.74 + (0.6215 * f) - 35.75 * (mph ** 0.16)
+                 + 0.4275 * f * (mph ** 0.16)), 2)
+    return f if new > f else new
+
+
+def wind_chill(f, mph, windchill_type=WINDCHILL_HYBRID):
+    """ New formula discards wind < 3.0 and temp > 50"""
+    # only the formula the mode needs is computed
+    if windchill_type == WINDCHILL_NEW:
+        if (f > 50.0 or mph < 3.0):
+            return f
+        else:
+            return _wind_chill_new(f, mph)
+    if windchill_type == WINDCHILL_OLD:
+        return _wind_chill_old(f, mph)
+    if windchill_type == WINDCHILL_HYBRID:
+        if (f > 50.0 or mph < 3.0):
+            return _wind_chill_old(f, mph)
+        else:
+            return _wind_chill_new(f, mph)
+    return f
+
+
+def heat_index(f, rel_humidity):
+    """NWS heat index in F.
+
+    As the NWS computes it: Steadman's simple estimate (already averaged
+    with the temperature) first, and the Rothfusz regression with its
+    adjustments once that reaches 80F.  There is no separate cutoff on
+    the air temperature: 79F at 90% gives 83F, not 79F.
+    """
+    hi = 0.5 * (f + 61.0 + ((f - 68.0) * 1.2) + (rel_humidity * 0.094))
+    if hi < 80.0:
+        return round(hi, 2)
+    rh = rel_humidity
+    hi = (-42.379 + 2.04901523 * f + 10.14333127 * rh
+          - 0.22475541 * f * rh - 0.00683783 * f * f
+          - 0.05481717 * rh * rh + 0.00122874 * f * f * rh
+          + 0.00085282 * f * rh * rh - 0.00000199 * f * f * rh * rh)
+    if rh < 13 and 80.0 <= f <= 112.0:
+        hi -= ((13 - rh) / 4.0) * math.sqrt((17.0 - abs(f - 95.0)) / 17.0)
+    elif rh > 85 and 80.0 <= f <= 87.0:
+        hi += ((rh - 85) / 10.0) * ((87.0 - f) / 5.0)
+    return round(hi, 2)
+
+
+def feels_like(f, rel_humidity, mph):
+    """Apparent temperature in F: windchill when cold and windy, heat
+    index when hot, otherwise the temperature."""
+    if f <= 50.0 and mph >= 3.0:
+        return wind_chill(f, mph, WINDCHILL_NEW)
+    if f >= 80.0:
+        return heat_index(f, rel_humidity)
+    return f
+
+
+def vapour_pressure_deficit(t_air_c, rel_humidity):
+    """Vapour pressure deficit in kPa (Tetens)."""
+    svp = 0.6108 * math.exp(17.27 * t_air_c / (t_air_c + 237.3))
+    return round(svp * (1.0 - rel_humidity / 100.0), 3)
+
+
+def absolute_humidity(t_air_c, rel_humidity):
+    """Absolute humidity in g/m3."""
+    return round(6.112 * math.exp(17.67 * t_air_c / (t_air_c + 243.5))
+                 * rel_humidity * 2.1674 / (273.15 + t_air_c), 2)
+
+
+def volt_to_percent(v, low, high):
+    """Convert a battery voltage to a clamped percentage."""
+    percent = round(((v - low) / (high - low)) * 100)
+    if percent < 0:
+        percent = 0
+    if percent > 100:
+        percent = 100
+    return percent
+
+
+# Memoized derived values.  Keyed on the exact inputs, which the gateway
+# has already quantized, so a hit returns exactly what the math would.
+
+_dew_point_c = functools.lru_cache(maxsize=DERIVED_CACHE_SIZE)(dew_point_c)
+_wind_chill = functools.lru_cache(maxsize=DERIVED_CACHE_SIZE)(wind_chill)
+
+
+_DERIVED_CACHES = {
+    "dewpoint": _dew_point_c,
+    "windchill": _wind_chill,
+}
+
+
+def derived_cache_stats():
+    """Return hits, misses, size, maxsize and hit_rate of every derived
+    value cache.  The caches are shared by every converter in the
+    process."""
+    stats = {}
+    for name, func in _DERIVED_CACHES.items():
+        info = func.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+        }
+    return stats
+
+
+def clear_derived_caches():
+    """Empty the derived value caches and zero their counters."""
+    for func in _DERIVED_CACHES.values():
+        func.cache_clear()
+
+
+def _int_or_blank(value):
+    """int(value), but gateways send lightning fields empty until a
+    strike has been seen."""
+    if value is None or value == '':
+        return value
+    return int(value)
+
+
+# Step constructors.
+#
+# Every step is a tuple of (inputs, outputs, cast, func, calc).  cast, if
+# set, is the type its single input is converted to in place; all of a
+# plan's casts run first, in one tight loop, or are done up front by
+# decode_form.  func, if set, is then called as func(data, windchill_type)
+# and may add the keys listed in outputs.  columns is the same
+# computation over whole columns of already cast values, as
+# columns(windchill_type, *input_columns), returning a tuple of output
+# columns; a row an output does not apply to holds None.
+#
+# A step whose outputs are unit twins has func.narrow(outputs), which
+# returns the same step computing only those outputs, so select_steps
+# can skip the twins nobody wants.
+#
+# Most columns functions also have columns.vector(np, windchill_type,
+# *input_arrays), the same over NumPy arrays; np is the numpy module, so
+# this one never imports it.  See _vectorized for how those match the
+# scalar math exactly.  Neither columns nor vector use the derived value
+# caches, which are sized for a live gateway, not for an archive.
+
+# how close to a rounding tie, in units of the last digit kept, a value
+# computed with NumPy must be before its row is redone in Python
+_TIE_MARGIN = 1e-6
+
+
+def _vround(np, raw, ndigits):
+    """round(raw, ndigits) over an array, exactly as Python rounds.
+
+    round() rounds the exact value of each double; rint() of raw * 10**n
+    sees the product already rounded, which only matters when that lands
+    on a tie.  The product's rounding error (Dekker's two-product) says
+    which side of the tie the exact value is on.
+    """
+    scale = 10.0 ** ndigits
+    scaled = raw * scale
+    nearest = np.rint(scaled)
+    tie = np.abs(scaled - nearest) == 0.5
+    if tie.any():
+        split = 134217729.0 * raw
+        hi = split - (split - raw)
+        lo = raw - hi
+        error = ((hi * scale - scaled) + lo * scale)
+        nearest = np.where(tie & (error > 0), np.ceil(scaled), nearest)
+        nearest = np.where(tie & (error < 0), np.floor(scaled), nearest)
+    return nearest / scale
+
+
+def _vectorized(scalar, compute, keep=None):
+    """Build a columns.vector from compute(np, rnd, windchill_type,
+    *arrays), which returns a tuple of output arrays using rnd(raw,
+    ndigits, inexact=False) in place of round().
+
+    NumPy's arithmetic is IEEE like Python's, so the same expression
+    gives the same double, and _vround rounds it as round() would.  Its
+    exp, log and pow may differ in the last place, though; rnd(...,
+    inexact=True) notes the rows within reach of a rounding tie, where
+    that could show, and rnd notes any non-finite value.  Those rows are
+    redone with scalar(windchill_type, *row), which returns the tuple of
+    output values.  keep, if set, are the indexes of the outputs to
+    return.
+    """
+    def vector(np, windchill_type, *arrays):
+        suspect = np.zeros(len(arrays[0]), dtype=bool)
+
+        def rnd(raw, ndigits, inexact=False):
+            if inexact:
+                scaled = raw * 10.0 ** ndigits
+                margin = 0.5 - np.abs(scaled - np.rint(scaled))
+                suspect[~(margin >= _TIE_MARGIN)] = True
+            else:
+                suspect[~np.isfinite(raw)] = True
+            return _vround(np, raw, ndigits)
+        outputs = compute(np, rnd, windchill_type, *arrays)
+        for i in np.flatnonzero(suspect):
+            row = scalar(windchill_type, *[array[i].item()
+                                           for array in arrays])
+            for column, value in zip(outputs, row):
+                column[i] = value
+        if keep is not None:
+            outputs = tuple(outputs[i] for i in keep)
+        return outputs
+    return vector
+
+
+def _twins_kept(want_first, want_second):
+    return tuple(i for i, want in enumerate((want_first, want_second))
+                 if want)
+
+
+def _cast(key, typ):
+    return ((key,), (), typ, None, None)
+
+
+def _scaled(key, *twins):
+    """Float key, plus twins computed as round(value * factor, 2)."""
+    factors = tuple(factor for _, factor in twins)
+
+    def step(data, windchill_type):
+        value = data[key]
+        for twin, factor in twins:
+            data[twin] = round(value * factor, 2)
+
+    def columns(windchill_type, values):
+        return tuple([round(value * factor, 2) for value in values]
+                     for factor in factors)
+    columns.vector = _vectorized(
+        lambda windchill_type, value: tuple(round(value * factor, 2)
+                                            for factor in factors),
+        lambda np, rnd, windchill_type, values: tuple(
+            rnd(values * factor, 2) for factor in factors))
+    step.narrow = lambda outputs: _scaled(
+        key, *[(twin, factor) for twin, factor in twins if twin in outputs])
+    return ((key,), tuple(twin for twin, _ in twins), float, step, columns)
+
+
+def _temperature(key, twin):
+    """Float key in f, plus its twin in c."""
+    def step(data, windchill_type):
+        data[twin] = ftoc(data[key])
+
+    def columns(windchill_type, values):
+        # ftoc, inlined
+        return ([round((value - 32.0) * 5.0 / 9.0, 2) for value in values],)
+    columns.vector = _vectorized(
+        lambda windchill_type, value: (ftoc(value),),
+        lambda np, rnd, windchill_type, values: (
+            rnd((values - 32.0) * 5.0 / 9.0, 2),))
+    return ((key,), (twin,), float, step, columns)
+
+
+def _lightning():
+    def step(data, windchill_type):
+        value = data["lightning"]
+        if value is not None and value != '':
+            data["lightning_mi"] = int(round(value * KM_MI))
+
+    def columns(windchill_type, values):
+        return ([None if value is None or value == ''
+                 else int(round(value * KM_MI)) for value in values],)
+    return (("lightning",), ("lightning_mi",), _int_or_blank, step, columns)
+
+
+def _windchill(outputs=("windchillf", "windchillc")):
+    want_f = "windchillf" in outputs
+    want_c = "windchillc" in outputs
+
+    def step(data, windchill_type):
+        value = _wind_chill(data["tempf"], data["windspeedmph"],
+                            windchill_type)
+        if want_f:
+            data["windchillf"] = value
+        if want_c:
+            data["windchillc"] = ftoc(value)
+
+    def columns(windchill_type, temps, speeds):
+        values = [wind_chill(f, mph, windchill_type)
+                  for f, mph in zip(temps, speeds)]
+        return _twin_columns(values, ftoc, want_f, want_c)
+
+    def scalar(windchill_type, f, mph):
+        value = wind_chill(f, mph, windchill_type)
+        return value, ftoc(value)
+
+    def compute(np, rnd, windchill_type, temps, speeds):
+        values = _vwind_chill(np, rnd, temps, speeds, windchill_type)
+        return values, rnd((values - 32.0) * 5.0 / 9.0, 2)
+    columns.vector = _vectorized(scalar, compute,
+                                 _twins_kept(want_f, want_c))
+    step.narrow = _windchill
+    return (("tempf", "windspeedmph"),
+            tuple(key for key in ("windchillf", "windchillc")
+                  if key in outputs),
+            None, step, columns)
+
+
+def _vwind_chill(np, rnd, f, mph, windchill_type):
+    """wind_chill over arrays, see _vectorized."""
+    if windchill_type not in (WINDCHILL_OLD, WINDCHILL_NEW,
+                              WINDCHILL_HYBRID):
+        return f.copy()
+    if windchill_type != WINDCHILL_NEW:
+        old = rnd((91.4 - (0.474677 - 0.020425 * mph + 0.303107
+                           * np.sqrt(mph)) * (91.4 - f)), 2)
+        old = np.where(old > f, f, old)
+        if windchill_type == WINDCHILL_OLD:
+            return old
+    new = rnd((35.74 + (0.6215 * f) - 35.75 * (mph ** 0.16)
+               + 0.4275 * f * (mph ** 0.16)), 2, inexact=True)
+    new = np.where(new > f, f, new)
+    calm = (f > 50.0) | (mph < 3.0)
+    return np.where(calm, f if windchill_type == WINDCHILL_NEW else old,
+                    new)
+
+
+def _vheat_index(np, rnd, f, rh):
+    """heat_index over arrays, see _vectorized."""
+    simple = 0.5 * (f + 61.0 + ((f - 68.0) * 1.2) + (rh * 0.094))
+    hi = (-42.379 + 2.04901523 * f + 10.14333127 * rh
+          - 0.22475541 * f * rh - 0.00683783 * f * f
+          - 0.05481717 * rh * rh + 0.00122874 * f * f * rh
+          + 0.00085282 * f * rh * rh - 0.00000199 * f * f * rh * rh)
+    hi = np.where((rh < 13) & (80.0 <= f) & (f <= 112.0),
+                  hi - ((13 - rh) / 4.0) *
+                  np.sqrt((17.0 - np.abs(f - 95.0)) / 17.0), hi)
+    hi = np.where((rh > 85) & (80.0 <= f) & (f <= 87.0),
+                  hi + ((rh - 85) / 10.0) * ((87.0 - f) / 5.0), hi)
+    return np.where(simple < 80.0, rnd(simple, 2), rnd(hi, 2))
+
+
+def _vfeels_like(np, rnd, f, rh, mph):
+    """feels_like over arrays, see _vectorized."""
+    return np.where((f <= 50.0) & (mph >= 3.0),
+                    _vwind_chill(np, rnd, f, mph, WINDCHILL_NEW),
+                    np.where(f >= 80.0, _vheat_index(np, rnd, f, rh), f))
+
+
+def _twin_columns(values, convert, want_first, want_second):
+    """The output columns of a step computing values and their unit
+    twins as convert(value), either or both."""
+    out = []
+    if want_first:
+        out.append(values)
+    if want_second:
+        out.append([convert(value) for value in values])
+    return tuple(out)
+
+
+def _dewpoint(j, outputs=None):
+    temp = "temp" + j + "c"
+    hum = "humidity" + j
+    dpc = "dewpoint" + j + "c"
+    dpf = "dewpoint" + j + "f"
+    if outputs is None:
+        outputs = (dpc, dpf)
+    want_c = dpc in outputs
+    want_f = dpf in outputs
+
+    def step(data, windchill_type):
+        value = _dew_point_c(data[temp], data[hum])
+        if want_c:
+            data[dpc] = value
+        if want_f:
+            data[dpf] = ctof(value)
+
+    def columns(windchill_type, temps, humidities):
+        values = [dew_point_c(t, h) for t, h in zip(temps, humidities)]
+        return _twin_columns(values, ctof, want_c, want_f)
+
+    def scalar(windchill_type, t, h):
+        value = dew_point_c(t, h)
+        return value, ctof(value)
+
+    def compute(np, rnd, windchill_type, temps, humidities):
+        # dew_point_c and ctof
+        A = 17.27
+        B = 237.7
+        alpha = ((A * temps) / (B + temps)) + np.log(humidities / 100.0)
+        values = rnd((B * alpha) / (A - alpha), 2, inexact=True)
+        return values, rnd((values * 9.0 / 5.0) + 32.0, 2)
+    columns.vector = _vectorized(scalar, compute,
+                                 _twins_kept(want_c, want_f))
+    step.narrow = lambda outputs: _dewpoint(j, outputs)
+    return ((temp, hum), tuple(key for key in (dpc, dpf) if key in outputs),
+            None, step, columns)
+
+
+def derived_metric(inputs, outputs, compute, vector=None):
+    """A step computing outputs from inputs, for EcoWittConverter.add_step.
+
+    compute is called as compute(*input_values) and returns a tuple of
+    output values.  Outputs should have SENSOR_MAP entries, or the
+    listener will warn about them as unhandled sensors.  vector, if
+    given, is the same for convert_columns over NumPy arrays, called as
+    vector(np, windchill_type, *input_arrays).
+    """
+    inputs = tuple(inputs)
+    outputs = tuple(outputs)
+
+    def step(data, windchill_type):
+        for key, value in zip(outputs,
+                              compute(*[data[key] for key in inputs])):
+            data[key] = value
+
+    def columns(windchill_type, *input_columns):
+        rows = [compute(*row) for row in zip(*input_columns)]
+        return tuple([row[i] for row in rows] for i in range(len(outputs)))
+    if vector is not None:
+        columns.vector = vector
+    return (inputs, outputs, None, step, columns)
+
+
+def _fahrenheit_metric(inputs, outputs, func, vfunc):
+    """A derived_metric of func, which returns F, as the (F, C) outputs;
+    either or both.  vfunc(np, rnd, *arrays) is func over arrays, see
+    _vectorized."""
+    fkey, ckey = outputs
+
+    def build(outputs):
+        want_f = fkey in outputs
+        want_c = ckey in outputs
+
+        def step(data, windchill_type):
+            value = func(*[data[key] for key in inputs])
+            if want_f:
+                data[fkey] = value
+            if want_c:
+                data[ckey] = ftoc(value)
+
+        def columns(windchill_type, *input_columns):
+            values = [func(*row) for row in zip(*input_columns)]
+            return _twin_columns(values, ftoc, want_f, want_c)
+
+        def scalar(windchill_type, *row):
+            value = func(*row)
+            return value, ftoc(value)
+
+        def compute(np, rnd, windchill_type, *arrays):
+            values = vfunc(np, rnd, *arrays)
+            return values, rnd((values - 32.0) * 5.0 / 9.0, 2)
+        columns.vector = _vectorized(scalar, compute,
+                                     _twins_kept(want_f, want_c))
+        step.narrow = build
+        return (inputs, tuple(key for key in (fkey, ckey) if key in outputs),
+                None, step, columns)
+    return build(outputs)
+
+
+def _battery_percent(key, twin, low, high):
+    def step(data, windchill_type):
+        data[twin] = volt_to_percent(data[key], low, high)
+
+    def columns(windchill_type, values):
+        return ([volt_to_percent(value, low, high) for value in values],)
+
+    def vector(np, windchill_type, values):
+        # round() to an int is half-even on the exact double, as is rint
+        percent = np.rint(((values - low) / (high - low)) * 100)
+        return (np.clip(percent, 0, 100).astype(np.int64),)
+    columns.vector = vector
+    return ((key,), (twin,), None, step, columns)
+
+
+def _compile_steps():
+    """Build the ordered conversion table.
+
+    The order mirrors the order keys were historically added to the
+    converted dict, so listeners see the same key ordering.
+    """
+    steps = []
+
+    # basic conversions
+    for key in ["humidityin", "humidity", "winddir", "winddir_avg10m", "uv"]:
+        steps.append(_cast(key, int))
+    steps.append(_cast("solarradiation", float))
+
+    # lightning
+    steps.append(_cast("lightning_time", _int_or_blank))
+    steps.append(_cast("lightning_num", int))
+    steps.append(_lightning())
+
+    # temperatures
+    steps.append(_temperature("tempf", "tempc"))
+    steps.append(_temperature("tempinf", "tempinc"))
+    # (WH45)
+    steps.append(_temperature("tf_co2", "tf_co2c"))
+    # WN34 Soil Temperature Sensor
+    for j in range(1, 9):
+        steps.append(_temperature(f"tf_ch{j}", f"tf_ch{j}c"))
+    # numbered WH31 temp/humid
+    for j in range(1, 9):
+        steps.append(_temperature(f"temp{j}f", f"temp{j}c"))
+        steps.append(_cast(f"humidity{j}", int))
+
+    # speeds
+    steps.append(_scaled("windspeedmph", ("windspeedkmh", MPH_KMH),
+                         ("windspeedms", MPH_MS)))
+    steps.append(_scaled("windgustmph", ("windgustkmh", MPH_KMH),
+                         ("windgustms", MPH_MS)))
+    # I assume this is MPH?
+    steps.append(_scaled("maxdailygust", ("maxdailygustkmh", MPH_KMH),
+                         ("maxdailygustms", MPH_MS)))
+    steps.append(_scaled("windspdmph_avg10m", ("windspdkmh_avg10m", MPH_KMH),
+                         ("windspdms_avg10m", MPH_MS)))
+
+    # distances
+    for prefix in ["rainrate", "eventrain", "hourlyrain", "dailyrain",
+                   "weeklyrain", "monthlyrain", "yearlyrain", "totalrain"]:
+        steps.append(_scaled(prefix + "in", (prefix + "mm", IN_MM)))
+
+    # piezo rain sensor
+    for prefix in ["r", "e", "h", "d", "w", "m", "y"]:
+        key = prefix + "rain_piezo"
+        steps.append(_scaled(key, (key + "mm", IN_MM)))
+
+    # Pressure
+    steps.append(_scaled("baromrelin", ("baromrelhpa", IN_HPA)))
+    steps.append(_scaled("baromabsin", ("baromabshpa", IN_HPA)))
+
+    # Calculated values for fun!
+    steps.append(_windchill())
+    for j in DEWPOINT_CHANNELS:
+        steps.append(_dewpoint(j))
+
+    # Soil moisture (WH51)
+    for j in range(1, 9):
+        steps.append(_cast(f"soilmoisture{j}", int))
+
+    # PM 2.5 sensor (WH41)
+    for j in range(1, 5):
+        steps.append(_cast(f"pm25_ch{j}", float))
+        steps.append(_cast(f"pm25_avg_24h_ch{j}", float))
+
+    # Leak sensor (WH55)
+    for j in range(1, 5):
+        steps.append(_cast(f"leak_ch{j}", int))
+
+    # CO2 indoor air quality (WH45) (note temp is in temps above)
+    for prefix in ["pm25", "pm25_24h", "pm10", "pm10_24h"]:
+        steps.append(_cast(f"{prefix}_co2", float))
+    for key in ["co2", "co2_24h", "humi_co2"]:
+        steps.append(_cast(key, int))
+
+    # Batteries
+    for prefix in ["wh25", "wh26", "wh40", "wh57", "wh65", "wh68", "wh80",
+                   "wh90", "co2_"]:
+        steps.append(_cast(f"{prefix}batt", float))
+    for r_prefix in ["soil", "", "pm25", "leak", "tf_"]:
+        for j in range(1, 9):
+            steps.append(_cast(f"{r_prefix}batt{j}", float))
+    steps.append(_cast("ws90cap_volt", float))
+
+    # percentage battery for device view
+    steps.append(_battery_percent("wh90batt", "wh90battpc", 2.4, 3.0))
+
+    # comfort and growing indices
+    steps.append(_fahrenheit_metric(("tempf", "humidity"),
+                                    ("heatindexf", "heatindexc"),
+                                    heat_index, _vheat_index))
+    steps.append(_fahrenheit_metric(("tempf", "humidity", "windspeedmph"),
+                                    ("feelslikef", "feelslikec"),
+                                    feels_like, _vfeels_like))
+    steps.append(derived_metric(
+        ("tempc", "humidity"), ("vpd",),
+        lambda c, rh: (vapour_pressure_deficit(c, rh),),
+        _vectorized(
+            lambda windchill_type, c, rh: (vapour_pressure_deficit(c, rh),),
+            lambda np, rnd, windchill_type, c, rh: (rnd(
+                0.6108 * np.exp(17.27 * c / (c + 237.3))
+                * (1.0 - rh / 100.0), 3, inexact=True),))))
+    steps.append(derived_metric(
+        ("tempc", "humidity"), ("abshumidity",),
+        lambda c, rh: (absolute_humidity(c, rh),),
+        _vectorized(
+            lambda windchill_type, c, rh: (absolute_humidity(c, rh),),
+            lambda np, rnd, windchill_type, c, rh: (rnd(
+                6.112 * np.exp(17.67 * c / (c + 243.5))
+                * rh * 2.1674 / (273.15 + c), 2, inexact=True),))))
+
+    return tuple(steps)
+
+
+CONVERSION_STEPS = _compile_steps()
+
+# raw key -> type, for every key that is always cast
+INPUT_CASTS = {step[0][0]: step[2] for step in CONVERSION_STEPS
+               if step[2] is not None}
+
+
+def in_systems(key, systems):
+    """True if key is output for the unit systems in systems.
+
+    Keys without a unit system (humidity, batteries, the station's own
+    fields) and keys missing from SENSOR_MAP always are.
+    """
+    entry = SENSOR_MAP.get(key)
+    return entry is None or entry[MAP_SYSTEM] is None or \
+        entry[MAP_SYSTEM] in systems
+
+
+def select_steps(steps, keys, systems=None):
+    """Return the steps a packet with keys needs, in order, and the keys
+    to remove from it once converted.
+
+    With systems None every applicable step runs and nothing is removed.
+    Otherwise the output is limited to the keys in_systems, so a step
+    runs only if something kept needs its outputs, directly or as
+    another step's input (windchillc needs tempf), and its cast only if
+    its input is kept or needed.  Steps come back with what they do not
+    need to do set to None, and narrowed to the twins kept.
+    """
+    available = set(keys)
+    selected = []
+    for step in steps:
+        if available.issuperset(step[0]):
+            available.update(step[1])
+            selected.append(step)
+    if systems is None:
+        return selected, ()
+
+    needed = {key for key in available if in_systems(key, systems)}
+    kept = []
+    for inputs, outputs, cast, func, columns in reversed(selected):
+        if needed.isdisjoint(outputs):
+            func = columns = None
+        else:
+            needed.update(inputs)
+            narrow = getattr(func, "narrow", None)
+            if narrow is not None and not needed.issuperset(outputs):
+                _, outputs, _, func, columns = narrow(
+                    [key for key in outputs if key in needed])
+        if cast is not None and inputs[0] not in needed:
+            cast = None
+        if cast is not None or func is not None or columns is not None:
+            kept.append((inputs, outputs, cast, func, columns))
+    kept.reverse()
+
+    produced = set(keys)
+    for step in kept:
+        if step[3] is not None or step[4] is not None:
+            produced.update(step[1])
+    drops = tuple(key for key in produced if not in_systems(key, systems))
+    return kept, drops
+
+
+def parse_form(body, charset=None):
+    """Decode an urlencoded body into a dict of strings.
+
+    This matches what aiohttp's request.post() yields for the same body,
+    including repeated keys keeping their first value.
+    """
+    charset = charset or 'utf-8'
+    data = {}
+    for key, value in parse_qsl(body.rstrip().decode(charset),
+                                keep_blank_values=True, encoding=charset):
+        data.setdefault(key, value)
+    return data
+
+
+def decode_form(body, casts=INPUT_CASTS):
+    """Decode a flat urlencoded ASCII body straight into a typed dict.
+
+    Values are cast as they are decoded, so the result is ready for
+    EcoWittConverter.convert(data, typed=True).  Returns None for
+    anything this fast path does not handle (non-ASCII, fields without
+    '=', values that do not cast), so the caller can fall back to a full
+    form parser.  Repeated keys keep their first value.
+    """
+    if not body.isascii():
+        return None
+    data = {}
+    for field in body.decode('ascii').rstrip().split('&'):
+        if not field:
+            continue
+        key, sep, value = field.partition('=')
+        if not sep:
+            return None
+        if '%' in field or '+' in field:
+            key = unquote_plus(key)
+            value = unquote_plus(value)
+        if key in data:
+            continue
+        cast = casts.get(key)
+        if cast is not None:
+            try:
+                value = cast(value)
+            except ValueError:
+                return None
+        data[key] = value
+    return data
+
+
+class EcoWittConverter:
+    """Convert raw Ecowitt payloads from imperial strings to typed values.
+
+    Plans are cached by the frozen key set of a packet; a plan is a tuple
+    of (casts, funcs, drops) holding only the steps that packet shape
+    needs, funcs as (input getter, outputs, func), and the keys to remove
+    when only some unit systems are wanted, see select_steps.
+
+    Incrementally, the outputs of each derived metric (a step with
+    several inputs, like the dewpoints) are remembered per station
+    (PASSKEY or MAC), and one whose inputs are the same as in that
+    station's previous packet copies its previous outputs instead of
+    running.  Single input steps, the unit twins, are cheaper to redo
+    than to check.
+    """
+    def __init__(self, steps=CONVERSION_STEPS, max_plans=64,
+                 incremental=True, max_states=1024, systems=None):
+        """Initialize.
+
+        systems, a collection of SYSTEM_METRIC, SYSTEM_IMPERIAL and
+        SYSTEM_METRIC_MS, limits the output to those unit systems; None
+        for all of them.
+        """
+        self.steps = steps
+        self.systems = None if systems is None else frozenset(systems)
+        self.max_plans = max_plans
+        self._plans = {}
+        self.incremental = incremental
+        self.max_states = max_states
+        # (station id, windchill type) -> {func: (input values, outputs)}
+        self._states = {}
+        self.computed = 0
+        self.reused = 0
+
+    def add_step(self, step):
+        """Add a step, such as a derived_metric, after the existing ones."""
+        self.steps = tuple(self.steps) + (step,)
+        self.clear_plans()
+
+    def set_systems(self, systems):
+        """Change the unit systems output, None for all."""
+        self.systems = None if systems is None else frozenset(systems)
+        self.clear_plans()
+
+    def compile_plan(self, keys):
+        """Build the plan for a packet containing keys."""
+        steps, drops = select_steps(self.steps, keys, self.systems)
+        casts = []
+        funcs = []
+        for inputs, outputs, cast, func, _ in steps:
+            if cast is not None:
+                casts.append((inputs[0], cast))
+            if func is not None:
+                # derived metrics get an itemgetter for their inputs
+                getter = itemgetter(*inputs) if len(inputs) > 1 else None
+                funcs.append((getter, outputs, func))
+        return (tuple(casts), tuple(funcs), drops)
+
+    def get_plan(self, data):
+        """Return the cached plan for the shape of data."""
+        shape = frozenset(data)
+        plan = self._plans.get(shape)
+        if plan is None:
+            # Gateways have one shape each; a flood of shapes means
+            # something odd is posting to us, don't grow without bound.
+            if len(self._plans) >= self.max_plans:
+                self._plans.clear()
+            plan = self._plans[shape] = self.compile_plan(shape)
+        return plan
+
+    def clear_plans(self):
+        """Drop all cached plans, and the derived values of every station."""
+        self._plans.clear()
+        self._states.clear()
+
+    def get_stats(self):
+        """Return how many derived metrics were computed and reused."""
+        total = self.computed + self.reused
+        return {
+            "plans": len(self._plans),
+            "stations": len(self._states),
+            "computed": self.computed,
+            "reused": self.reused,
+            "reuse_rate": self.reused / total if total else 0.0,
+        }
+
+    def convert(self, data, windchill_type=WINDCHILL_HYBRID, typed=False):
+        """ Convert imperial to metric, in place, returning data.
+
+        typed means the values were already cast, as by decode_form.
+        """
+        casts, funcs, drops = self.get_plan(data)
+        if not typed:
+            for key, cast in casts:
+                data[key] = cast(data[key])
+        if not self.incremental:
+            for _, _, func in funcs:
+                func(data, windchill_type)
+            for key in drops:
+                del data[key]
+            return data
+
+        state_key = (data.get("PASSKEY") or data.get("mac"), windchill_type)
+        state = self._states.get(state_key)
+        if state is None:
+            if len(self._states) >= self.max_states:
+                self._states.clear()
+            state = self._states[state_key] = {}
+        computed = reused = 0
+        for getter, outputs, func in funcs:
+            if getter is None:
+                func(data, windchill_type)
+                continue
+            args = getter(data)
+            previous = state.get(func)
+            if previous is not None and previous[0] == args:
+                data.update(previous[1])
+                reused += 1
+            else:
+                func(data, windchill_type)
+                state[func] = (args, [(key, data[key]) for key in outputs])
+                computed += 1
+        self.reused += reused
+        self.computed += computed
+        for key in drops:
+            del data[key]
+        return data
@@ -0,0 +1,365 @@
+"""
+Concurrent, isolated delivery of weather data to registered listeners.
+
+Every listener gets its own bounded queue and worker task, so a slow or
+stuck consumer never delays the reply to the gateway, or any other
+listener.  Failures and timeouts are counted per listener.
+"""
+
+import asyncio
+import logging
+import re
+import time
+
+from .workqueue import WorkerQueue
+from .sensor_map import EcoWittSensorTypes, MAP_STYPE, SENSOR_MAP
+from .station import STATION_ID_KEYS, diff_values
+
+# What to do with a new packet when a listener's queue is full.
+LISTENER_DROP_OLDEST = 0
+LISTENER_DROP_NEWEST = 1
+LISTENER_COALESCE = 2
+
+LISTENER_QUEUE_SIZE = 8
+LISTENER_TIMEOUT = 30.0
+
+# the channel number of a multi-channel sensor's key: temp3f, pm25_ch2,
+# soilbatt5, tf_ch1c...
+_CHANNEL_KEY = re.compile(
+    r"^(?:temp|humidity|dewpoint|soilmoisture|soilbatt|batt|pm25batt|"
+    r"leakbatt|tf_batt|.+_ch)([1-8])[cf]?$")
+
+
+def sensor_channel(key):
+    """The device channel key belongs to, or None."""
+    match = _CHANNEL_KEY.match(key)
+    return int(match.group(1)) if match else None
+
+
+class ListenerQueue(WorkerQueue):
+    """A listener function, its queue of pending packets and its worker."""
+    def __init__(self, function, timeout=LISTENER_TIMEOUT,
+                 queue_size=LISTENER_QUEUE_SIZE,
+                 policy=LISTENER_DROP_OLDEST, station=None,
+                 changes_only=False, keys=None, prefixes=None, stypes=None,
+                 channels=None):
+        """Initialize.
+
+        station limits delivery to packets from that station id.
+        changes_only delivers only the keys that changed since this
+        listener last heard of them, see diff_values; such a listener
+        always coalesces, so a full queue never loses a change.
+        keys, prefixes, stypes (EcoWittSensorTypes or names) and
+        channels (see sensor_channel) subscribe to a slice of each
+        packet: the keys matching any of them, plus the station id keys.
+        Packets with nothing matching are not delivered.
+        timeout is in seconds, None to wait forever.  With
+        LISTENER_COALESCE a full queue merges the new packet into the
+        newest pending one, so no key is lost, only intermediate values.
+        """
+        super().__init__(queue_size)
+        self.function = function
+        self.name = getattr(function, "__qualname__", repr(function))
+        self.timeout = timeout
+        self.policy = LISTENER_COALESCE if changes_only else policy
+        self.station = station
+        self.changes_only = changes_only
+        # station id -> the values this listener was last told about
+        self.notified = {}
+        self.keys = frozenset(keys or ())
+        self.prefixes = tuple(prefixes or ())
+        self.stypes = frozenset(
+            s.name if isinstance(s, EcoWittSensorTypes) else s
+            for s in stypes or ())
+        self.channels = frozenset(channels or ())
+        self.filtered = bool(self.keys or self.prefixes or self.stypes or
+                             self.channels)
+        self.log = logging.getLogger(__name__)
+
+        self.delivered = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.dropped = 0
+        self.coalesced = 0
+        # a StageTimings to record each call in, see timing.py
+        self.timings = None
+        # key -> epsilon for changes_only, shared with the dispatcher
+        self.thresholds = None
+
+    def wants(self, key):
+        """True if key is in this listener's slice."""
+        if not self.filtered or key in self.keys:
+            return True
+        if self.prefixes and key.startswith(self.prefixes):
+            return True
+        if self.stypes and key in SENSOR_MAP and \
+                SENSOR_MAP[key][MAP_STYPE].name in self.stypes:
+            return True
+        return bool(self.channels) and sensor_channel(key) in self.channels
+
+    def changes(self, data, station):
+        """Return the keys of data from station this listener has not
+        been told about, and count them as told."""
+        notified = self.notified.get(station)
+        if notified is None:
+            notified = self.notified[station] = {}
+        return diff_values(notified, data, self.thresholds)
+
+    def put(self, data):
+        """Queue data for delivery, never blocking."""
+        if self.full():
+            if self.policy == LISTENER_COALESCE:
+                # build a new dict, the pending one may be shared
+                self._queue[-1] = {**self._queue[-1], **data}
+                self.coalesced += 1
+                return
+            self.dropped += 1
+            if self.policy == LISTENER_DROP_NEWEST:
+                return
+            self._queue.popleft()
+        self._queue.append(data)
+        self._wake()
+
+    async def _handle(self, data):
+        timings = self.timings
+        if timings is not None:
+            start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.function(data), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            self.log.warning("Listener %s timed out after %ss",
+                             self.name, self.timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            self.log.warning("Listener %s failed: %s", self.name, e)
+        else:
+            self.delivered += 1
+        if timings is not None:
+            timings.record("listener", start)
+
+    def get_stats(self):
+        """Return this listener's counters."""
+        return {
+            "listener": self.name,
+            "station": self.station,
+            "changes_only": self.changes_only,
+            "filtered": self.filtered,
+            "pending": len(self._queue),
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+
+class SubscriptionIndex:
+    """Filtered listeners, indexed by the keys they subscribe to.
+
+    The index maps each key seen so far to the listeners that want it,
+    filled in the first time the key shows up and rebuilt when a listener
+    comes or goes.  Keys nobody wants are only remembered as seen, so a
+    packet costs two set scans in C plus one insert per match.
+    """
+    def __init__(self):
+        """Initialize."""
+        self.queues = []
+        self._clear()
+
+    def __bool__(self):
+        return bool(self.queues)
+
+    def _clear(self):
+        # key -> listeners wanting it, for keys somebody wants
+        self._index = {}
+        self._seen = set(STATION_ID_KEYS)
+
+    def add(self, lq):
+        self.queues.append(lq)
+        self._clear()
+
+    def remove(self, lq):
+        self.queues.remove(lq)
+        self._clear()
+
+    def slices(self, data, station):
+        """Return {ListenerQueue: its slice of data} for the listeners
+        of station with any key in data."""
+        index = self._index
+        if not self._seen.issuperset(data):
+            new = data.keys() - self._seen
+            for key in new:
+                lqs = tuple(lq for lq in self.queues if lq.wants(key))
+                if lqs:
+                    index[key] = lqs
+            self._seen |= new
+        slices = {}
+        for key in data.keys() & index.keys():
+            for lq in index[key]:
+                if lq.station is not None and lq.station != station:
+                    continue
+                part = slices.get(lq)
+                if part is None:
+                    part = slices[lq] = {}
+                part[key] = data[key]
+        if slices:
+            ids = {key: data[key] for key in STATION_ID_KEYS if key in data}
+            for part in slices.values():
+                part.update(ids)
+        return slices
+
+
+class ListenerDispatcher:
+    """Fan packets out to every registered ListenerQueue."""
+    def __init__(self, change_thresholds=None):
+        """Initialize.
+
+        change_thresholds maps keys to the epsilon a value must move by
+        to count as a change for change-only listeners.
+        """
+        self.queues = []
+        self.change_thresholds = {} if change_thresholds is None else \
+            change_thresholds
+        # listeners for every station, and those scoped to one
+        self._unscoped = []
+        self._by_station = {}
+        # listeners to a slice of each packet, and of each change
+        self._filtered = SubscriptionIndex()
+        self._filtered_changes = SubscriptionIndex()
+        self.timings = None
+
+    def set_timings(self, timings):
+        """Record listener call durations in timings, None to stop."""
+        self.timings = timings
+        for lq in self.queues:
+            lq.timings = timings
+
+    def __len__(self):
+        return len(self.queues)
+
+    def add(self, function, **kwargs):
+        """Register function, see ListenerQueue for the options."""
+        lq = ListenerQueue(function, **kwargs)
+        lq.timings = self.timings
+        lq.thresholds = self.change_thresholds
+        self.queues.append(lq)
+        if lq.filtered:
+            self._subscriptions(lq).add(lq)
+        elif lq.station is None:
+            self._unscoped.append(lq)
+        else:
+            self._by_station.setdefault(lq.station, []).append(lq)
+        return lq
+
+    def remove(self, function):
+        """Unregister function, returning its ListenerQueue or None."""
+        for lq in self.queues:
+            if lq.function == function:
+                self.queues.remove(lq)
+                if lq.filtered:
+                    self._subscriptions(lq).remove(lq)
+                elif lq.station is None:
+                    self._unscoped.remove(lq)
+                else:
+                    self._by_station[lq.station].remove(lq)
+                lq.cancel()
+                return lq
+        return None
+
+    def dispatch(self, data, station=None):
+        """Queue data from station for every listener that wants it.
+
+        Change-only listeners get what changed for them, if anything.
+        Filtered listeners get only their slice, see SubscriptionIndex.
+        """
+        for lq in self._unscoped:
+            self._put(lq, data, station)
+        if station is not None:
+            for lq in self._by_station.get(station, ()):
+                self._put(lq, data, station)
+        if self._filtered:
+            for lq, part in self._filtered.slices(data, station).items():
+                lq.put(part)
+        if self._filtered_changes:
+            for lq, part in self._filtered_changes.slices(
+                    data, station).items():
+                self._put(lq, part, station)
+
+    def snapshot(self, lq, data, station=None):
+        """Queue the current values data of station for the change-only
+        lq, so it starts from them rather than from the next change."""
+        if lq.station is not None and lq.station != station:
+            return
+        if lq.filtered:
+            data = {key: value for key, value in data.items()
+                    if lq.wants(key) or key in STATION_ID_KEYS}
+        self._put(lq, data, station)
+
+    def _subscriptions(self, lq):
+        return self._filtered_changes if lq.changes_only else self._filtered
+
+    def _put(self, lq, data, station):
+        if not lq.changes_only:
+            lq.put(data)
+            return
+        changes = lq.changes(data, station)
+        if changes:
+            lq.put(changes)
+
+    def full(self):
+        """True if any listener's queue is full."""
+        for lq in self.queues:
+            if lq.full():
+                return True
+        return False
+
+    async def join(self):
+        """Wait until every listener has caught up."""
+        for lq in self.queues:
+            await lq.join()
+
+    async def stop(self):
+        """Stop every listener's worker."""
+        for lq in self.queues:
+            await lq.stop()
+
+    def get_stats(self):
+        """Return the counters of every listener."""
+        return [lq.get_stats() for lq in self.queues]
+
+
+class PacketWaiters:
+    """Futures waiting for a packet, optionally from one station or
+    carrying one key.  Resolved from notify(), nothing polls."""
+    def __init__(self):
+        """Initialize."""
+        self._waiters = []
+
+    def __len__(self):
+        return len(self._waiters)
+
+    async def wait(self, station=None, key=None, timeout=None):
+        """Return the next matching packet, or None after timeout."""
+        fut = asyncio.get_running_loop().create_future()
+        entry = (station, key, fut)
+        self._waiters.append(entry)
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._waiters.remove(entry)
+
+    def notify(self, station, data):
+        """Wake everyone waiting for this packet."""
+        for w_station, key, fut in self._waiters:
+            if fut.done():
+                continue
+            if w_station is not None and w_station != station:
+                continue
+            if key is not None and key not in data:
+                continue
+            fut.set_result(data)
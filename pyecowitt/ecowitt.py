@@ -6,102 +6,200 @@ GW1000 or in my case, HP3501, decode results.
 import asyncio
 from aiohttp import web
 import logging
-import math
+import signal
 import time
 
+from .convert import (
+    EcoWittConverter,
+    derived_cache_stats,
+    WINDCHILL_OLD,
+    WINDCHILL_NEW,
+    WINDCHILL_HYBRID,
+    decode_form,
+    dew_point_c,
+    parse_form,
+    ftoc,
+    volt_to_percent,
+    wind_chill,
+)
 from .sensor_map import (
     EcoWittSensorTypes,
-    MAP_NAME as MAP_NAME,
-    MAP_SYSTEM as MAP_SYSTEM,
-    MAP_STYPE as MAP_STYPE,
-    SENSOR_MAP as SENSOR_MAP
+    MAP_NAME,
+    MAP_SYSTEM,
+    MAP_STYPE,
+    SENSOR_MAP,
+)
+from .dispatch import (
+    ListenerDispatcher,
+    PacketWaiters,
+    LISTENER_DROP_OLDEST,
+    LISTENER_QUEUE_SIZE,
+    LISTENER_TIMEOUT,
+)
+from .ingest import (
+    IngestQueue,
+    INGEST_DROP_OLDEST,
+)
+from .metrics import (
+    METRICS_CONTENT_TYPE,
+    METRICS_PATH,
+    MetricsExporter,
+)
+from .registry import (
+    EcoWittSensor,
+    EcoWittSensorRegistry,
+)
+from .station import (
+    EcoWittStation,
+    get_station_id,
+)
+from .profiling import (
+    HandlerProfiler,
+    PROFILE_CPROFILE,
+    PROFILE_INTERVAL,
+    profile_path,
 )
+from .timing import StageTimings
+from .workers import EcoWittSupervisor
+
+# the listener, and what lived in this module before it was split up
+__all__ = [
+    "ECOWITT_LISTEN_PORT",
+    "EcoWittListener",
+    "EcoWittSensor",
+    "EcoWittSensorRegistry",
+    "EcoWittSensorTypes",
+    "MAP_NAME",
+    "MAP_SYSTEM",
+    "MAP_STYPE",
+    "SENSOR_MAP",
+    "WINDCHILL_OLD",
+    "WINDCHILL_NEW",
+    "WINDCHILL_HYBRID",
+]
 
 ECOWITT_LISTEN_PORT = 4199
-WINDCHILL_OLD = 0
-WINDCHILL_NEW = 1
-WINDCHILL_HYBRID = 2
+FORM_CONTENT_TYPE = 'application/x-www-form-urlencoded'
+# charsets the fast decoder can treat as ASCII
+FAST_DECODE_CHARSETS = (None, 'ascii', 'us-ascii', 'utf-8')
 
 
-class EcoWittSensor:
-    """An internal sensor to the ecowitt."""
-    def __init__(self, sensor_name, key, system, stype):
-        """Initialize."""
-        self.name = sensor_name
-        self.key = key
-        self.value = None
-        self.system = system
-        self.stype = stype
-        self.lastupd = 0
-        self.lastupd_m = 0
-
-    def get_value(self):
-        """Get the sensor value."""
-        return self.value
-
-    def set_value(self, value):
-        """Set the sensor value."""
-        self.value = value
+class EcoWittListener:
+    def __init__(self, port=ECOWITT_LISTEN_PORT, fast_decode=False,
+                 ingest_queue_size=0, ingest_policy=INGEST_DROP_OLDEST,
+                 multi_station=False, reuse_port=False, workers=1,
+                 history=None, stats=None, storage=None, capture=None,
+                 metrics=False, timing=False, systems=None):
+        """Initialize.
 
-    def get_system(self):
-        """Get the system."""
-        return self.system
+        A non-zero ingest_queue_size acknowledges each POST as soon as
+        its body is queued, see IngestQueue.
 
-    def get_stype(self):
-        """Get the sensor type."""
-        return self.stype
+        With multi_station, every gateway posting to us gets its own
+        EcoWittStation, keyed by PASSKEY (or MAC).  The station-less
+        accessors then refer to the first station that reported.
 
-    def get_name(self):
-        """Get the sensor name."""
-        return self.name
+        With workers > 1, that many processes share the port with
+        SO_REUSEPORT to decode and convert, see EcoWittSupervisor.
 
-    def get_key(self):
-        """Get the sensor key."""
-        return self.key
+        history keeps a ring buffer of recent values per numeric sensor;
+        an int capacity, or a dict of capacities by stype, see
+        history_capacity.
 
-    def set_lastupd(self, value):
-        """Set the last update time on this sensor."""
-        self.lastupd = value
+        stats keeps rolling min/max/mean/stddev per sensor; True for
+        temperature, pressure and wind over 10 minutes, an hour and a
+        day, or a dict of windows in seconds by stype, see stats_windows.
 
-    def get_lastupd(self):
-        """Get the last update time of this sensor."""
-        return self.lastupd
+        storage, an EcoWittHistoryLog, durably records every packet.
 
-    def set_lastupd_m(self, value):
-        """Set the last update monotonic time on this sensor."""
-        self.lastupd_m = value
+        capture, a CaptureWriter, records every raw upload for replay
+        (uploads decoded by workers are not captured).
 
-    def get_lastupd_m(self):
-        """Get the last update monotonic time of this sensor."""
-        return self.lastupd_m
+        metrics serves Prometheus metrics on GET /metrics, see
+        MetricsExporter; it needs workers=1, as workers answer GETs.
 
+        timing records per-stage durations, see StageTimings and
+        enable_timing.
 
-class EcoWittListener:
-    def __init__(self, port=ECOWITT_LISTEN_PORT):
+        systems limits the keys converted, and so the sensors created,
+        to those unit systems: a collection of SYSTEM_METRIC,
+        SYSTEM_IMPERIAL and SYSTEM_METRIC_MS, None for all of them.
+        Keys with no unit system are always kept.
+        """
         # API Constants
         self.port = port
+        self.fast_decode = fast_decode
+        self.reuse_port = reuse_port
+        self.workers = workers
 
         # internal states
         self.server = None
         self.runner = None
         self.site = None
-        self.r_listeners = []
-        self.last_values = {}
-        self.data_valid = False
+        self.supervisor = None
+        self.dispatcher = ListenerDispatcher()
+        self.waiters = PacketWaiters()
+        self.ingest_queue = None
+        if ingest_queue_size > 0:
+            self.ingest_queue = IngestQueue(self.process_payload,
+                                            queue_size=ingest_queue_size,
+                                            policy=ingest_policy)
         self.log = logging.getLogger(__name__)
-        self.lastupd = 0
         self.windchill_type = WINDCHILL_HYBRID
+        self.converter = EcoWittConverter(systems=systems)
         self.new_sensor_cb = None
 
         # storage
-        self._station_type = "Unknown"
-        self._station_freq = "Unknown"
-        self._station_model = "Unknown"
-        self._mac_addr = None
+        self.multi_station = multi_station
+        self.stations = {}
+        self.history = history
+        self.stats = stats
+        self.storage = storage
+        # appends to storage that raised; the packet is still delivered
+        self.storage_failed = 0
+        self.capture = capture
+        self.metrics = MetricsExporter(self) if metrics else None
+        self.timings = None
+        if timing:
+            self.enable_timing()
+        self.profiler = None
+        self._profile_timer = None
+        self._default_station = EcoWittStation(history=history, stats=stats)
+        if not multi_station:
+            self.stations[None] = self._default_station
 
         self.data_ready = False
-        self.sensors = []
-        self.known_sensor_keys = []
+        # key -> epsilon for change-only listeners
+        self.change_thresholds = self.dispatcher.change_thresholds
+
+    # The single station view, kept for code written before multi_station.
+    @property
+    def sensors(self):
+        return self._default_station.sensors
+
+    @property
+    def last_values(self):
+        return self._default_station.last_values
+
+    @last_values.setter
+    def last_values(self, value):
+        self._default_station.last_values = value
+
+    @property
+    def data_valid(self):
+        return self._default_station.data_valid
+
+    @data_valid.setter
+    def data_valid(self, value):
+        self._default_station.data_valid = value
+
+    @property
+    def lastupd(self):
+        return self._default_station.lastupd
+
+    @lastupd.setter
+    def lastupd(self, value):
+        self._default_station.lastupd = value
 
     def int_new_sensor_cb(self):
         """Internal new sensor callback
@@ -110,20 +208,142 @@ class EcoWittListener:
         """
         if self.new_sensor_cb is None:
             return
+        timings = self.timings
+        if timings is None:
+            self.new_sensor_cb()
+            return
+        start = time.perf_counter()
         self.new_sensor_cb()
+        timings.record("new_sensor", start)
 
     def set_windchill(self, wind):
         """Set a windchill mode, [012]."""
         if wind < 0 or wind > 2:
             return
         self.windchill_type = wind
-
-    def register_listener(self, function):
-        self.r_listeners.append(function)
+        if self.supervisor is not None:
+            self.supervisor.set_windchill(wind)
+
+    def register_listener(self, function, timeout=LISTENER_TIMEOUT,
+                          queue_size=LISTENER_QUEUE_SIZE,
+                          policy=LISTENER_DROP_OLDEST, station=None,
+                          changes_only=False, keys=None, prefixes=None,
+                          stypes=None, channels=None):
+        """Register an async function to be called with each packet.
+
+        Listeners run concurrently in their own task, each with its own
+        bounded queue, see ListenerQueue.  With station set, only packets
+        from that station id are delivered.  With changes_only, only the
+        keys that changed are, see set_change_threshold; the first
+        delivery is the current values of every station that has
+        reported.  With any of keys, key prefixes, stypes or device
+        channels, only the matching keys are, see ListenerQueue.
+        """
+        lq = self.dispatcher.add(function, timeout=timeout,
+                                 queue_size=queue_size, policy=policy,
+                                 station=station,
+                                 changes_only=changes_only, keys=keys,
+                                 prefixes=prefixes, stypes=stypes,
+                                 channels=channels)
+        if changes_only:
+            for st in self.stations.values():
+                if st.data_valid:
+                    self.dispatcher.snapshot(lq, st.last_values,
+                                             st.station_id)
+        return lq
+
+    def set_change_threshold(self, key, epsilon):
+        """Ignore moves of key smaller than epsilon for change-only
+        listeners, None to report any change."""
+        if epsilon is None:
+            self.change_thresholds.pop(key, None)
+        else:
+            self.change_thresholds[key] = epsilon
+
+    def unregister_listener(self, function):
+        """Stop calling function with new packets."""
+        return self.dispatcher.remove(function) is not None
+
+    def get_listener_stats(self):
+        """Return delivery, failure, timeout and drop counts per listener."""
+        return self.dispatcher.get_stats()
+
+    async def wait_for_listeners(self):
+        """Wait until every listener has handled every queued packet."""
+        await self.dispatcher.join()
+
+    def enable_timing(self):
+        """Start recording per-stage durations, keeping any so far."""
+        if self.timings is None:
+            self.timings = StageTimings()
+        self.dispatcher.set_timings(self.timings)
+
+    def disable_timing(self):
+        """Stop recording per-stage durations and forget them."""
+        self.timings = None
+        self.dispatcher.set_timings(None)
+
+    def get_timing_stats(self):
+        """Return the duration histogram of every stage, see
+        StageHistogram.get_stats; empty with timing disabled."""
+        if self.timings is None:
+            return {}
+        return self.timings.get_stats()
+
+    def start_profiling(self, path, packets=None, seconds=None,
+                        mode=PROFILE_CPROFILE, interval=PROFILE_INTERVAL):
+        """Profile the handler for the next packets POSTs or seconds, then
+        write the profile to path, see HandlerProfiler.
+
+        Returns False, changing nothing, if already profiling.
+        """
+        if self.profiler is not None:
+            self.log.warning("Already profiling to %s", self.profiler.path)
+            return False
+        self.profiler = HandlerProfiler(path, packets, seconds, mode,
+                                        interval)
+        self.profiler.start()
+        if seconds is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # no loop: the next packet after the deadline stops it
+                pass
+            else:
+                self._profile_timer = loop.call_later(seconds,
+                                                      self.stop_profiling)
+        return True
+
+    def stop_profiling(self):
+        """Stop profiling now; return the file written, or None."""
+        profiler = self.profiler
+        if profiler is None:
+            return None
+        self.profiler = None
+        if self._profile_timer is not None:
+            self._profile_timer.cancel()
+            self._profile_timer = None
+        return profiler.stop()
+
+    def profile_on_signal(self, directory, signum=signal.SIGUSR1,
+                          packets=100, seconds=None, mode=PROFILE_CPROFILE):
+        """Start profiling into a new file in directory whenever signum
+        arrives.  Call with the event loop running."""
+        def start():
+            self.start_profiling(profile_path(directory, mode), packets,
+                                 seconds, mode)
+        asyncio.get_running_loop().add_signal_handler(signum, start)
+
+    def get_derived_cache_stats(self):
+        """Return the hit rates of the dew point and windchill caches."""
+        return derived_cache_stats()
+
+    def get_converter_stats(self):
+        """Return how often derived steps were computed or reused."""
+        return self.converter.get_stats()
 
     def get_dew_point_c(self, t_air_c, rel_humidity):
         """Compute the dew point in degrees Celsius
-        FROM https://gist.github.com/sourceperl/45587ea99ff123745428
         :param t_air_c: current ambient temperature in degrees Celsius
         :type t_air_c: float
         :param rel_humidity: relative humidity in %
@@ -131,358 +351,250 @@ class EcoWittListener:
         :return: the dew point in degrees Celsius
         :rtype: float
         """
-        A = 17.27
-        B = 237.7
-        alpha = ((A * t_air_c) / (B + t_air_c)) + math.log(rel_humidity / 100.0)
-        return round((B * alpha) / (A - alpha), 2)
+        return dew_point_c(t_air_c, rel_humidity)
 
     def _ftoc(self, f):
         """ Convert f to c."""
-        F = float(f)
-        c = round((F - 32.0) * 5.0 / 9.0, 2)
-        return(c)
+        return ftoc(f)
 
     def _wind_chill(self, f, mph):
         """ New formula discards wind < 3.0 and temp > 50"""
-        old = round((91.4 - (0.474677 - 0.020425 * mph + 0.303107
-                             * math.sqrt(mph)) * (91.4 - f)), 2)
-        new = round((35.74 + (0.6215 * f) - 35.75 * (mph ** 0.16)
-                     + 0.4275 * f * (mph ** 0.16)), 2)
-
-        # don't return a windchill higher than the temp.
-        if (old > f):
-            old = f
-        if (new > f):
-            new = f
-
-        if self.windchill_type == WINDCHILL_NEW:
-            if (f > 50.0 or mph < 3.0):
-                return f
-            else:
-                return new
-        if self.windchill_type == WINDCHILL_OLD:
-            return old
-        if self.windchill_type == WINDCHILL_HYBRID:
-            if (f > 50.0 or mph < 3.0):
-                return old
-            else:
-                return new
-        return f
+        return wind_chill(f, mph, self.windchill_type)
 
     def _volt_to_percent(self, v, low, high):
-        percent = round(((v - low) / (high - low)) * 100)
-        if percent < 0:
-            percent = 0
-        if percent > 100:
-            percent = 100
-        return percent
+        return volt_to_percent(v, low, high)
 
     def convert_units(self, data):
         """ Convert imperial to metric """
-        # math stolen from:
-        # https://github.com/iz0qwm/ecowitt_http_gateway/blob/master/index.php
-        mph_kmh = 1.60934
-        # mph_kts = 0.868976
-        mph_ms = 0.44707
-        in_hpa = 33.86
-        in_mm = 25.4
-        km_mi = 0.6213712
-
-        # basic conversions
-        if "humidityin" in data:
-            data["humidityin"] = int(data["humidityin"])
-        if "humidity" in data:
-            data["humidity"] = int(data["humidity"])
-        if "winddir" in data:
-            data["winddir"] = int(data["winddir"])
-        if "winddir_avg10m" in data:
-            data["winddir_avg10m"] = int(data["winddir_avg10m"])
-        if "uv" in data:
-            data["uv"] = int(data["uv"])
-        if "solarradiation" in data:
-            data["solarradiation"] = float(data["solarradiation"])
-
-        # lightning
-        if "lightning_time" in data:
-            if (data["lightning_time"] is not None and
-                data["lightning_time"] != ''):
-                data["lightning_time"] = int(data["lightning_time"])
-        if "lightning_num" in data:
-            data["lightning_num"] = int(data["lightning_num"])
-        if "lightning" in data:
-            if (data["lightning"] is not None and
-                    data["lightning"] != ''):
-                data["lightning"] = int(data["lightning"])
-                data["lightning_mi"] = int(round(data["lightning"] * km_mi))
-
-        # temperatures
-        if "tempf" in data:
-            data["tempf"] = float(data["tempf"])
-            data["tempc"] = self._ftoc(data["tempf"])
-        if "tempinf" in data:
-            data["tempinf"] = float(data["tempinf"])
-            data["tempinc"] = self._ftoc(data["tempinf"])
-        # (WH45)
-        if "tf_co2" in data:
-            data["tf_co2"] = float(data["tf_co2"])
-            data["tf_co2c"] = self._ftoc(data["tf_co2"])
-        # WN34 Soil Temperature Sensor
-        for j in range(1, 9):
-            wnf = f"tf_ch{j}"
-            wnc = f"tf_ch{j}c"
-            if wnf in data:
-                data[wnf] = float(data[wnf])
-                data[wnc] = self._ftoc(data[wnf])
-
-        # numbered WH31 temp/humid
-        for j in range(1, 9):
-            tmpf = f"temp{j}f"
-            tmpc = f"temp{j}c"
-            hm = f"humidity{j}"
-            if tmpf in data:
-                data[tmpf] = float(data[tmpf])
-                data[tmpc] = self._ftoc(data[tmpf])
-            if hm in data:
-                data[hm] = int(data[hm])
-
-        # speeds
-        if "windspeedmph" in data:
-            data["windspeedmph"] = float(data["windspeedmph"])
-            data["windspeedkmh"] = round(data["windspeedmph"] * mph_kmh, 2)
-            data["windspeedms"] = round(data["windspeedmph"] * mph_ms, 2)
-        if "windgustmph" in data:
-            data["windgustmph"] = float(data["windgustmph"])
-            data["windgustkmh"] = round(data["windgustmph"] * mph_kmh, 2)
-            data["windgustms"] = round(data["windgustmph"] * mph_ms, 2)
-        # I assume this is MPH?
-        if "maxdailygust" in data:
-            data["maxdailygust"] = float(data["maxdailygust"])
-            data["maxdailygustkmh"] = round(data["maxdailygust"] * mph_kmh, 2)
-            data["maxdailygustms"] = round(data["maxdailygust"] * mph_ms, 2)
-        if "windspdmph_avg10m" in data:
-            data["windspdmph_avg10m"] = float(data["windspdmph_avg10m"])
-            data["windspdkmh_avg10m"] = round(float(data["windspdmph_avg10m"]
-                                                    * mph_kmh), 2)
-            data["windspdms_avg10m"] = round(float(data["windspdmph_avg10m"]
-                                                   * mph_ms), 2)
-
-        # distances
-        if "rainratein" in data:
-            data["rainratein"] = float(data["rainratein"])
-            data["rainratemm"] = round(data["rainratein"] * in_mm, 2)
-        if "eventrainin" in data:
-            data["eventrainin"] = float(data["eventrainin"])
-            data["eventrainmm"] = round(data["eventrainin"] * in_mm, 2)
-        if "hourlyrainin" in data:
-            data["hourlyrainin"] = float(data["hourlyrainin"])
-            data["hourlyrainmm"] = round(data["hourlyrainin"] * in_mm, 2)
-        if "dailyrainin" in data:
-            data["dailyrainin"] = float(data["dailyrainin"])
-            data["dailyrainmm"] = round(data["dailyrainin"] * in_mm, 2)
-        if "weeklyrainin" in data:
-            data["weeklyrainin"] = float(data["weeklyrainin"])
-            data["weeklyrainmm"] = round(data["weeklyrainin"] * in_mm, 2)
-        if "monthlyrainin" in data:
-            data["monthlyrainin"] = float(data["monthlyrainin"])
-            data["monthlyrainmm"] = round(data["monthlyrainin"] * in_mm, 2)
-        if "yearlyrainin" in data:
-            data["yearlyrainin"] = float(data["yearlyrainin"])
-            data["yearlyrainmm"] = round(data["yearlyrainin"] * in_mm, 2)
-        if "totalrainin" in data:
-            data["totalrainin"] = float(data["totalrainin"])
-            data["totalrainmm"] = round(data["totalrainin"] * in_mm, 2)
-
-        # piezo rain sensor
-        if "rrain_piezo" in data:
-            data["rrain_piezo"] = float(data["rrain_piezo"])
-            data["rrain_piezomm"] = round(data["rrain_piezo"] * in_mm, 2)
-        if "eventrainin" in data:
-            data["erain_piezo"] = float(data["erain_piezo"])
-            data["erain_piezomm"] = round(data["erain_piezo"] * in_mm, 2)
-        if "hrain_piezo" in data:
-            data["hrain_piezo"] = float(data["hrain_piezo"])
-            data["hrain_piezomm"] = round(data["hrain_piezo"] * in_mm, 2)
-        if "drain_piezo" in data:
-            data["drain_piezo"] = float(data["drain_piezo"])
-            data["drain_piezomm"] = round(data["drain_piezo"] * in_mm, 2)
-        if "wrain_piezo" in data:
-            data["wrain_piezo"] = float(data["wrain_piezo"])
-            data["wrain_piezomm"] = round(data["wrain_piezo"] * in_mm, 2)
-        if "mrain_piezo" in data:
-            data["mrain_piezo"] = float(data["mrain_piezo"])
-            data["mrain_piezomm"] = round(data["mrain_piezo"] * in_mm, 2)
-        if "yrain_piezo" in data:
-            data["yrain_piezo"] = float(data["yrain_piezo"])
-            data["yrain_piezomm"] = round(data["yrain_piezo"] * in_mm, 2)
-
-        # Pressure
-        if "baromrelin" in data:
-            data["baromrelin"] = float(data["baromrelin"])
-            data["baromrelhpa"] = round(data["baromrelin"] * in_hpa, 2)
-        if "baromabsin" in data:
-            data["baromabsin"] = float(data["baromabsin"])
-            data["baromabshpa"] = round(data["baromabsin"] * in_hpa, 2)
-
-        # Calculated values for fun!
-        if "tempf" in data and "windspeedmph" in data:
-            data["windchillf"] = self._wind_chill(data["tempf"],
-                                                  data["windspeedmph"])
-            data["windchillc"] = self._ftoc(data["windchillf"])
-        for j in ['', 'in', '1', '2', '3', '4', '5', '6', '7', '8']:
-            if "temp" + j + "c" in data and "humidity" + j in data:
-                data["dewpoint" + j + "c"] = self.get_dew_point_c(data["temp" + j + "c"],
-                                                                  data["humidity" + j])
-                data["dewpoint" + j + "f"] = round((data["dewpoint" + j + "c"] * 9.0 / 5.0) + 32.0, 2)
-
-        # Soil moisture (WH51)
-        for j in range(1, 9):
-            sm = f"soilmoisture{j}"
-            if sm in data:
-                data[sm] = int(data[sm])
-
-        # PM 2.5 sensor (WH41)
-        for j in range(1, 5):
-            pm = f"pm25_ch{j}"
-            pma = f"pm25_avg_24h_ch{j}"
-            if pm in data:
-                data[pm] = float(data[pm])
-            if pma in data:
-                data[pma] = float(data[pma])
-
-        # Leak sensor (WH55)
-        for j in range(1, 5):
-            lk = f"leak_ch{j}"
-            if lk in data:
-                data[lk] = int(data[lk])
-
-        # CO2 indoor air quality (WH45) (note temp is in temps above)
-        pm_floats = [
-            "pm25",
-            "pm25_24h",
-            "pm10",
-            "pm10_24",
-        ]
-        for prefix in pm_floats:
-            sm = f"{prefix}_co2"
-            if sm in data:
-                data[sm] = float(data[sm])
-        if "co2" in data:
-            data["co2"] = int(data["co2"])
-        if "co2_24h" in data:
-            data["co2_24h"] = int(data["co2_24h"])
-        if "humi_co2" in data:
-            data["humi_co2"] = int(data["humi_co2"])
-
-        # Batteries
-        bat_names = [
-            "wh25",
-            "wh26",
-            "wh40",
-            "wh57",
-            "wh65",
-            "wh68",
-            "wh80",
-            "wh90",
-            "co2_",
-        ]
-        bat_range_names = [
-            "soil",
-            "",  # for just 'batt'
-            "pm25",
-            "leak",
-            "tf_",  # WN34 voltage type
-        ]
-        bat_names_exact = [
-            "ws90cap_volt"
-        ]
-
-        for prefix in bat_names:
-            sm = f"{prefix}batt"
-            if sm in data:
-                data[sm] = float(data[sm])
-
-        for r_prefix in bat_range_names:
-            for j in range(1, 9):
-                sm = f"{r_prefix}batt{j}"
-                if sm in data:
-                    data[sm] = float(data[sm])
-
-        for name in bat_names_exact:
-            if name in data:
-                data[name] = float(data[name])
-
-        # percentage battery for device view
-        if "wh90batt" in data:
-            data["wh90battpc"] = self._volt_to_percent(data["wh90batt"], 2.4, 3.0)
-
-        return(data)
-
-    def find_sensor(self, key):
-        for sensor in self.sensors:
-            if sensor.get_key() == key:
-                return sensor
-        return None
+        return self.converter.convert(data, self.windchill_type)
+
+    def route(self, weather_data):
+        """Return the station a packet belongs to, creating it if new."""
+        if not self.multi_station:
+            return self._default_station
+        station_id = get_station_id(weather_data)
+        station = self.stations.get(station_id)
+        if station is None:
+            station = EcoWittStation(station_id, history=self.history,
+                                     stats=self.stats)
+            self.stations[station_id] = station
+            if len(self.stations) == 1:
+                self._default_station = station
+        return station
 
     def parse_ws_data(self, weather_data):
-        for sensor in weather_data.keys():
-            sensor_dev = self.find_sensor(sensor)
-            if sensor_dev is None:
-                # we have a new sensor
-                if sensor not in SENSOR_MAP:
-                    self.log.warning("Unhandled sensor type %s value %s, "
-                                     + "file a PR.", sensor, weather_data[sensor])
-                    continue
-                sensor_dev = EcoWittSensor(SENSOR_MAP[sensor][MAP_NAME],
-                                           sensor,
-                                           SENSOR_MAP[sensor][MAP_SYSTEM],
-                                           SENSOR_MAP[sensor][MAP_STYPE].name)
-                self.sensors.append(sensor_dev)
-                self.int_new_sensor_cb()
-
-            sensor_dev.set_value(weather_data[sensor])
-            sensor_dev.set_lastupd(time.time())
-            sensor_dev.set_lastupd_m(time.monotonic())
+        self.route(weather_data).parse_ws_data(weather_data,
+                                               self.int_new_sensor_cb)
+
+    def decode_body(self, body, charset=None):
+        """Decode an urlencoded body into converted weather data.
+
+        With fast_decode, a plain ASCII body is decoded and typed in one
+        pass.
+        """
+        timings = self.timings
+        if timings is not None:
+            start = time.perf_counter()
+        if self.fast_decode and charset in FAST_DECODE_CHARSETS:
+            data = decode_form(body)
+            if data is not None:
+                if timings is not None:
+                    start = timings.record("decode", start)
+                data = self.converter.convert(data, self.windchill_type,
+                                              typed=True)
+                if timings is not None:
+                    timings.record("convert", start)
+                return data
+        data = parse_form(body, charset)
+        if timings is not None:
+            start = timings.record("decode", start)
+        data = self.convert_units(data)
+        if timings is not None:
+            timings.record("convert", start)
+        return data
+
+    async def read_payload(self, request):
+        """Read a POST, returning (body, charset, form).
+
+        Posts are parsed by aiohttp into a dict of form fields, with body
+        None.  Only a plain ASCII/UTF-8 urlencoded post that fast_decode
+        or the ingest queue will decode later is returned as the raw
+        body instead, with form None.
+        """
+        timings = self.timings
+        if timings is not None:
+            start = time.perf_counter()
+        if (request.content_type == FORM_CONTENT_TYPE and
+                request.charset in FAST_DECODE_CHARSETS and
+                (self.fast_decode or self.ingest_queue is not None)):
+            body = await request.read()
+            if timings is not None:
+                timings.record("read", start)
+            return (body, request.charset, None)
+        data = await request.post()
+        # data is not a dict, it's a MultiDict
+        data_copy = {}
+        for k in data.keys():
+            data_copy[k] = data[k]
+        if timings is not None:
+            timings.record("read", start)
+        return (None, None, data_copy)
+
+    async def read_weather_data(self, request):
+        """Read a POST body and return the converted weather data."""
+        return self.convert_payload(await self.read_payload(request))
+
+    def convert_payload(self, payload):
+        """Convert a payload from read_payload into weather data."""
+        body, charset, form = payload
+        if body is not None:
+            return self.decode_body(body, charset)
+        timings = self.timings
+        if timings is None:
+            return self.convert_units(form)
+        start = time.perf_counter()
+        data = self.convert_units(form)
+        timings.record("convert", start)
+        return data
+
+    def ingest(self, weather_data):
+        """Store converted weather data and hand it to the listeners."""
+        timings = self.timings
+        if timings is not None:
+            start = time.perf_counter()
+        station = self.route(weather_data)
+        station.update(weather_data, self.int_new_sensor_cb)
+        if timings is not None:
+            start = timings.record("parse", start)
+        if self.metrics is not None:
+            self.metrics.invalidate()
+        if self.storage is not None:
+            try:
+                self.storage.append(station.station_id, station.lastupd,
+                                    weather_data)
+            except Exception as e:
+                self.storage_failed += 1
+                self.log.warning("Failed to store packet: %s", e)
+        self.dispatcher.dispatch(weather_data, station.station_id)
+        if timings is not None:
+            timings.record("dispatch", start)
+        if self.waiters:
+            self.waiters.notify(station.station_id, weather_data)
+
+    def process_payload(self, payload):
+        """Convert and ingest a payload from read_payload."""
+        self.ingest(self.convert_payload(payload))
 
     async def handler(self, request: web.BaseRequest):
+        profiler = self.profiler
+        if profiler is None or request.method != 'POST':
+            return await self.handle_request(request)
+        profiler.enter()
+        try:
+            return await self.handle_request(request)
+        finally:
+            if profiler.exit() and profiler is self.profiler:
+                self.stop_profiling()
+
+    async def handle_request(self, request):
+        """Answer a request: ingest a POST, serve metrics on a GET."""
         if (request.method == 'POST'):
-            data = await request.post()
-            # data is not a dict, it's a MultiDict
-            data_copy = {}
-            for k in data.keys():
-                data_copy[k] = data[k]
-            weather_data = self.convert_units(data_copy)
-            self.last_values = weather_data.copy()
-            self.data_valid = True
-            self.lastupd = time.time()
-            self.parse_ws_data(weather_data)
-            for rl in self.r_listeners:
-                try:
-                    await rl(weather_data)
-                except:
-                    pass
+            payload = await self.read_payload(request)
+            if self.capture is not None:
+                body, _, form = payload
+                self.capture.write(body if body is not None else form)
+            if self.ingest_queue is None:
+                self.process_payload(payload)
+            elif not self.ingest_queue.put(payload):
+                if self.metrics is not None:
+                    self.metrics.invalidate()
+                return web.Response(status=503, text="Busy")
+        elif (self.metrics is not None and request.method == 'GET' and
+                request.path == METRICS_PATH):
+            return web.Response(body=self.metrics.render(),
+                                headers={"Content-Type":
+                                         METRICS_CONTENT_TYPE})
 
         return web.Response(text="OK")
 
-    async def wait_for_valid_data(self):
-        """ Wait for valid data, then return true. """
-        while not self.data_valid:
-            await asyncio.sleep(1)
-        return self.data_valid
+    def get_ingest_stats(self):
+        """Return the ingest queue's depth, counters and wait times."""
+        if self.ingest_queue is None:
+            return None
+        return self.ingest_queue.get_stats()
+
+    async def wait_for_ingest(self):
+        """Wait until every queued payload has been processed."""
+        if self.ingest_queue is not None:
+            await self.ingest_queue.join()
+
+    async def wait_for_valid_data(self, timeout=None, station=None):
+        """ Wait for valid data, then return true, false on timeout. """
+        st = self.get_station(station)
+        if st is not None and st.data_valid:
+            return True
+        await self.waiters.wait(station=station, timeout=timeout)
+        st = self.get_station(station)
+        return st is not None and st.data_valid
+
+    async def wait_for_next_packet(self, timeout=None, station=None):
+        """Wait for the next packet, from station if given.
+
+        Returns the converted packet, or None on timeout.
+        """
+        return await self.waiters.wait(station=station, timeout=timeout)
+
+    async def wait_for_sensor(self, key, timeout=None, station=None):
+        """Wait until a sensor with key exists, from station if given.
+
+        Returns the EcoWittSensor, or None on timeout, or if key is not
+        a sensor we know how to handle.
+        """
+        if station is not None:
+            dev = self.find_sensor(key, station)
+            if dev is not None:
+                return dev
+        else:
+            for st in self.stations.values():
+                dev = st.sensors.get(key)
+                if dev is not None:
+                    return dev
+        data = await self.waiters.wait(station=station, key=key,
+                                       timeout=timeout)
+        if data is None:
+            return None
+        return self.find_sensor(key, self.route(data).station_id)
 
     async def listen(self):
         """ Listen and process."""
 
-        self.server = web.Server(self.handler)
-        self.runner = web.ServerRunner(self.server)
-        await self.runner.setup()
-        self.site = web.TCPSite(self.runner, port=self.port)
-        await self.site.start()
+        if self.workers > 1:
+            self.supervisor = EcoWittSupervisor(self, self.workers)
+            self.supervisor.start()
+        else:
+            self.server = web.Server(self.handler)
+            self.runner = web.ServerRunner(self.server)
+            await self.runner.setup()
+            self.site = web.TCPSite(self.runner, port=self.port,
+                                    reuse_port=self.reuse_port or None)
+            await self.site.start()
 
         while True:
             await asyncio.sleep(10000)
 
     async def stop(self):
-        await self.site.stop()
+        if self.ingest_queue is not None:
+            await self.ingest_queue.stop()
+        await self.dispatcher.stop()
+        if self.supervisor is not None:
+            await self.supervisor.stop()
+            self.supervisor = None
+        if self.site is not None:
+            await self.site.stop()
+        if self.storage is not None:
+            self.storage.close()
+        if self.capture is not None:
+            self.capture.close()
 
     async def start(self):
         loop = asyncio.get_event_loop()
@@ -495,24 +607,92 @@ class EcoWittListener:
             loop.close()
 
     # Accessor functions
-    def list_sensor_keys(self):
+    def get_station(self, station=None):
+        """Get a station by id, None for the default station."""
+        if station is None:
+            return self._default_station
+        return self.stations.get(station)
+
+    def list_stations(self):
+        """List the ids of all stations that have reported."""
+        return [st.station_id for st in self.stations.values()
+                if st.data_valid]
+
+    def get_station_info(self, station=None):
+        """Return the type, model, frequency and MAC of a station."""
+        st = self.get_station(station)
+        if st is None:
+            return None
+        return st.get_station_info()
+
+    def find_sensor(self, key, station=None):
+        st = self.get_station(station)
+        if st is None:
+            return None
+        return st.sensors.get(key)
+
+    def list_sensor_keys(self, station=None):
         """List all available sensors by key."""
-        sensor_list = []
-        for sensor in self.sensors:
-            sensor_list.append(sensor.get_key())
-        return sensor_list
+        st = self.get_station(station)
+        if st is None:
+            return []
+        return st.sensors.keys()
 
-    def list_sensor_keys_by_type(self, stype):
+    def list_sensor_keys_by_type(self, stype, station=None):
         """List all available sensors of a given type."""
-        sensor_list = []
-        for sensor in self.sensors:
-            if sensor.get_stype() == stype:
-                sensor_list.append(sensor.get_key())
-        return sensor_list
-
-    def get_sensor_value_by_key(self, key):
+        st = self.get_station(station)
+        if st is None:
+            return []
+        return st.sensors.keys_by_type(stype)
+
+    def list_sensor_keys_by_system(self, system, station=None):
+        """List all available sensors of a given unit system."""
+        st = self.get_station(station)
+        if st is None:
+            return []
+        return st.sensors.keys_by_system(system)
+
+    def get_sensor_history(self, key, station=None):
+        """Find the sensor named key and return its SensorHistory."""
+        dev = self.find_sensor(key, station)
+        if dev is None:
+            return None
+        return dev.get_history()
+
+    def get_sensor_log(self, key, start=None, end=None, station=None):
+        """Return ([timestamps], [values]) of key from the history log,
+        between start and end in epoch seconds."""
+        if self.storage is None:
+            return [], []
+        st = self.get_station(station)
+        if st is None:
+            return [], []
+        return self.storage.read(key, start, end, st.station_id)
+
+    def get_sensor_value_by_key(self, key, station=None):
         """Find the sensor named key and return its value."""
-        dev = self.find_sensor(key)
+        dev = self.find_sensor(key, station)
         if dev is None:
             return None
         return dev.get_value()
+
+    def get_sensor_stats_by_key(self, key, window=600, station=None):
+        """Find the sensor named key and return its statistics over the
+        last window seconds.
+
+        A dict of count, min, max, mean and stddev; for wind direction,
+        count, mean and resultant.  None if not kept for key and window.
+        """
+        dev = self.find_sensor(key, station)
+        if dev is None:
+            return None
+        return dev.get_stats(window, time.monotonic())
+
+    def get_sensor_stats(self, key, station=None):
+        """Find the sensor named key and return its statistics over every
+        window kept, keyed by window in seconds."""
+        dev = self.find_sensor(key, station)
+        if dev is None or dev.stats is None:
+            return {}
+        now = time.monotonic()
+        return {window: dev.get_stats(window, now) for window in dev.stats}
@@ -1,5 +1,7 @@
 """
 A bone-simple fake client used to test the hass integration
+
+For load testing, many stations at once, see loadgen.py.
 """
 import http.client
 import sys
@@ -0,0 +1,107 @@
+"""
+In-memory per-sensor history.
+
+Each numeric sensor can keep a fixed capacity ring buffer of (monotonic
+time, value) pairs in two array('d')s.  Readers get memoryview slices of
+those arrays, so dashboards and derived metrics can look at recent
+history without copying it.
+"""
+
+from array import array
+from bisect import bisect_left
+
+from .sensor_map import EcoWittSensorTypes
+
+# samples kept per sensor when retention does not say otherwise; a
+# gateway reporting every 16 seconds fills this in a bit over an hour
+HISTORY_CAPACITY = 256
+
+
+def history_capacity(retention, stype):
+    """How many samples to keep for a sensor of stype.
+
+    retention is an int capacity for every stype, or a dict keyed by
+    EcoWittSensorTypes (or their names), with None as the default for
+    unlisted stypes.  0 keeps no history.
+    """
+    if retention is None:
+        return 0
+    if isinstance(retention, int):
+        return retention
+    if isinstance(stype, EcoWittSensorTypes):
+        stype = stype.name
+    for key, capacity in retention.items():
+        if isinstance(key, EcoWittSensorTypes):
+            key = key.name
+        if key == stype:
+            return capacity
+    return retention.get(None, HISTORY_CAPACITY)
+
+
+class SensorHistory:
+    """A fixed capacity ring buffer of (monotonic time, value)."""
+    __slots__ = ("capacity", "_ts", "_values", "_next", "_count")
+
+    def __init__(self, capacity=HISTORY_CAPACITY):
+        """Initialize."""
+        self.capacity = capacity
+        self._ts = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, ts, value):
+        """Record value at monotonic time ts, dropping the oldest if full."""
+        i = self._next
+        self._ts[i] = ts
+        self._values[i] = value
+        i += 1
+        self._next = 0 if i == self.capacity else i
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self):
+        """Forget everything."""
+        self._next = 0
+        self._count = 0
+
+    def segments(self):
+        """Return the history, oldest first, as up to two zero-copy
+        (timestamps, values) memoryview pairs."""
+        ts = memoryview(self._ts)
+        values = memoryview(self._values)
+        if self._count < self.capacity:
+            return [(ts[:self._count], values[:self._count])]
+        i = self._next
+        if i == 0:
+            return [(ts, values)]
+        return [(ts[i:], values[i:]), (ts[:i], values[:i])]
+
+    def window(self, since):
+        """Like segments, but only samples at or after monotonic time since."""
+        out = []
+        for ts, values in self.segments():
+            start = bisect_left(ts, since)
+            if start < len(ts):
+                out.append((ts[start:], values[start:]))
+        return out
+
+    def latest(self):
+        """Return the newest (timestamp, value), or None if empty."""
+        if not self._count:
+            return None
+        i = self._next - 1
+        return (self._ts[i], self._values[i])
+
+    def to_lists(self, since=None):
+        """Copy the history out as ([timestamps], [values])."""
+        segments = self.segments() if since is None else self.window(since)
+        ts = []
+        values = []
+        for seg_ts, seg_values in segments:
+            ts.extend(seg_ts)
+            values.extend(seg_values)
+        return ts, values
@@ -0,0 +1,94 @@
+"""
+Acknowledge-first ingest.
+
+The handler drops each raw payload into a bounded IngestQueue and replies
+to the gateway at once; a worker task then converts and dispatches it.
+"""
+
+import asyncio
+import logging
+import time
+
+from .workqueue import WorkerQueue
+
+# What to do with a new payload when the queue is full.
+INGEST_DROP_OLDEST = 0
+INGEST_REJECT = 1
+
+INGEST_QUEUE_SIZE = 64
+
+
+class IngestQueue(WorkerQueue):
+    """A bounded queue of raw payloads and the worker that processes them."""
+    def __init__(self, process, queue_size=INGEST_QUEUE_SIZE,
+                 policy=INGEST_DROP_OLDEST):
+        """Initialize.
+
+        process is called with every payload, in order.  With
+        INGEST_REJECT, put() refuses new payloads while the queue is
+        full, so the caller can answer 503 and the gateway retries.
+        """
+        # queued as (enqueue monotonic time, payload)
+        super().__init__(queue_size)
+        self.process = process
+        self.policy = policy
+        self.log = logging.getLogger(__name__)
+
+        self.accepted = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_last = 0.0
+
+    def put(self, payload):
+        """Queue payload, return False if it was rejected."""
+        if len(self._queue) >= self.queue_size:
+            if self.policy == INGEST_REJECT:
+                self.rejected += 1
+                return False
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append((time.monotonic(), payload))
+        self.accepted += 1
+        if len(self._queue) > self.max_depth:
+            self.max_depth = len(self._queue)
+        self._wake()
+        return True
+
+    async def _handle(self, item):
+        queued, payload = item
+        wait = time.monotonic() - queued
+        self.wait_last = wait
+        self.wait_total += wait
+        if wait > self.wait_max:
+            self.wait_max = wait
+        try:
+            self.process(payload)
+        except Exception as e:
+            self.failed += 1
+            self.log.warning("Failed to process payload: %s", e)
+        else:
+            self.processed += 1
+        # processing is CPU bound, let the server answer gateways
+        await asyncio.sleep(0)
+
+    def get_stats(self):
+        """Return queue depth, counters and wait times in seconds."""
+        done = self.processed + self.failed
+        return {
+            "depth": len(self._queue),
+            "max_depth": self.max_depth,
+            "queue_size": self.queue_size,
+            "accepted": self.accepted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "wait_last": self.wait_last,
+            "wait_max": self.wait_max,
+            "wait_mean": self.wait_total / done if done else 0.0,
+        }
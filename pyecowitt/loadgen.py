@@ -0,0 +1,260 @@
+"""
+Async load generator: many simulated gateways posting to a listener.
+
+Every station gets its own PASSKEY and MAC and posts paramset_b, with
+each numeric value taking a bounded random walk between reports, every
+interval seconds give or take jitter.  Stations come online over a ramp,
+optionally in steps, all sharing a pool of keep-alive connections.
+Every report period it prints how many stations are online, the rate
+they offer, the rate the server acknowledged, errors and latency
+percentiles, which makes the point where the listener falls behind easy
+to spot.  Latency is measured at the client, so it includes any wait for
+a free pooled connection.
+
+Usage: python -m pyecowitt.loadgen host port [-s stations] [-i interval]
+           [-j jitter] [-r ramp] [--steps n] [-d duration]
+           [-c connections] [--report seconds]
+"""
+import argparse
+import asyncio
+import random
+import urllib.parse
+
+import aiohttp
+
+from .fake_client import paramset_b
+from .sensor_map import MAP_STYPE, SENSOR_MAP
+
+# stype -> (step sigma, low, high) of the random walk
+WALKS = {
+    "pressure_inhg": (0.005, 27.0, 32.0),
+    "pressure_hpa": (0.2, 900.0, 1080.0),
+    "rate_inches": (0.002, 0.0, 20.0),
+    "humidity": (1.0, 0.0, 100.0),
+    "degree": (15.0, None, None),
+    "speed_mph": (0.8, 0.0, 80.0),
+    "speed_kph": (1.3, 0.0, 130.0),
+    "speed_mps": (0.4, 0.0, 36.0),
+    "temperature_f": (0.3, -40.0, 140.0),
+    "temperature_c": (0.2, -40.0, 60.0),
+    "watt_meters_squared": (20.0, 0.0, 1400.0),
+    "uv_index": (0.5, 0.0, 15.0),
+    "pm25": (0.5, 0.0, 500.0),
+    "pm10": (0.5, 0.0, 500.0),
+    "co2_ppm": (5.0, 300.0, 5000.0),
+}
+
+
+def _decimals(value):
+    text = str(value)
+    return len(text) - text.index('.') - 1 if '.' in text else 0
+
+
+class SimulatedStation:
+    """One gateway's identity and drifting sensor values."""
+    def __init__(self, n, paramset=paramset_b, rng=None):
+        """Initialize."""
+        self.rng = rng or random.Random(n)
+        self.values = dict(paramset)
+        self.values["PASSKEY"] = "{0:032X}".format(n)
+        self.values["mac"] = ":".join(
+            "{0:02X}".format((n >> shift) & 0xFF)
+            for shift in (40, 32, 24, 16, 8, 0))
+        # key -> (sigma, low, high, decimals)
+        self.walks = {}
+        for key, value in paramset.items():
+            if key not in SENSOR_MAP or isinstance(value, str):
+                continue
+            walk = WALKS.get(SENSOR_MAP[key][MAP_STYPE].name)
+            if walk is not None:
+                self.walks[key] = walk + (_decimals(value),)
+
+    def step(self):
+        """Move every walked value one step."""
+        gauss = self.rng.gauss
+        for key, (sigma, low, high, decimals) in self.walks.items():
+            value = self.values[key] + gauss(0.0, sigma)
+            if low is None:
+                value %= 360
+            else:
+                value = min(high, max(low, value))
+            self.values[key] = round(value, decimals) if decimals else \
+                int(round(value))
+
+    def body(self):
+        """The next upload, urlencoded."""
+        self.step()
+        return urllib.parse.urlencode(self.values)
+
+
+class LoadStats:
+    """Request outcomes and latencies, per report period and overall."""
+    def __init__(self):
+        """Initialize."""
+        self.online = 0
+        self.offered = 0
+        self.ok = 0
+        self.busy = 0
+        self.errors = 0
+        self.latencies = []
+        self.total_ok = 0
+        self.total_busy = 0
+        self.total_errors = 0
+        self.total_latencies = []
+
+    def record(self, status, latency):
+        if status == 200:
+            self.ok += 1
+            self.latencies.append(latency)
+        elif status == 503:
+            self.busy += 1
+        else:
+            self.errors += 1
+
+    def roll(self):
+        """Return the period's numbers and start a new period."""
+        period = {
+            "online": self.online,
+            "offered": self.offered,
+            "ok": self.ok,
+            "busy": self.busy,
+            "errors": self.errors,
+            "latency": percentiles(self.latencies),
+        }
+        self.total_ok += self.ok
+        self.total_busy += self.busy
+        self.total_errors += self.errors
+        self.total_latencies.extend(self.latencies)
+        self.offered = self.ok = self.busy = self.errors = 0
+        self.latencies = []
+        return period
+
+
+def percentiles(latencies):
+    """p50/p95/p99/max of latencies, in milliseconds."""
+    if not latencies:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    latencies = sorted(latencies)
+    n = len(latencies)
+    return {
+        "p50": latencies[n // 2] * 1e3,
+        "p95": latencies[min(n - 1, n * 95 // 100)] * 1e3,
+        "p99": latencies[min(n - 1, n * 99 // 100)] * 1e3,
+        "max": latencies[-1] * 1e3,
+    }
+
+
+def start_delay(n, stations, ramp, steps):
+    """When station n comes online, in seconds from the start."""
+    if ramp <= 0 or stations <= 1:
+        return 0.0
+    if steps:
+        return ramp * (n * steps // stations) / steps
+    return ramp * n / stations
+
+
+async def run_station(session, url, station, stats, delay, interval,
+                      jitter, deadline):
+    headers = {'Content-type': 'application/x-www-form-urlencoded'}
+    rng = station.rng
+    # spread first reports over one interval so stations are not in step
+    await asyncio.sleep(delay + rng.uniform(0, interval))
+    stats.online += 1
+    loop = asyncio.get_running_loop()
+    next_report = loop.time()
+    while loop.time() < deadline:
+        stats.offered += 1
+        start = loop.time()
+        try:
+            async with session.post(url, data=station.body(),
+                                    headers=headers) as r:
+                await r.read()
+                stats.record(r.status, loop.time() - start)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            stats.record(None, None)
+        next_report += interval + rng.uniform(-jitter, jitter)
+        await asyncio.sleep(max(0.0, next_report - loop.time()))
+
+
+def print_period(elapsed, period, seconds):
+    lat = period["latency"]
+    print("{0:7.1f}s {1:6d} online  offered {2:8.1f}/s  ok {3:8.1f}/s  "
+          "busy {4:6d}  errors {5:6d}  p50 {6}  p99 {7}".format(
+              elapsed, period["online"], period["offered"] / seconds,
+              period["ok"] / seconds, period["busy"], period["errors"],
+              _ms(lat["p50"]), _ms(lat["p99"])))
+
+
+def _ms(value):
+    return "   -    " if value is None else "{0:6.1f}ms".format(value)
+
+
+async def generate(host, port, stations=1000, interval=16.0, jitter=1.0,
+                   ramp=0.0, steps=0, duration=60.0, connections=100,
+                   report=5.0, path="/"):
+    """Run the load and return overall totals and latency percentiles."""
+    url = "http://{0}:{1}{2}".format(host, port, path)
+    loop = asyncio.get_running_loop()
+    stats = LoadStats()
+    start = loop.time()
+    deadline = start + duration
+    connector = aiohttp.TCPConnector(limit=connections)
+    timeout = aiohttp.ClientTimeout(total=max(30.0, interval))
+    async with aiohttp.ClientSession(connector=connector,
+                                     timeout=timeout) as session:
+        tasks = [asyncio.ensure_future(run_station(
+            session, url, SimulatedStation(n), stats,
+            start_delay(n, stations, ramp, steps), interval, jitter,
+            deadline)) for n in range(stations)]
+        last = start
+        pending = tasks
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout=report)
+            now = loop.time()
+            if now - last >= 0.1:
+                print_period(now - start, stats.roll(), now - last)
+                last = now
+        await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+    stats.roll()
+    return {
+        "elapsed": elapsed,
+        "ok": stats.total_ok,
+        "busy": stats.total_busy,
+        "errors": stats.total_errors,
+        "ok_per_sec": stats.total_ok / elapsed,
+        "latency": percentiles(stats.total_latencies),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Simulate many Ecowitt gateways posting to a listener.")
+    parser.add_argument("host")
+    parser.add_argument("port", type=int)
+    parser.add_argument("-s", "--stations", type=int, default=1000)
+    parser.add_argument("-i", "--interval", type=float, default=16.0,
+                        help="seconds between a station's reports")
+    parser.add_argument("-j", "--jitter", type=float, default=1.0,
+                        help="+/- seconds of random jitter per report")
+    parser.add_argument("-r", "--ramp", type=float, default=0.0,
+                        help="seconds over which stations come online")
+    parser.add_argument("--steps", type=int, default=0,
+                        help="bring stations online in this many steps")
+    parser.add_argument("-d", "--duration", type=float, default=60.0)
+    parser.add_argument("-c", "--connections", type=int, default=100,
+                        help="keep-alive connection pool size")
+    parser.add_argument("--report", type=float, default=5.0,
+                        help="seconds between progress lines")
+    args = parser.parse_args()
+
+    totals = asyncio.run(generate(
+        args.host, args.port, args.stations, args.interval, args.jitter,
+        args.ramp, args.steps, args.duration, args.connections,
+        args.report))
+    lat = totals["latency"]
+    print("total {0} ok, {1} busy, {2} errors in {3:.1f}s: {4:.1f}/s, "
+          "p50 {5} p95 {6} p99 {7} max {8}".format(
+              totals["ok"], totals["busy"], totals["errors"],
+              totals["elapsed"], totals["ok_per_sec"], _ms(lat["p50"]),
+              _ms(lat["p95"]), _ms(lat["p99"]), _ms(lat["max"])))
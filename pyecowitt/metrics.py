@@ -0,0 +1,156 @@
+"""
+Prometheus text exposition of an EcoWittListener's state.
+
+EcoWittListener(metrics=True) answers GET /metrics on its own port with
+every numeric sensor value, labelled by station, key, name, stype and
+unit system, the station, ingest, storage and listener counters, and
+the stage timing histograms when timing is enabled.  Rendering walks
+every sensor of every station, so the text is cached and only
+rebuilt on the first scrape after a packet arrives; listener counters
+that move in between show up with the next packet.
+"""
+
+from .sensor_map import (
+    SYSTEM_IMPERIAL,
+    SYSTEM_METRIC,
+    SYSTEM_METRIC_MS,
+)
+
+METRICS_PATH = "/metrics"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SYSTEM_NAMES = {
+    None: "none",
+    SYSTEM_METRIC: "metric",
+    SYSTEM_IMPERIAL: "imperial",
+    SYSTEM_METRIC_MS: "metric_ms",
+}
+
+# ingest queue stats -> (metric, type)
+_INGEST_METRICS = (
+    ("depth", "ecowitt_ingest_queue_depth", "gauge"),
+    ("max_depth", "ecowitt_ingest_queue_max_depth", "gauge"),
+    ("queue_size", "ecowitt_ingest_queue_size", "gauge"),
+    ("accepted", "ecowitt_ingest_accepted_total", "counter"),
+    ("processed", "ecowitt_ingest_processed_total", "counter"),
+    ("failed", "ecowitt_ingest_failed_total", "counter"),
+    ("dropped", "ecowitt_ingest_dropped_total", "counter"),
+    ("rejected", "ecowitt_ingest_rejected_total", "counter"),
+    ("wait_max", "ecowitt_ingest_wait_max_seconds", "gauge"),
+    ("wait_mean", "ecowitt_ingest_wait_mean_seconds", "gauge"),
+)
+# listener queue stats -> (metric, type)
+_LISTENER_METRICS = (
+    ("pending", "ecowitt_listener_pending", "gauge"),
+    ("delivered", "ecowitt_listener_delivered_total", "counter"),
+    ("failed", "ecowitt_listener_failed_total", "counter"),
+    ("timed_out", "ecowitt_listener_timed_out_total", "counter"),
+    ("dropped", "ecowitt_listener_dropped_total", "counter"),
+    ("coalesced", "ecowitt_listener_coalesced_total", "counter"),
+)
+
+
+def escape(value):
+    """Escape a label value."""
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def labels(**kwargs):
+    return "{" + ",".join('{0}="{1}"'.format(k, escape(v))
+                          for k, v in kwargs.items()) + "}"
+
+
+def _le(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+class MetricsExporter:
+    """Renders, and caches, the metrics of an EcoWittListener."""
+    def __init__(self, listener):
+        """Initialize."""
+        self.listener = listener
+        self.dirty = True
+        self.renders = 0
+        self._text = b""
+
+    def invalidate(self):
+        """Mark the cached text stale; the next scrape rebuilds it."""
+        self.dirty = True
+
+    def render(self):
+        """Return the exposition text as bytes."""
+        if self.dirty:
+            # clear first: a packet arriving mid-render marks it again
+            self.dirty = False
+            self._text = "\n".join(self.lines()).encode("utf-8") + b"\n"
+            self.renders += 1
+        return self._text
+
+    def lines(self):
+        ws = self.listener
+        stations = [st for st in ws.stations.values() if st.data_valid]
+
+        yield "# HELP ecowitt_sensor_value Latest sensor reading."
+        yield "# TYPE ecowitt_sensor_value gauge"
+        for st in stations:
+            station = st.station_id or ""
+            for sensor in st.sensors:
+                value = sensor.value
+                if type(value) not in (int, float):
+                    continue
+                yield "ecowitt_sensor_value{0} {1!r}".format(
+                    labels(station=station, key=sensor.key,
+                           name=sensor.name, stype=sensor.stype,
+                           system=SYSTEM_NAMES.get(sensor.system,
+                                                   sensor.system)),
+                    float(value))
+
+        yield "# HELP ecowitt_station_packets_total Packets received."
+        yield "# TYPE ecowitt_station_packets_total counter"
+        for st in stations:
+            yield "ecowitt_station_packets_total{0} {1}".format(
+                labels(station=st.station_id or ""), st.packets)
+        yield ("# HELP ecowitt_station_last_update_timestamp_seconds "
+               "When the last packet arrived.")
+        yield "# TYPE ecowitt_station_last_update_timestamp_seconds gauge"
+        for st in stations:
+            yield "ecowitt_station_last_update_timestamp_seconds{0} {1!r}" \
+                .format(labels(station=st.station_id or "",
+                               model=st.station_model,
+                               stationtype=st.station_type),
+                        float(st.lastupd))
+
+        if ws.ingest_queue is not None:
+            stats = ws.ingest_queue.get_stats()
+            for key, metric, mtype in _INGEST_METRICS:
+                yield "# TYPE {0} {1}".format(metric, mtype)
+                yield "{0} {1!r}".format(metric, float(stats[key]))
+
+        if ws.storage is not None:
+            yield "# TYPE ecowitt_storage_failed_total counter"
+            yield "ecowitt_storage_failed_total {0}".format(ws.storage_failed)
+
+        stages = ws.get_timing_stats()
+        if stages:
+            metric = "ecowitt_stage_duration_seconds"
+            yield "# HELP {0} Time spent in each ingest stage.".format(metric)
+            yield "# TYPE {0} histogram".format(metric)
+            for stage, hist in stages.items():
+                for bound, count in hist["buckets"]:
+                    yield "{0}_bucket{1} {2}".format(
+                        metric, labels(stage=stage, le=_le(bound)), count)
+                yield "{0}_sum{1} {2!r}".format(metric, labels(stage=stage),
+                                                hist["sum"])
+                yield "{0}_count{1} {2}".format(metric, labels(stage=stage),
+                                                hist["count"])
+
+        stats = ws.get_listener_stats()
+        if stats:
+            for key, metric, mtype in _LISTENER_METRICS:
+                yield "# TYPE {0} {1}".format(metric, mtype)
+                for lq in stats:
+                    yield "{0}{1} {2}".format(
+                        metric, labels(listener=lq["listener"],
+                                       station=lq["station"] or ""),
+                        lq[key])
@@ -0,0 +1,127 @@
+"""
+On-demand profiling of a running listener.
+
+EcoWittListener.start_profiling() (or the signal installed by
+profile_on_signal()) profiles the handler for the next N packets or T
+seconds, then writes the result and goes back to normal:
+
+    PROFILE_CPROFILE   deterministic, with cProfile; writes a pstats
+                       file for pstats, snakeviz or flameprof
+    PROFILE_SAMPLING   samples the stack every interval seconds of CPU
+                       time with SIGPROF; much lower overhead, writes
+                       collapsed stacks for flamegraph.pl or speedscope
+
+Only time spent while a handler is running is profiled.  A handler
+awaiting its body lets other tasks run, and those are caught too.
+"""
+
+import cProfile
+import logging
+import os
+import signal
+import time
+
+PROFILE_CPROFILE = 0
+PROFILE_SAMPLING = 1
+
+PROFILE_INTERVAL = 0.001
+# frames kept per sample, innermost first
+PROFILE_MAX_DEPTH = 128
+
+_SUFFIXES = {
+    PROFILE_CPROFILE: ".prof",
+    PROFILE_SAMPLING: ".folded",
+}
+
+
+def profile_path(directory, mode):
+    """A new, timestamped output file name in directory."""
+    return os.path.join(directory, "ecowitt-{0}{1}".format(
+        time.strftime("%Y%m%d-%H%M%S"), _SUFFIXES[mode]))
+
+
+def _frame_name(code):
+    return "{0} ({1}:{2})".format(code.co_name,
+                                  os.path.basename(code.co_filename),
+                                  code.co_firstlineno)
+
+
+class HandlerProfiler:
+    """Profiles handler calls until packets or seconds run out."""
+    def __init__(self, path, packets=None, seconds=None,
+                 mode=PROFILE_CPROFILE, interval=PROFILE_INTERVAL):
+        """Initialize.
+
+        With neither packets nor seconds, profiling runs until stop().
+        """
+        self.path = path
+        self.packets = packets
+        self.seconds = seconds
+        self.mode = mode
+        self.interval = interval
+        self.log = logging.getLogger(__name__)
+
+        self.seen = 0
+        self.done = False
+        self._active = 0
+        self._deadline = None
+        self._profile = None
+        # collapsed stack -> samples
+        self._samples = {}
+        self._old_handler = None
+
+    def start(self):
+        if self.seconds is not None:
+            self._deadline = time.monotonic() + self.seconds
+        if self.mode == PROFILE_SAMPLING:
+            self._old_handler = signal.signal(signal.SIGPROF, self._sample)
+            signal.setitimer(signal.ITIMER_PROF, self.interval,
+                             self.interval)
+        else:
+            self._profile = cProfile.Profile()
+
+    def _sample(self, signum, frame):
+        if not self._active:
+            return
+        stack = []
+        while frame is not None and len(stack) < PROFILE_MAX_DEPTH:
+            stack.append(_frame_name(frame.f_code))
+            frame = frame.f_back
+        key = ";".join(reversed(stack))
+        self._samples[key] = self._samples.get(key, 0) + 1
+
+    def enter(self):
+        """A handler call starts."""
+        self._active += 1
+        if self._active == 1 and self._profile is not None:
+            self._profile.enable()
+
+    def exit(self):
+        """A handler call ended; return True once profiling is done."""
+        self._active -= 1
+        if self._active == 0 and self._profile is not None:
+            self._profile.disable()
+        self.seen += 1
+        if self.packets is not None and self.seen >= self.packets:
+            self.done = True
+        if (self._deadline is not None and
+                time.monotonic() >= self._deadline):
+            self.done = True
+        return self.done
+
+    def stop(self):
+        """Stop profiling and write the output, returning its path."""
+        self.done = True
+        if self.mode == PROFILE_SAMPLING:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._old_handler or
+                          signal.SIG_DFL)
+            with open(self.path, "w") as f:
+                for stack, count in sorted(self._samples.items()):
+                    f.write("{0} {1}\n".format(stack, count))
+        else:
+            if self._active:
+                self._profile.disable()
+            self._profile.dump_stats(self.path)
+        self.log.info("Profiled %d packets to %s", self.seen, self.path)
+        return self.path
@@ -0,0 +1,140 @@
+"""Sensor objects and the per-station sensor registry."""
+
+import sys
+
+from .sensor_map import EcoWittSensorTypes
+
+
+class EcoWittSensor:
+    """An internal sensor to the ecowitt."""
+    # Slotted, as a process can hold many stations' worth of these.
+    __slots__ = ("name", "key", "value", "system", "stype", "lastupd",
+                 "lastupd_m", "history", "stats")
+
+    def __init__(self, sensor_name, key, system, stype):
+        """Initialize."""
+        # The same names, keys and stypes recur for every station.
+        self.name = sys.intern(sensor_name)
+        self.key = sys.intern(key)
+        self.value = None
+        self.system = system
+        self.stype = sys.intern(stype)
+        self.lastupd = 0
+        self.lastupd_m = 0
+        self.history = None
+        self.stats = None
+
+    def get_value(self):
+        """Get the sensor value."""
+        return self.value
+
+    def set_value(self, value):
+        """Set the sensor value."""
+        self.value = value
+
+    def get_system(self):
+        """Get the system."""
+        return self.system
+
+    def get_stype(self):
+        """Get the sensor type."""
+        return self.stype
+
+    def get_name(self):
+        """Get the sensor name."""
+        return self.name
+
+    def get_key(self):
+        """Get the sensor key."""
+        return self.key
+
+    def set_lastupd(self, value):
+        """Set the last update time on this sensor."""
+        self.lastupd = value
+
+    def get_lastupd(self):
+        """Get the last update time of this sensor."""
+        return self.lastupd
+
+    def set_lastupd_m(self, value):
+        """Set the last update monotonic time on this sensor."""
+        self.lastupd_m = value
+
+    def get_lastupd_m(self):
+        """Get the last update monotonic time of this sensor."""
+        return self.lastupd_m
+
+    def get_history(self):
+        """Get the SensorHistory of this sensor, None if not kept."""
+        return self.history
+
+    def get_stats(self, window, now=None):
+        """Get the rolling statistics over window seconds as of monotonic
+        time now (default, the last update), None if not kept."""
+        if self.stats is None:
+            return None
+        stats = self.stats.get(window)
+        if stats is None:
+            return None
+        return stats.get(self.lastupd_m if now is None else now)
+
+
+class EcoWittSensorRegistry:
+    """Sensors indexed by key, with secondary indexes by stype and system.
+
+    Iterating the registry yields sensors in the order they were added.
+    """
+    def __init__(self):
+        """Initialize."""
+        self._by_key = {}
+        # stype/system -> {key: sensor}, dicts used as ordered sets
+        self._by_stype = {}
+        self._by_system = {}
+
+    def __iter__(self):
+        return iter(self._by_key.values())
+
+    def __len__(self):
+        return len(self._by_key)
+
+    def __contains__(self, key):
+        return key in self._by_key
+
+    def add(self, sensor):
+        """Add a sensor, replacing any sensor with the same key."""
+        key = sensor.get_key()
+        if key in self._by_key:
+            self.remove(key)
+        self._by_key[key] = sensor
+        self._by_stype.setdefault(sensor.get_stype(), {})[key] = sensor
+        self._by_system.setdefault(sensor.get_system(), {})[key] = sensor
+
+    def remove(self, key):
+        """Remove the sensor with key, returning it or None."""
+        sensor = self._by_key.pop(key, None)
+        if sensor is None:
+            return None
+        del self._by_stype[sensor.get_stype()][key]
+        del self._by_system[sensor.get_system()][key]
+        return sensor
+
+    def get(self, key):
+        """Get the sensor with key, or None."""
+        return self._by_key.get(key)
+
+    def keys(self):
+        """List all sensor keys."""
+        return list(self._by_key)
+
+    def keys_by_type(self, stype):
+        """List the keys of all sensors of a given type.
+
+        stype may be an EcoWittSensorTypes or its name.
+        """
+        if isinstance(stype, EcoWittSensorTypes):
+            stype = stype.name
+        return list(self._by_stype.get(stype, ()))
+
+    def keys_by_system(self, system):
+        """List the keys of all sensors in a unit system."""
+        return list(self._by_system.get(system, ()))
@@ -0,0 +1,145 @@
+"""
+Replay captured uploads through an EcoWittListener, without sockets.
+
+A capture file has one upload per line: the epoch time it arrived, a
+space, and the raw urlencoded body.  EcoWittListener(capture=...) writes
+them, or write_capture can build one by hand.  replay() feeds the
+bodies through the listener's own decode, convert and dispatch path, at
+the pace they arrived, N times faster, or as fast as possible.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+import urllib.parse
+
+log = logging.getLogger(__name__)
+
+
+def read_capture(path):
+    """Yield (timestamp, body) for each upload in a capture file."""
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.rstrip(b'\r\n')
+            if not line:
+                continue
+            ts, _, body = line.partition(b' ')
+            yield float(ts), body
+
+
+def write_capture(f, timestamp, body):
+    """Append an upload to the binary file f; body may be bytes or a dict
+    of form fields."""
+    if isinstance(body, dict):
+        body = urllib.parse.urlencode(body).encode('ascii')
+    f.write(b'%.3f %s\n' % (timestamp, body))
+
+
+class CaptureWriter:
+    """Records raw uploads to a capture file, see EcoWittListener."""
+    def __init__(self, path):
+        """Initialize."""
+        self.path = path
+        self._f = open(path, 'ab')
+
+    def write(self, body, timestamp=None):
+        """Append body, received now unless timestamp says otherwise."""
+        if timestamp is None:
+            timestamp = time.time()
+        write_capture(self._f, timestamp, body)
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+def _listener_losses(listener):
+    stats = listener.get_listener_stats()
+    return (sum(lq["dropped"] for lq in stats),
+            sum(lq["coalesced"] for lq in stats))
+
+
+async def replay(listener, uploads, speed=1.0, backpressure=True):
+    """Feed (timestamp, body) uploads through listener.
+
+    speed 1.0 keeps the captured spacing, 10.0 is ten times faster, and
+    None (or 0) goes as fast as possible.  With backpressure, feeding
+    waits for the listeners to drain whenever one's queue is full, so
+    none drops or coalesces a packet; slow listeners then show up as
+    lag_max, or a lower packets_per_sec.  Waits for the registered
+    listeners to drain, then returns packets, errors, elapsed seconds,
+    packets_per_sec, lag_max, the furthest behind schedule a packet
+    was fed, in seconds, and the packets listeners dropped and
+    coalesced.
+    """
+    dropped, coalesced = _listener_losses(listener)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    first_ts = None
+    packets = 0
+    errors = 0
+    lag_max = 0.0
+    for ts, body in uploads:
+        if speed:
+            if first_ts is None:
+                first_ts = ts
+            due = start + (ts - first_ts) / speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                lag_max = max(lag_max, -delay)
+        try:
+            listener.process_payload((body, None, None))
+        except Exception as e:
+            errors += 1
+            log.error("Replay of packet %d failed: %s", packets, e)
+        packets += 1
+        if backpressure and listener.dispatcher.full():
+            await listener.wait_for_listeners()
+        elif not speed:
+            # let the listener queues run, as they would between POSTs
+            await asyncio.sleep(0)
+    await listener.wait_for_listeners()
+    elapsed = loop.time() - start
+    now_dropped, now_coalesced = _listener_losses(listener)
+    return {
+        "packets": packets,
+        "errors": errors,
+        "elapsed": elapsed,
+        "packets_per_sec": packets / elapsed if elapsed > 0 else 0.0,
+        "lag_max": lag_max,
+        "dropped": now_dropped - dropped,
+        "coalesced": now_coalesced - coalesced,
+    }
+
+
+def replay_file(listener, path, speed=1.0):
+    """Replay a capture file, running the event loop until done."""
+    return asyncio.run(replay(listener, read_capture(path), speed))
+
+
+def usage():
+    print("Usage: {0} capture_file [speed|max]".format(sys.argv[0]))
+
+
+async def _print_handler(data):
+    print(data)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        usage()
+        exit(1)
+
+    from .ecowitt import EcoWittListener
+
+    speed = 1.0
+    if len(sys.argv) > 2:
+        speed = None if sys.argv[2] == 'max' else float(sys.argv[2])
+    ws = EcoWittListener(fast_decode=True, multi_station=True)
+    if speed is not None:
+        ws.register_listener(_print_handler)
+    print(replay_file(ws, sys.argv[1], speed))
+    exit(0)
@@ -5,9 +5,10 @@ SYSTEM_METRIC = 0
 SYSTEM_IMPERIAL = 1
 SYSTEM_METRIC_MS = 2
 
-MAP_NAME = "name"
-MAP_SYSTEM = "system"
-MAP_STYPE = "stype"
+# SENSOR_MAP entries are (name, system, stype) tuples
+MAP_NAME = 0
+MAP_SYSTEM = 1
+MAP_STYPE = 2
 
 
 class EcoWittSensorTypes(enum.Enum):
@@ -37,851 +38,231 @@ class EcoWittSensorTypes(enum.Enum):
     length_mm = 24
     co2_ppm = 25
     internal = 26
+    pressure_kpa = 27
+    absolute_humidity = 28
+
+_S = EcoWittSensorTypes
 
 SENSOR_MAP = {
-    "baromabshpa": {
-        MAP_NAME: "Absolute Pressure",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.pressure_hpa,
-    }, "baromrelhpa": {
-        MAP_NAME: "Relative Pressure",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.pressure_hpa,
-    }, "baromabsin": {
-        MAP_NAME: "Absolute Pressure",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.pressure_inhg,
-    }, "baromrelin": {
-        MAP_NAME: "Relative Pressure",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.pressure_inhg,
-    }, "rainratein": {
-        MAP_NAME: "Rain Rate",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "eventrainin": {
-        MAP_NAME: "Event Rain Rate",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "hourlyrainin": {
-        MAP_NAME: "Hourly Rain Rate",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "totalrainin": {
-        MAP_NAME: "Total Rain",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.length_inches,
-    }, "dailyrainin": {
-        MAP_NAME: "Daily Rain Rate",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "weeklyrainin": {
-        MAP_NAME: "Weekly Rain Rate",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "monthlyrainin": {
-        MAP_NAME: "Monthly Rain Rate",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "yearlyrainin": {
-        MAP_NAME: "Yearly Rain Rate",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "rainratemm": {
-        MAP_NAME: "Rain Rate",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "eventrainmm": {
-        MAP_NAME: "Event Rain Rate",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "hourlyrainmm": {
-        MAP_NAME: "Hourly Rain Rate",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "totalrainmm": {
-        MAP_NAME: "Total Rain",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.length_mm,
-    }, "dailyrainmm": {
-        MAP_NAME: "Daily Rain Rate",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "weeklyrainmm": {
-        MAP_NAME: "Weekly Rain Rate",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "monthlyrainmm": {
-        MAP_NAME: "Monthly Rain Rate",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "yearlyrainmm": {
-        MAP_NAME: "Yearly Rain Rate",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "humidity": {
-        MAP_NAME: "Humidity",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "humidityin": {
-        MAP_NAME: "Indoor Humidity",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "humidity1": {
-        MAP_NAME: "Humidity 1",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "humidity2": {
-        MAP_NAME: "Humidity 2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "humidity3": {
-        MAP_NAME: "Humidity 3",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "humidity4": {
-        MAP_NAME: "Humidity 4",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "humidity5": {
-        MAP_NAME: "Humidity 5",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "humidity6": {
-        MAP_NAME: "Humidity 6",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "humidity7": {
-        MAP_NAME: "Humidity 7",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "humidity8": {
-        MAP_NAME: "Humidity 8",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "winddir": {
-        MAP_NAME: "Wind Direction",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.degree,
-    }, "winddir_avg10m": {
-        MAP_NAME: "Wind Direction 10m Avg",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.degree,
-    }, "windspeedkmh": {
-        MAP_NAME: "Wind Speed",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.speed_kph,
-    }, "windspdkmh_avg10m": {
-        MAP_NAME: "Wind Speed 10m Avg",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.speed_kph,
-    }, "windgustkmh": {
-        MAP_NAME: "Wind Gust",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.speed_kph,
-    }, "maxdailygustkmh": {
-        MAP_NAME: "Max Daily Wind Gust",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.speed_kph,
-    }, "windspeedmph": {
-        MAP_NAME: "Wind Speed",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.speed_mph,
-    }, "windspdmph_avg10m": {
-        MAP_NAME: "Wind Speed 10m Avg",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.speed_mph,
-    }, "windgustmph": {
-        MAP_NAME: "Wind Gust",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.speed_mph,
-    }, "maxdailygust": {
-        MAP_NAME: "Max Daily Wind Gust",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.speed_mph,
-    }, "windspeedms": {
-        MAP_NAME: "Wind Speed",
-        MAP_SYSTEM: SYSTEM_METRIC_MS,
-        MAP_STYPE: EcoWittSensorTypes.speed_mps,
-    }, "windspdms_avg10m": {
-        MAP_NAME: "Wind Speed 10m Avg",
-        MAP_SYSTEM: SYSTEM_METRIC_MS,
-        MAP_STYPE: EcoWittSensorTypes.speed_mps,
-    }, "windgustms": {
-        MAP_NAME: "Wind Gust",
-        MAP_SYSTEM: SYSTEM_METRIC_MS,
-        MAP_STYPE: EcoWittSensorTypes.speed_mps,
-    }, "maxdailygustms": {
-        MAP_NAME: "Max Daily Wind Gust",
-        MAP_SYSTEM: SYSTEM_METRIC_MS,
-        MAP_STYPE: EcoWittSensorTypes.speed_mps,
-    }, "tempc": {
-        MAP_NAME: "Outdoor Temperature",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tempinc": {
-        MAP_NAME: "Indoor Temperature",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "temp1c": {
-        MAP_NAME: "Temperature 1",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "temp2c": {
-        MAP_NAME: "Temperature 2",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "temp3c": {
-        MAP_NAME: "Temperature 3",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "temp4c": {
-        MAP_NAME: "Temperature 4",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "temp5c": {
-        MAP_NAME: "Temperature 5",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "temp6c": {
-        MAP_NAME: "Temperature 6",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "temp7c": {
-        MAP_NAME: "Temperature 7",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "temp8c": {
-        MAP_NAME: "Temperature 8",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpointc": {
-        MAP_NAME: "Dewpoint",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpointinc": {
-        MAP_NAME: "Indoor Dewpoint",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpoint1c": {
-        MAP_NAME: "Dewpoint 1",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpoint2c": {
-        MAP_NAME: "Dewpoint 2",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpoint3c": {
-        MAP_NAME: "Dewpoint 3",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpoint4c": {
-        MAP_NAME: "Dewpoint 4",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpoint5c": {
-        MAP_NAME: "Dewpoint 5",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpoint6c": {
-        MAP_NAME: "Dewpoint 6",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpoint7c": {
-        MAP_NAME: "Dewpoint 7",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "dewpoint8c": {
-        MAP_NAME: "Dewpoint 8",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "windchillc": {
-        MAP_NAME: "Windchill",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tempf": {
-        MAP_NAME: "Outdoor Temperature",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tempinf": {
-        MAP_NAME: "Indoor Temperature",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "temp1f": {
-        MAP_NAME: "Temperature 1",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "temp2f": {
-        MAP_NAME: "Temperature 2",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "temp3f": {
-        MAP_NAME: "Temperature 3",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "temp4f": {
-        MAP_NAME: "Temperature 4",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "temp5f": {
-        MAP_NAME: "Temperature 5",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "temp6f": {
-        MAP_NAME: "Temperature 6",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "temp7f": {
-        MAP_NAME: "Temperature 7",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "temp8f": {
-        MAP_NAME: "Temperature 8",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpointf": {
-        MAP_NAME: "Dewpoint",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpointinf": {
-        MAP_NAME: "Indoor Dewpoint",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpoint1f": {
-        MAP_NAME: "Dewpoint 1",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpoint2f": {
-        MAP_NAME: "Dewpoint 2",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpoint3f": {
-        MAP_NAME: "Dewpoint 3",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpoint4f": {
-        MAP_NAME: "Dewpoint 4",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpoint5f": {
-        MAP_NAME: "Dewpoint 5",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpoint6f": {
-        MAP_NAME: "Dewpoint 6",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpoint7f": {
-        MAP_NAME: "Dewpoint 7",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "dewpoint8f": {
-        MAP_NAME: "Dewpoint 8",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "windchillf": {
-        MAP_NAME: "Windchill",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "solarradiation": {
-        MAP_NAME: "Solar Radiation",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.watt_meters_squared,
-    }, "uv": {
-        MAP_NAME: "UV Index",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.uv_index,
-    }, "soilmoisture1": {
-        MAP_NAME: "Soil Moisture 1",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "soilmoisture2": {
-        MAP_NAME: "Soil Moisture 2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "soilmoisture3": {
-        MAP_NAME: "Soil Moisture 3",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "soilmoisture4": {
-        MAP_NAME: "Soil Moisture 4",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "soilmoisture5": {
-        MAP_NAME: "Soil Moisture 5",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "soilmoisture6": {
-        MAP_NAME: "Soil Moisture 6",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "soilmoisture7": {
-        MAP_NAME: "Soil Moisture 7",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "soilmoisture8": {
-        MAP_NAME: "Soil Moisture 8",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "pm25_ch1": {
-        MAP_NAME: "PM2.5 1",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "pm25_ch2": {
-        MAP_NAME: "PM2.5 2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "pm25_ch3": {
-        MAP_NAME: "PM2.5 3",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "pm25_ch4": {
-        MAP_NAME: "PM2.5 4",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "pm25_avg_24h_ch1": {
-        MAP_NAME: "PM2.5 24h Average 1",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "pm25_avg_24h_ch2": {
-        MAP_NAME: "PM2.5 24h Average 2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "pm25_avg_24h_ch3": {
-        MAP_NAME: "PM2.5 24h Average 3",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "pm25_avg_24h_ch4": {
-        MAP_NAME: "PM2.5 24h Average 4",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "lightning_time": {
-        MAP_NAME: "Last Lightning strike",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.timestamp,
-    }, "lightning_num": {
-        MAP_NAME: "Lightning strikes",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.count,
-    }, "lightning": {
-        MAP_NAME: "Lightning strike distance",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.distance_km,
-    }, "lightning_mi": {
-        MAP_NAME: "Lightning strike distance",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.distance_miles,
-    }, "tf_co2": {
-        MAP_NAME: "WH45 Temperature",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tf_co2c": {
-        MAP_NAME: "WH45 Temperature",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "humi_co2": {
-        MAP_NAME: "WH45 Humidity",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.humidity,
-    }, "pm25_co2": {
-        MAP_NAME: "WH45 PM2.5 CO2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "pm25_24h_co2": {
-        MAP_NAME: "WH45 PM2.5 CO2 24h average",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm25,
-    }, "pm10_co2": {
-        MAP_NAME: "WH45 PM10 CO2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm10,
-    }, "pm10_24h_co2": {
-        MAP_NAME: "WH45 PM10 CO2 24h average",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.pm10,
-    }, "co2": {
-        MAP_NAME: "WH45 CO2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.co2_ppm,
-    }, "co2_24h": {
-        MAP_NAME: "WH45 CO2 24h average",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.co2_ppm,
-    }, "co2_batt": {
-        MAP_NAME: "WH45 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "leak_ch1": {
-        MAP_NAME: "Leak Detection 1",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "leak_ch2": {
-        MAP_NAME: "Leak Detection 2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "leak_ch3": {
-        MAP_NAME: "Leak Detection 3",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "leak_ch4": {
-        MAP_NAME: "Leak Detection 4",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "wh25batt": {
-        MAP_NAME: "WH25 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "wh26batt": {
-        MAP_NAME: "WH26 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "wh40batt": {
-        MAP_NAME: "WH40 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "wh57batt": {
-        MAP_NAME: "WH57 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "wh65batt": {
-        MAP_NAME: "WH65 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "wh68batt": {
-        MAP_NAME: "WH68 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "wh80batt": {
-        MAP_NAME: "WH80 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "soilbatt1": {
-        MAP_NAME: "Soil Battery 1",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "soilbatt2": {
-        MAP_NAME: "Soil Battery 2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "soilbatt3": {
-        MAP_NAME: "Soil Battery 3",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "soilbatt4": {
-        MAP_NAME: "Soil Battery 4",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "soilbatt5": {
-        MAP_NAME: "Soil Battery 5",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "soilbatt6": {
-        MAP_NAME: "Soil Battery 6",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "soilbatt7": {
-        MAP_NAME: "Soil Battery 7",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "soilbatt8": {
-        MAP_NAME: "Soil Battery 8",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "batt1": {
-        MAP_NAME: "Battery 1",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "batt2": {
-        MAP_NAME: "Battery 2",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "batt3": {
-        MAP_NAME: "Battery 3",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "batt4": {
-        MAP_NAME: "Battery 4",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "batt5": {
-        MAP_NAME: "Battery 5",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "batt6": {
-        MAP_NAME: "Battery 6",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "batt7": {
-        MAP_NAME: "Battery 7",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "batt8": {
-        MAP_NAME: "Battery 8",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.binary,
-    }, "pm25batt1": {
-        MAP_NAME: "PM2.5 1 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "pm25batt2": {
-        MAP_NAME: "PM2.5 2 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "pm25batt3": {
-        MAP_NAME: "PM2.5 3 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "pm25batt4": {
-        MAP_NAME: "PM2.5 4 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "pm25batt5": {
-        MAP_NAME: "PM2.5 5 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "pm25batt6": {
-        MAP_NAME: "PM2.5 6 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "pm25batt7": {
-        MAP_NAME: "PM2.5 7 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "pm25batt8": {
-        MAP_NAME: "PM2.5 8 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "leakbatt1": {
-        MAP_NAME: "Leak Detection 1 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "leakbatt2": {
-        MAP_NAME: "Leak Detection 2 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "leakbatt3": {
-        MAP_NAME: "Leak Detection 3 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "leakbatt4": {
-        MAP_NAME: "Leak Detection 4 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "leakbatt5": {
-        MAP_NAME: "Leak Detection 5 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "leakbatt6": {
-        MAP_NAME: "Leak Detection 6 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "leakbatt7": {
-        MAP_NAME: "Leak Detection 7 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "leakbatt8": {
-        MAP_NAME: "Leak Detection 8 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "tf_ch1c": {
-        MAP_NAME: "Soil Temperature 1",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tf_ch2c": {
-        MAP_NAME: "Soil Temperature 2",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tf_ch3c": {
-        MAP_NAME: "Soil Temperature 3",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tf_ch4c": {
-        MAP_NAME: "Soil Temperature 4",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tf_ch5c": {
-        MAP_NAME: "Soil Temperature 5",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tf_ch6c": {
-        MAP_NAME: "Soil Temperature 6",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tf_ch7c": {
-        MAP_NAME: "Soil Temperature 7",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tf_ch8c": {
-        MAP_NAME: "Soil Temperature 8",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.temperature_c,
-    }, "tf_ch1": {
-        MAP_NAME: "Soil Temperature 1",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tf_ch2": {
-        MAP_NAME: "Soil Temperature 2",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tf_ch3": {
-        MAP_NAME: "Soil Temperature 3",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tf_ch4": {
-        MAP_NAME: "Soil Temperature 4",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tf_ch5": {
-        MAP_NAME: "Soil Temperature 5",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tf_ch6": {
-        MAP_NAME: "Soil Temperature 6",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tf_ch7": {
-        MAP_NAME: "Soil Temperature 7",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tf_ch8": {
-        MAP_NAME: "Soil Temperature 8",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.temperature_f,
-    }, "tf_batt1": {
-        MAP_NAME: "Soil Temperature 1 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "tf_batt2": {
-        MAP_NAME: "Soil Temperature 2 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "tf_batt3": {
-        MAP_NAME: "Soil Temperature 3 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "tf_batt4": {
-        MAP_NAME: "Soil Temperature 4 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "tf_batt5": {
-        MAP_NAME: "Soil Temperature 5 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "tf_batt6": {
-        MAP_NAME: "Soil Temperature 6 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "tf_batt7": {
-        MAP_NAME: "Soil Temperature 7 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "tf_batt8": {
-        MAP_NAME: "Soil Temperature 8 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "mac": {
-        MAP_NAME: "macaddr",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.internal,
-    }, "dateutc": {
-        MAP_NAME: "dateutc",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.internal,
-    }, "fields": {
-        MAP_NAME: "field list",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.internal,
-    }, "PASSKEY": {
-        MAP_NAME: "passkey",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.internal,
-    }, "stationtype": {
-        MAP_NAME: "stationtype",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.internal,
-    }, "freq": {
-        MAP_NAME: "freq",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.internal,
-    }, "model": {
-        MAP_NAME: "model",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.internal,
-    }, "wh90batt": {
-        MAP_NAME: "WH90 Battery",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    }, "wh90battpc": {
-        MAP_NAME: "WH90 Battery Percentage",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.battery_percentage,
-    }, "ws90cap_volt": {
-        MAP_NAME: "WH90 Capacitor",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.voltage,
-    },"rrain_piezo": {
-        MAP_NAME: "Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "erain_piezo": {
-        MAP_NAME: "Event Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "hrain_piezo": {
-        MAP_NAME: "Hourly Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "drain_piezo": {
-        MAP_NAME: "Daily Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "wrain_piezo": {
-        MAP_NAME: "Weekly Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "mrain_piezo": {
-        MAP_NAME: "Monthly Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "yrain_piezo": {
-        MAP_NAME: "Yearly Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_IMPERIAL,
-        MAP_STYPE: EcoWittSensorTypes.rate_inches,
-    }, "rrain_piezomm": {
-        MAP_NAME: "Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "erain_piezomm": {
-        MAP_NAME: "Event Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "hrain_piezomm": {
-        MAP_NAME: "Hourly Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "drain_piezomm": {
-        MAP_NAME: "Daily Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "wrain_piezomm": {
-        MAP_NAME: "Weekly Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "mrain_piezomm": {
-        MAP_NAME: "Monthly Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    }, "yrain_piezomm": {
-        MAP_NAME: "Yearly Rain Rate Piezo",
-        MAP_SYSTEM: SYSTEM_METRIC,
-        MAP_STYPE: EcoWittSensorTypes.rate_mm,
-    },"runtime": {
-        MAP_NAME: "Runtime",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.internal,
-    },"ws90_ver": {
-        MAP_NAME: "WS90 Version",
-        MAP_SYSTEM: None,
-        MAP_STYPE: EcoWittSensorTypes.internal,
-    }
+    "baromabshpa": ("Absolute Pressure", SYSTEM_METRIC, _S.pressure_hpa),
+    "baromrelhpa": ("Relative Pressure", SYSTEM_METRIC, _S.pressure_hpa),
+    "baromabsin": ("Absolute Pressure", SYSTEM_IMPERIAL, _S.pressure_inhg),
+    "baromrelin": ("Relative Pressure", SYSTEM_IMPERIAL, _S.pressure_inhg),
+    "rainratein": ("Rain Rate", SYSTEM_IMPERIAL, _S.rate_inches),
+    "eventrainin": ("Event Rain Rate", SYSTEM_IMPERIAL, _S.rate_inches),
+    "hourlyrainin": ("Hourly Rain Rate", SYSTEM_IMPERIAL, _S.rate_inches),
+    "totalrainin": ("Total Rain", SYSTEM_IMPERIAL, _S.length_inches),
+    "dailyrainin": ("Daily Rain Rate", SYSTEM_IMPERIAL, _S.rate_inches),
+    "weeklyrainin": ("Weekly Rain Rate", SYSTEM_IMPERIAL, _S.rate_inches),
+    "monthlyrainin": ("Monthly Rain Rate", SYSTEM_IMPERIAL, _S.rate_inches),
+    "yearlyrainin": ("Yearly Rain Rate", SYSTEM_IMPERIAL, _S.rate_inches),
+    "rainratemm": ("Rain Rate", SYSTEM_METRIC, _S.rate_mm),
+    "eventrainmm": ("Event Rain Rate", SYSTEM_METRIC, _S.rate_mm),
+    "hourlyrainmm": ("Hourly Rain Rate", SYSTEM_METRIC, _S.rate_mm),
+    "totalrainmm": ("Total Rain", SYSTEM_METRIC, _S.length_mm),
+    "dailyrainmm": ("Daily Rain Rate", SYSTEM_METRIC, _S.rate_mm),
+    "weeklyrainmm": ("Weekly Rain Rate", SYSTEM_METRIC, _S.rate_mm),
+    "monthlyrainmm": ("Monthly Rain Rate", SYSTEM_METRIC, _S.rate_mm),
+    "yearlyrainmm": ("Yearly Rain Rate", SYSTEM_METRIC, _S.rate_mm),
+    "humidity": ("Humidity", None, _S.humidity),
+    "humidityin": ("Indoor Humidity", None, _S.humidity),
+    "humidity1": ("Humidity 1", None, _S.humidity),
+    "humidity2": ("Humidity 2", None, _S.humidity),
+    "humidity3": ("Humidity 3", None, _S.humidity),
+    "humidity4": ("Humidity 4", None, _S.humidity),
+    "humidity5": ("Humidity 5", None, _S.humidity),
+    "humidity6": ("Humidity 6", None, _S.humidity),
+    "humidity7": ("Humidity 7", None, _S.humidity),
+    "humidity8": ("Humidity 8", None, _S.humidity),
+    "winddir": ("Wind Direction", None, _S.degree),
+    "winddir_avg10m": ("Wind Direction 10m Avg", None, _S.degree),
+    "windspeedkmh": ("Wind Speed", SYSTEM_METRIC, _S.speed_kph),
+    "windspdkmh_avg10m": ("Wind Speed 10m Avg", SYSTEM_METRIC, _S.speed_kph),
+    "windgustkmh": ("Wind Gust", SYSTEM_METRIC, _S.speed_kph),
+    "maxdailygustkmh": ("Max Daily Wind Gust", SYSTEM_METRIC, _S.speed_kph),
+    "windspeedmph": ("Wind Speed", SYSTEM_IMPERIAL, _S.speed_mph),
+    "windspdmph_avg10m": ("Wind Speed 10m Avg", SYSTEM_IMPERIAL, _S.speed_mph),
+    "windgustmph": ("Wind Gust", SYSTEM_IMPERIAL, _S.speed_mph),
+    "maxdailygust": ("Max Daily Wind Gust", SYSTEM_IMPERIAL, _S.speed_mph),
+    "windspeedms": ("Wind Speed", SYSTEM_METRIC_MS, _S.speed_mps),
+    "windspdms_avg10m": ("Wind Speed 10m Avg", SYSTEM_METRIC_MS, _S.speed_mps),
+    "windgustms": ("Wind Gust", SYSTEM_METRIC_MS, _S.speed_mps),
+    "maxdailygustms": ("Max Daily Wind Gust", SYSTEM_METRIC_MS, _S.speed_mps),
+    "tempc": ("Outdoor Temperature", SYSTEM_METRIC, _S.temperature_c),
+    "tempinc": ("Indoor Temperature", SYSTEM_METRIC, _S.temperature_c),
+    "temp1c": ("Temperature 1", SYSTEM_METRIC, _S.temperature_c),
+    "temp2c": ("Temperature 2", SYSTEM_METRIC, _S.temperature_c),
+    "temp3c": ("Temperature 3", SYSTEM_METRIC, _S.temperature_c),
+    "temp4c": ("Temperature 4", SYSTEM_METRIC, _S.temperature_c),
+    "temp5c": ("Temperature 5", SYSTEM_METRIC, _S.temperature_c),
+    "temp6c": ("Temperature 6", SYSTEM_METRIC, _S.temperature_c),
+    "temp7c": ("Temperature 7", SYSTEM_METRIC, _S.temperature_c),
+    "temp8c": ("Temperature 8", SYSTEM_METRIC, _S.temperature_c),
+    "dewpointc": ("Dewpoint", SYSTEM_METRIC, _S.temperature_c),
+    "dewpointinc": ("Indoor Dewpoint", SYSTEM_METRIC, _S.temperature_c),
+    "dewpoint1c": ("Dewpoint 1", SYSTEM_METRIC, _S.temperature_c),
+    "dewpoint2c": ("Dewpoint 2", SYSTEM_METRIC, _S.temperature_c),
+    "dewpoint3c": ("Dewpoint 3", SYSTEM_METRIC, _S.temperature_c),
+    "dewpoint4c": ("Dewpoint 4", SYSTEM_METRIC, _S.temperature_c),
+    "dewpoint5c": ("Dewpoint 5", SYSTEM_METRIC, _S.temperature_c),
+    "dewpoint6c": ("Dewpoint 6", SYSTEM_METRIC, _S.temperature_c),
+    "dewpoint7c": ("Dewpoint 7", SYSTEM_METRIC, _S.temperature_c),
+    "dewpoint8c": ("Dewpoint 8", SYSTEM_METRIC, _S.temperature_c),
+    "windchillc": ("Windchill", SYSTEM_METRIC, _S.temperature_c),
+    "tempf": ("Outdoor Temperature", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tempinf": ("Indoor Temperature", SYSTEM_IMPERIAL, _S.temperature_f),
+    "temp1f": ("Temperature 1", SYSTEM_IMPERIAL, _S.temperature_f),
+    "temp2f": ("Temperature 2", SYSTEM_IMPERIAL, _S.temperature_f),
+    "temp3f": ("Temperature 3", SYSTEM_IMPERIAL, _S.temperature_f),
+    "temp4f": ("Temperature 4", SYSTEM_IMPERIAL, _S.temperature_f),
+    "temp5f": ("Temperature 5", SYSTEM_IMPERIAL, _S.temperature_f),
+    "temp6f": ("Temperature 6", SYSTEM_IMPERIAL, _S.temperature_f),
+    "temp7f": ("Temperature 7", SYSTEM_IMPERIAL, _S.temperature_f),
+    "temp8f": ("Temperature 8", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpointf": ("Dewpoint", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpointinf": ("Indoor Dewpoint", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpoint1f": ("Dewpoint 1", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpoint2f": ("Dewpoint 2", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpoint3f": ("Dewpoint 3", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpoint4f": ("Dewpoint 4", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpoint5f": ("Dewpoint 5", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpoint6f": ("Dewpoint 6", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpoint7f": ("Dewpoint 7", SYSTEM_IMPERIAL, _S.temperature_f),
+    "dewpoint8f": ("Dewpoint 8", SYSTEM_IMPERIAL, _S.temperature_f),
+    "windchillf": ("Windchill", SYSTEM_IMPERIAL, _S.temperature_f),
+    "solarradiation": ("Solar Radiation", None, _S.watt_meters_squared),
+    "uv": ("UV Index", None, _S.uv_index),
+    "soilmoisture1": ("Soil Moisture 1", None, _S.humidity),
+    "soilmoisture2": ("Soil Moisture 2", None, _S.humidity),
+    "soilmoisture3": ("Soil Moisture 3", None, _S.humidity),
+    "soilmoisture4": ("Soil Moisture 4", None, _S.humidity),
+    "soilmoisture5": ("Soil Moisture 5", None, _S.humidity),
+    "soilmoisture6": ("Soil Moisture 6", None, _S.humidity),
+    "soilmoisture7": ("Soil Moisture 7", None, _S.humidity),
+    "soilmoisture8": ("Soil Moisture 8", None, _S.humidity),
+    "pm25_ch1": ("PM2.5 1", None, _S.pm25),
+    "pm25_ch2": ("PM2.5 2", None, _S.pm25),
+    "pm25_ch3": ("PM2.5 3", None, _S.pm25),
+    "pm25_ch4": ("PM2.5 4", None, _S.pm25),
+    "pm25_avg_24h_ch1": ("PM2.5 24h Average 1", None, _S.pm25),
+    "pm25_avg_24h_ch2": ("PM2.5 24h Average 2", None, _S.pm25),
+    "pm25_avg_24h_ch3": ("PM2.5 24h Average 3", None, _S.pm25),
+    "pm25_avg_24h_ch4": ("PM2.5 24h Average 4", None, _S.pm25),
+    "lightning_time": ("Last Lightning strike", None, _S.timestamp),
+    "lightning_num": ("Lightning strikes", None, _S.count),
+    "lightning": ("Lightning strike distance", SYSTEM_METRIC, _S.distance_km),
+    "lightning_mi": ("Lightning strike distance", SYSTEM_IMPERIAL,
+                     _S.distance_miles),
+    "tf_co2": ("WH45 Temperature", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tf_co2c": ("WH45 Temperature", SYSTEM_METRIC, _S.temperature_c),
+    "humi_co2": ("WH45 Humidity", None, _S.humidity),
+    "pm25_co2": ("WH45 PM2.5 CO2", None, _S.pm25),
+    "pm25_24h_co2": ("WH45 PM2.5 CO2 24h average", None, _S.pm25),
+    "pm10_co2": ("WH45 PM10 CO2", None, _S.pm10),
+    "pm10_24h_co2": ("WH45 PM10 CO2 24h average", None, _S.pm10),
+    "co2": ("WH45 CO2", None, _S.co2_ppm),
+    "co2_24h": ("WH45 CO2 24h average", None, _S.co2_ppm),
+    "co2_batt": ("WH45 Battery", None, _S.battery_percentage),
+    "leak_ch1": ("Leak Detection 1", None, _S.binary),
+    "leak_ch2": ("Leak Detection 2", None, _S.binary),
+    "leak_ch3": ("Leak Detection 3", None, _S.binary),
+    "leak_ch4": ("Leak Detection 4", None, _S.binary),
+    "wh25batt": ("WH25 Battery", None, _S.binary),
+    "wh26batt": ("WH26 Battery", None, _S.binary),
+    "wh40batt": ("WH40 Battery", None, _S.voltage),
+    "wh57batt": ("WH57 Battery", None, _S.battery_percentage),
+    "wh65batt": ("WH65 Battery", None, _S.binary),
+    "wh68batt": ("WH68 Battery", None, _S.voltage),
+    "wh80batt": ("WH80 Battery", None, _S.voltage),
+    "soilbatt1": ("Soil Battery 1", None, _S.voltage),
+    "soilbatt2": ("Soil Battery 2", None, _S.voltage),
+    "soilbatt3": ("Soil Battery 3", None, _S.voltage),
+    "soilbatt4": ("Soil Battery 4", None, _S.voltage),
+    "soilbatt5": ("Soil Battery 5", None, _S.voltage),
+    "soilbatt6": ("Soil Battery 6", None, _S.voltage),
+    "soilbatt7": ("Soil Battery 7", None, _S.voltage),
+    "soilbatt8": ("Soil Battery 8", None, _S.voltage),
+    "batt1": ("Battery 1", None, _S.binary),
+    "batt2": ("Battery 2", None, _S.binary),
+    "batt3": ("Battery 3", None, _S.binary),
+    "batt4": ("Battery 4", None, _S.binary),
+    "batt5": ("Battery 5", None, _S.binary),
+    "batt6": ("Battery 6", None, _S.binary),
+    "batt7": ("Battery 7", None, _S.binary),
+    "batt8": ("Battery 8", None, _S.binary),
+    "pm25batt1": ("PM2.5 1 Battery", None, _S.battery_percentage),
+    "pm25batt2": ("PM2.5 2 Battery", None, _S.battery_percentage),
+    "pm25batt3": ("PM2.5 3 Battery", None, _S.battery_percentage),
+    "pm25batt4": ("PM2.5 4 Battery", None, _S.battery_percentage),
+    "pm25batt5": ("PM2.5 5 Battery", None, _S.battery_percentage),
+    "pm25batt6": ("PM2.5 6 Battery", None, _S.battery_percentage),
+    "pm25batt7": ("PM2.5 7 Battery", None, _S.battery_percentage),
+    "pm25batt8": ("PM2.5 8 Battery", None, _S.battery_percentage),
+    "leakbatt1": ("Leak Detection 1 Battery", None, _S.battery_percentage),
+    "leakbatt2": ("Leak Detection 2 Battery", None, _S.battery_percentage),
+    "leakbatt3": ("Leak Detection 3 Battery", None, _S.battery_percentage),
+    "leakbatt4": ("Leak Detection 4 Battery", None, _S.battery_percentage),
+    "leakbatt5": ("Leak Detection 5 Battery", None, _S.battery_percentage),
+    "leakbatt6": ("Leak Detection 6 Battery", None, _S.battery_percentage),
+    "leakbatt7": ("Leak Detection 7 Battery", None, _S.battery_percentage),
+    "leakbatt8": ("Leak Detection 8 Battery", None, _S.battery_percentage),
+    "tf_ch1c": ("Soil Temperature 1", SYSTEM_METRIC, _S.temperature_c),
+    "tf_ch2c": ("Soil Temperature 2", SYSTEM_METRIC, _S.temperature_c),
+    "tf_ch3c": ("Soil Temperature 3", SYSTEM_METRIC, _S.temperature_c),
+    "tf_ch4c": ("Soil Temperature 4", SYSTEM_METRIC, _S.temperature_c),
+    "tf_ch5c": ("Soil Temperature 5", SYSTEM_METRIC, _S.temperature_c),
+    "tf_ch6c": ("Soil Temperature 6", SYSTEM_METRIC, _S.temperature_c),
+    "tf_ch7c": ("Soil Temperature 7", SYSTEM_METRIC, _S.temperature_c),
+    "tf_ch8c": ("Soil Temperature 8", SYSTEM_METRIC, _S.temperature_c),
+    "tf_ch1": ("Soil Temperature 1", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tf_ch2": ("Soil Temperature 2", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tf_ch3": ("Soil Temperature 3", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tf_ch4": ("Soil Temperature 4", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tf_ch5": ("Soil Temperature 5", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tf_ch6": ("Soil Temperature 6", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tf_ch7": ("Soil Temperature 7", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tf_ch8": ("Soil Temperature 8", SYSTEM_IMPERIAL, _S.temperature_f),
+    "tf_batt1": ("Soil Temperature 1 Battery", None, _S.voltage),
+    "tf_batt2": ("Soil Temperature 2 Battery", None, _S.voltage),
+    "tf_batt3": ("Soil Temperature 3 Battery", None, _S.voltage),
+    "tf_batt4": ("Soil Temperature 4 Battery", None, _S.voltage),
+    "tf_batt5": ("Soil Temperature 5 Battery", None, _S.voltage),
+    "tf_batt6": ("Soil Temperature 6 Battery", None, _S.voltage),
+    "tf_batt7": ("Soil Temperature 7 Battery", None, _S.voltage),
+    "tf_batt8": ("Soil Temperature 8 Battery", None, _S.voltage),
+    "mac": ("macaddr", None, _S.internal),
+    "dateutc": ("dateutc", None, _S.internal),
+    "fields": ("field list", None, _S.internal),
+    "PASSKEY": ("passkey", None, _S.internal),
+    "stationtype": ("stationtype", None, _S.internal),
+    "freq": ("freq", None, _S.internal),
+    "model": ("model", None, _S.internal),
+    "wh90batt": ("WH90 Battery", None, _S.voltage),
+    "wh90battpc": ("WH90 Battery Percentage", None, _S.battery_percentage),
+    "ws90cap_volt": ("WH90 Capacitor", None, _S.voltage),
+    "rrain_piezo": ("Rain Rate Piezo", SYSTEM_IMPERIAL, _S.rate_inches),
+    "erain_piezo": ("Event Rain Rate Piezo", SYSTEM_IMPERIAL, _S.rate_inches),
+    "hrain_piezo": ("Hourly Rain Rate Piezo", SYSTEM_IMPERIAL, _S.rate_inches),
+    "drain_piezo": ("Daily Rain Rate Piezo", SYSTEM_IMPERIAL, _S.rate_inches),
+    "wrain_piezo": ("Weekly Rain Rate Piezo", SYSTEM_IMPERIAL, _S.rate_inches),
+    "mrain_piezo": ("Monthly Rain Rate Piezo", SYSTEM_IMPERIAL,
+                    _S.rate_inches),
+    "yrain_piezo": ("Yearly Rain Rate Piezo", SYSTEM_IMPERIAL, _S.rate_inches),
+    "rrain_piezomm": ("Rain Rate Piezo", SYSTEM_METRIC, _S.rate_mm),
+    "erain_piezomm": ("Event Rain Rate Piezo", SYSTEM_METRIC, _S.rate_mm),
+    "hrain_piezomm": ("Hourly Rain Rate Piezo", SYSTEM_METRIC, _S.rate_mm),
+    "drain_piezomm": ("Daily Rain Rate Piezo", SYSTEM_METRIC, _S.rate_mm),
+    "wrain_piezomm": ("Weekly Rain Rate Piezo", SYSTEM_METRIC, _S.rate_mm),
+    "mrain_piezomm": ("Monthly Rain Rate Piezo", SYSTEM_METRIC, _S.rate_mm),
+    "yrain_piezomm": ("Yearly Rain Rate Piezo", SYSTEM_METRIC, _S.rate_mm),
+    "runtime": ("Runtime", None, _S.internal),
+    "ws90_ver": ("WS90 Version", None, _S.internal),
+    "heatindexf": ("Heat Index", SYSTEM_IMPERIAL, _S.temperature_f),
+    "heatindexc": ("Heat Index", SYSTEM_METRIC, _S.temperature_c),
+    "feelslikef": ("Feels Like", SYSTEM_IMPERIAL, _S.temperature_f),
+    "feelslikec": ("Feels Like", SYSTEM_METRIC, _S.temperature_c),
+    "vpd": ("Vapour Pressure Deficit", SYSTEM_METRIC, _S.pressure_kpa),
+    "abshumidity": ("Absolute Humidity", SYSTEM_METRIC, _S.absolute_humidity),
 }
+
+del _S
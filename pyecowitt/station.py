@@ -0,0 +1,172 @@
+"""The sensors and latest readings of a single gateway."""
+
+import logging
+import time
+
+from .history import (
+    SensorHistory,
+    history_capacity,
+)
+from .registry import (
+    EcoWittSensor,
+    EcoWittSensorRegistry,
+)
+from .stats import new_stats
+from .sensor_map import (
+    EcoWittSensorTypes,
+    MAP_NAME,
+    MAP_SYSTEM,
+    MAP_STYPE,
+    SENSOR_MAP,
+)
+
+# packet keys a station is identified by, in order of preference
+STATION_ID_KEYS = ("PASSKEY", "mac")
+
+
+def get_station_id(weather_data):
+    """Return the PASSKEY (or failing that, MAC) a packet came from."""
+    for key in STATION_ID_KEYS:
+        station_id = weather_data.get(key)
+        if station_id:
+            return station_id
+    return None
+
+
+# keys that never count as a change on their own: the station id and
+# what the gateway says about the upload itself (dateutc, runtime, ...)
+PASSIVE_KEYS = frozenset(
+    key for key, entry in SENSOR_MAP.items()
+    if entry[MAP_STYPE] is EcoWittSensorTypes.internal).union(STATION_ID_KEYS)
+
+
+def diff_values(notified, weather_data, thresholds=None):
+    """Return the keys of weather_data that changed since notified.
+
+    notified maps each key to the value last reported as changed and is
+    updated in place, so a slow drift is still reported once it adds up.
+    thresholds maps keys to the epsilon a numeric value must move by to
+    count.  PASSIVE_KEYS never count; they are added to a non-empty
+    result, which is empty when nothing changed.
+    """
+    changes = {}
+    for key, value in weather_data.items():
+        if key in PASSIVE_KEYS:
+            continue
+        if key in notified:
+            old = notified[key]
+            if old == value:
+                continue
+            eps = thresholds.get(key) if thresholds else None
+            if (eps is not None and
+                    isinstance(value, (int, float)) and
+                    isinstance(old, (int, float)) and
+                    abs(value - old) <= eps):
+                continue
+        changes[key] = value
+        notified[key] = value
+    if changes:
+        for key, value in weather_data.items():
+            if key in PASSIVE_KEYS:
+                changes[key] = value
+    return changes
+
+
+class EcoWittStation:
+    """One gateway's sensor registry, last packet and station info."""
+    def __init__(self, station_id=None, history=None, stats=None):
+        """Initialize.
+
+        history is the retention for per-sensor history, see
+        history_capacity; None keeps none.  stats picks the sensors and
+        windows to keep rolling statistics for, see stats_windows.
+        """
+        self.station_id = station_id
+        self.history = history
+        self.stats = stats
+        self.log = logging.getLogger(__name__)
+
+        self.sensors = EcoWittSensorRegistry()
+        self.last_values = {}
+        self.data_valid = False
+        self.lastupd = 0
+        self.packets = 0
+
+        self.station_type = "Unknown"
+        self.station_freq = "Unknown"
+        self.station_model = "Unknown"
+        self.mac_addr = None
+
+    def update(self, weather_data, new_sensor_cb=None):
+        """Store a converted packet from this station."""
+        self.last_values = weather_data.copy()
+        self.data_valid = True
+        self.lastupd = time.time()
+        self.packets += 1
+        self.station_type = weather_data.get("stationtype", self.station_type)
+        self.station_freq = weather_data.get("freq", self.station_freq)
+        self.station_model = weather_data.get("model", self.station_model)
+        self.mac_addr = weather_data.get("mac", self.mac_addr)
+        self.parse_ws_data(weather_data, new_sensor_cb)
+
+    def parse_ws_data(self, weather_data, new_sensor_cb=None):
+        """Update the sensors, creating any we have not seen before."""
+        now = time.time()
+        now_m = time.monotonic()
+        for sensor in weather_data.keys():
+            sensor_dev = self.sensors.get(sensor)
+            if sensor_dev is None:
+                # we have a new sensor
+                if sensor not in SENSOR_MAP:
+                    self.log.warning("Unhandled sensor type %s value %s, "
+                                     + "file a PR.", sensor, weather_data[sensor])
+                    continue
+                sensor_dev = EcoWittSensor(SENSOR_MAP[sensor][MAP_NAME],
+                                           sensor,
+                                           SENSOR_MAP[sensor][MAP_SYSTEM],
+                                           SENSOR_MAP[sensor][MAP_STYPE].name)
+                self.sensors.add(sensor_dev)
+                if self.history is not None:
+                    self._add_history(sensor_dev, weather_data[sensor])
+                if self.stats:
+                    self._add_stats(sensor_dev, weather_data[sensor])
+                if new_sensor_cb is not None:
+                    new_sensor_cb()
+
+            value = weather_data[sensor]
+            sensor_dev.set_value(value)
+            sensor_dev.set_lastupd(now)
+            sensor_dev.set_lastupd_m(now_m)
+            if type(value) in (int, float):
+                history = sensor_dev.history
+                if history is not None:
+                    history.append(now_m, value)
+                stats = sensor_dev.stats
+                if stats is not None:
+                    for window in stats.values():
+                        window.add(now_m, value)
+
+    def _add_history(self, sensor_dev, value):
+        """Give a new sensor a ring buffer, if it is numeric and wanted."""
+        if type(value) not in (int, float):
+            return
+        capacity = history_capacity(self.history, sensor_dev.get_stype())
+        if capacity > 0:
+            sensor_dev.history = SensorHistory(capacity)
+
+    def _add_stats(self, sensor_dev, value):
+        """Give a new sensor rolling statistics, if it is numeric and wanted."""
+        if type(value) not in (int, float):
+            return
+        sensor_dev.stats = new_stats(self.stats, sensor_dev.get_stype())
+
+    def get_station_info(self):
+        """Return what the gateway told us about itself."""
+        return {
+            "station_id": self.station_id,
+            "stationtype": self.station_type,
+            "freq": self.station_freq,
+            "model": self.station_model,
+            "mac": self.mac_addr,
+            "lastupd": self.lastupd,
+        }
@@ -0,0 +1,193 @@
+"""
+Incremental rolling-window statistics per sensor.
+
+Every tracked sensor keeps one RollingStats per window (10 minutes, an
+hour and a day by default).  Adding a sample is O(1) amortized: min and
+max come from monotonic deques, mean and standard deviation from running
+sums.  Wind direction gets a RollingCircularStats, whose mean is the
+vector mean of the angles.
+"""
+
+import collections
+import math
+
+from .sensor_map import EcoWittSensorTypes
+
+STATS_WINDOWS = (600, 3600, 86400)
+
+# stypes tracked when stats=True
+STATS_STYPES = (
+    EcoWittSensorTypes.temperature_c,
+    EcoWittSensorTypes.temperature_f,
+    EcoWittSensorTypes.pressure_hpa,
+    EcoWittSensorTypes.pressure_inhg,
+    EcoWittSensorTypes.speed_kph,
+    EcoWittSensorTypes.speed_mph,
+    EcoWittSensorTypes.speed_mps,
+    EcoWittSensorTypes.degree,
+)
+# stypes that are angles
+CIRCULAR_STYPES = (
+    EcoWittSensorTypes.degree.name,
+)
+
+
+def stats_windows(config, stype):
+    """Which windows, in seconds, to keep statistics over for stype.
+
+    config is True for STATS_WINDOWS on STATS_STYPES, or a dict of
+    windows keyed by EcoWittSensorTypes (or their names).
+    """
+    if not config:
+        return ()
+    if isinstance(stype, EcoWittSensorTypes):
+        stype = stype.name
+    if config is True:
+        config = dict.fromkeys(STATS_STYPES, STATS_WINDOWS)
+    for key, windows in config.items():
+        if isinstance(key, EcoWittSensorTypes):
+            key = key.name
+        if key == stype:
+            return tuple(windows)
+    return ()
+
+
+def new_stats(config, stype):
+    """Build the window -> stats dict for a sensor, or None."""
+    windows = stats_windows(config, stype)
+    if not windows:
+        return None
+    if isinstance(stype, EcoWittSensorTypes):
+        stype = stype.name
+    cls = RollingCircularStats if stype in CIRCULAR_STYPES else RollingStats
+    return {window: cls(window) for window in windows}
+
+
+class RollingStats:
+    """Count, min, max, mean and stddev over the last window seconds."""
+    __slots__ = ("window", "_samples", "_min", "_max", "_shift", "_sum",
+                 "_sumsq")
+
+    def __init__(self, window):
+        """Initialize."""
+        self.window = window
+        # (ts, value) for everything in the window
+        self._samples = collections.deque()
+        # (ts, value), values increasing / decreasing from the left
+        self._min = collections.deque()
+        self._max = collections.deque()
+        # sums are of value - _shift, which keeps the variance accurate
+        # for large values that barely move, like pressure
+        self._shift = None
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, ts, value):
+        """Add a sample at monotonic time ts."""
+        self._expire(ts - self.window)
+        if self._shift is None:
+            self._shift = value
+        self._samples.append((ts, value))
+        d = value - self._shift
+        self._sum += d
+        self._sumsq += d * d
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((ts, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((ts, value))
+
+    def _expire(self, cutoff):
+        samples = self._samples
+        while samples and samples[0][0] < cutoff:
+            _, value = samples.popleft()
+            d = value - self._shift
+            self._sum -= d
+            self._sumsq -= d * d
+        while self._min and self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] < cutoff:
+            self._max.popleft()
+        if not samples:
+            # start the sums afresh rather than carry rounding error
+            self._shift = None
+            self._sum = 0.0
+            self._sumsq = 0.0
+
+    def get(self, now=None):
+        """Return the statistics, expiring samples older than the window
+        as of monotonic time now, if given."""
+        if now is not None:
+            self._expire(now - self.window)
+        n = len(self._samples)
+        if not n:
+            return {"count": 0, "min": None, "max": None, "mean": None,
+                    "stddev": None}
+        mean = self._sum / n
+        variance = max(0.0, self._sumsq / n - mean * mean)
+        return {
+            "count": n,
+            "min": self._min[0][1],
+            "max": self._max[0][1],
+            "mean": mean + self._shift,
+            "stddev": math.sqrt(variance),
+        }
+
+
+class RollingCircularStats:
+    """Count and vector mean of angles in degrees over the last window
+    seconds."""
+    __slots__ = ("window", "_samples", "_sin", "_cos")
+
+    def __init__(self, window):
+        """Initialize."""
+        self.window = window
+        # (ts, sin, cos)
+        self._samples = collections.deque()
+        self._sin = 0.0
+        self._cos = 0.0
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, ts, value):
+        """Add an angle at monotonic time ts."""
+        self._expire(ts - self.window)
+        rad = math.radians(value)
+        s = math.sin(rad)
+        c = math.cos(rad)
+        self._samples.append((ts, s, c))
+        self._sin += s
+        self._cos += c
+
+    def _expire(self, cutoff):
+        samples = self._samples
+        while samples and samples[0][0] < cutoff:
+            _, s, c = samples.popleft()
+            self._sin -= s
+            self._cos -= c
+        if not samples:
+            self._sin = 0.0
+            self._cos = 0.0
+
+    def get(self, now=None):
+        """Return the count, mean angle and mean resultant length (0 for
+        directions that cancel out, 1 for all the same)."""
+        if now is not None:
+            self._expire(now - self.window)
+        n = len(self._samples)
+        if not n:
+            return {"count": 0, "mean": None, "resultant": None}
+        mean = math.degrees(math.atan2(self._sin, self._cos)) % 360.0
+        if mean >= 360.0:
+            # a tiny negative angle rounds up to 360 under %
+            mean = 0.0
+        return {
+            "count": n,
+            "mean": mean,
+            "resultant": math.hypot(self._sin, self._cos) / n,
+        }
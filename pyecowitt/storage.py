@@ -0,0 +1,349 @@
+"""
+Append-only on-disk history log.
+
+A log is a directory per station holding numbered segments.  Each
+segment is a directory of column files:
+
+    meta.json    the sensor-id table the segment was written with
+    ts.col       one int32 per packet: milliseconds since the previous one
+    index.col    every INDEX_INTERVAL packets, (row, absolute ms) int64s
+    <id>.col     one int32 per packet for sensor <id> in the id table
+
+Values are stored as integers in thousandths (whole units for counts and
+timestamps), delta-encoded against the previous value in the column.
+Every INDEX_INTERVAL rows is a keyframe holding the absolute value, so
+decoding can start from the sparse index rather than the top of the
+file.  Every column has a fixed-width entry per packet, MISSING where
+the packet did not carry the sensor, which keeps row n at the same
+offset in every column.
+
+Reads mmap the files and only decode the index, the rows of ts.col in
+range and the same rows of the one sensor's column, so a range query
+touches only the pages it needs.  Scaling to thousandths rounds away any
+finer precision.
+"""
+
+from array import array
+from bisect import bisect_right
+import json
+import logging
+import mmap
+import os
+import re
+
+from .sensor_map import (
+    EcoWittSensorTypes,
+    MAP_STYPE,
+    SENSOR_MAP,
+)
+
+# sensor key -> column id, for new segments; each segment keeps its own
+# copy, so ids may change between versions without breaking old logs
+SENSOR_IDS = {key: i for i, key in enumerate(SENSOR_MAP)}
+
+# value scale by stype, 1000 otherwise
+STORAGE_SCALES = {
+    EcoWittSensorTypes.timestamp.name: 1,
+    EcoWittSensorTypes.count.name: 1,
+}
+STORAGE_SCALE = 1000
+# rows between keyframes / sparse index entries
+INDEX_INTERVAL = 64
+# rows per segment before starting the next
+SEGMENT_ROWS = 65536
+
+MISSING = -2 ** 31
+_INT32_MIN = -2 ** 31 + 1
+_INT32_MAX = 2 ** 31 - 1
+
+_META = "meta.json"
+_TS = "ts.col"
+_INDEX = "index.col"
+
+
+def _column_file(sensor_id):
+    return "%d.col" % sensor_id
+
+
+def _station_dir(station_id):
+    if station_id is None:
+        return "default"
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', str(station_id))
+
+
+def _read_array(path, typecode):
+    """mmap path as a read-only array view, or None if empty/missing."""
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return None
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+    width = array(typecode).itemsize
+    # a writer may be part way through a record
+    return memoryview(mm)[:size - size % width].cast(typecode)
+
+
+class _SegmentWriter:
+    """The segment of a station's log currently being appended to."""
+    def __init__(self, path, sensor_ids):
+        """Initialize."""
+        self.path = path
+        self.sensor_ids = sensor_ids
+        os.makedirs(path)
+        with open(os.path.join(path, _META), 'w') as f:
+            json.dump({"keys": dict(sensor_ids),
+                       "interval": INDEX_INTERVAL}, f)
+        self.rows = 0
+        self._ts = open(os.path.join(path, _TS), 'ab', buffering=0)
+        self._index = open(os.path.join(path, _INDEX), 'ab', buffering=0)
+        # key -> [file, scale, previous stored value or None]
+        self._columns = {}
+        self._last_ms = None
+
+    def _open_column(self, key):
+        f = open(os.path.join(self.path, _column_file(self.sensor_ids[key])),
+                 'ab', buffering=0)
+        # catch up with the rows written before we saw this sensor
+        f.write(array('i', [MISSING]) * self.rows)
+        stype = SENSOR_MAP[key][MAP_STYPE].name
+        column = [f, STORAGE_SCALES.get(stype, STORAGE_SCALE), None]
+        self._columns[key] = column
+        return column
+
+    def fits(self, ms):
+        """True if a packet at ms can go in this segment: in order, and
+        not so long after the last one that the delta overflows."""
+        return self._last_ms is None or \
+            0 <= ms - self._last_ms <= _INT32_MAX
+
+    def append(self, ms, weather_data, log):
+        if not self.fits(ms):
+            raise ValueError("packet at %d ms does not fit segment %s" %
+                             (ms, self.path))
+        keyframe = self.rows % INDEX_INTERVAL == 0
+        for key, value in weather_data.items():
+            if (key not in self._columns and key in self.sensor_ids and
+                    type(value) in (int, float)):
+                self._open_column(key)
+        # encode the whole row before writing any of it
+        row = []
+        for key, column in self._columns.items():
+            _, scale, prev = column
+            value = weather_data.get(key)
+            stored = MISSING
+            new_prev = prev
+            if type(value) in (int, float):
+                scaled = int(round(value * scale))
+                if keyframe or prev is None:
+                    stored = scaled
+                else:
+                    stored = scaled - prev
+                if _INT32_MIN <= stored <= _INT32_MAX:
+                    new_prev = scaled
+                else:
+                    log.warning("%s value %s does not fit the history log",
+                                key, value)
+                    stored = MISSING
+            if keyframe:
+                new_prev = None if stored == MISSING else stored
+            row.append((column, stored, new_prev))
+        # columns first, so a reader never sees a row in ts.col whose
+        # values are not written yet
+        for column, stored, new_prev in row:
+            column[0].write(array('i', [stored]))
+            column[2] = new_prev
+        if keyframe:
+            self._index.write(array('q', [self.rows, ms]))
+            self._ts.write(array('i', [0]))
+        else:
+            self._ts.write(array('i', [ms - self._last_ms]))
+        self._last_ms = ms
+        self.rows += 1
+
+    def flush(self, fsync):
+        if fsync:
+            files = [self._ts, self._index]
+            files.extend(column[0] for column in self._columns.values())
+            for f in files:
+                os.fsync(f.fileno())
+
+    def close(self):
+        self._ts.close()
+        self._index.close()
+        for column in self._columns.values():
+            column[0].close()
+        self._columns = {}
+
+
+class _SegmentReader:
+    """A read-only, mmapped view of one segment."""
+    def __init__(self, path):
+        """Initialize."""
+        self.path = path
+        with open(os.path.join(path, _META)) as f:
+            meta = json.load(f)
+        self.sensor_ids = meta["keys"]
+        self.interval = meta["interval"]
+        self.ts = _read_array(os.path.join(path, _TS), 'i')
+        self.index = _read_array(os.path.join(path, _INDEX), 'q')
+
+    def _keyframes(self):
+        # index rows and times as parallel sequences; memoryview slicing
+        # with a step keeps this zero-copy
+        return self.index[0::2], self.index[1::2]
+
+    def rows(self, start_ms, end_ms):
+        """Return (first row, [ms of each row]) for rows in
+        [start_ms, end_ms]."""
+        if self.ts is None or self.index is None:
+            return 0, []
+        rows, times = self._keyframes()
+        nframes = min(len(rows), len(times))
+        if start_ms is None:
+            frame = 0
+        else:
+            frame = max(0, bisect_right(times, start_ms, 0, nframes) - 1)
+        nrows = len(self.ts)
+        out = []
+        first = None
+        row = rows[frame]
+        ms = times[frame]
+        ts = self.ts
+        while row < nrows:
+            if row % self.interval == 0:
+                ms = times[row // self.interval]
+            else:
+                ms += ts[row]
+            if end_ms is not None and ms > end_ms:
+                break
+            if start_ms is None or ms >= start_ms:
+                if first is None:
+                    first = row
+                out.append(ms)
+            row += 1
+        return first or 0, out
+
+    def values(self, key, first, count):
+        """Decode rows [first, first + count) of key's column."""
+        sensor_id = self.sensor_ids.get(key)
+        if sensor_id is None or count == 0:
+            return [None] * count
+        column = _read_array(os.path.join(self.path, _column_file(sensor_id)),
+                             'i')
+        if column is None:
+            return [None] * count
+        stype = SENSOR_MAP[key][MAP_STYPE].name if key in SENSOR_MAP else None
+        scale = STORAGE_SCALES.get(stype, STORAGE_SCALE)
+        out = []
+        # decode from the keyframe at or before first
+        row = first - first % self.interval
+        end = min(first + count, len(column))
+        prev = None
+        while row < end:
+            stored = column[row]
+            if row % self.interval == 0:
+                prev = None
+            if stored == MISSING:
+                value = None
+            elif prev is None:
+                prev = value = stored
+            else:
+                prev = value = prev + stored
+            if row >= first:
+                out.append(None if value is None else value / scale)
+            row += 1
+        out.extend([None] * (count - len(out)))
+        return out
+
+
+class EcoWittHistoryLog:
+    """A durable, append-only log of converted packets under path.
+
+    Give one to EcoWittListener(storage=...) and every ingested packet
+    is appended to its station's log.
+    """
+    def __init__(self, path, segment_rows=SEGMENT_ROWS, fsync=False):
+        """Initialize.
+
+        With fsync, every packet is fsynced to disk before append
+        returns; otherwise it is written through to the OS.
+        """
+        self.path = path
+        self.segment_rows = segment_rows
+        self.fsync = fsync
+        self.log = logging.getLogger(__name__)
+        self._writers = {}
+
+    def _segments(self, station_id):
+        """Return [(start ms, path)] of a station's segments, oldest first."""
+        root = os.path.join(self.path, _station_dir(station_id))
+        try:
+            names = os.listdir(root)
+        except FileNotFoundError:
+            return []
+        segments = []
+        for name in names:
+            if name.isdigit():
+                segments.append((int(name), os.path.join(root, name)))
+        segments.sort()
+        return segments
+
+    def _new_segment(self, station_id, ms):
+        root = os.path.join(self.path, _station_dir(station_id))
+        os.makedirs(root, exist_ok=True)
+        # named for the first packet; never reuse an existing segment,
+        # a crash may have left it with a partial row
+        segments = self._segments(station_id)
+        if segments and segments[-1][0] >= ms:
+            ms = segments[-1][0] + 1
+        return _SegmentWriter(os.path.join(root, "%d" % ms), SENSOR_IDS)
+
+    def append(self, station_id, timestamp, weather_data):
+        """Append a converted packet received at timestamp (epoch
+        seconds)."""
+        ms = int(timestamp * 1000)
+        writer = self._writers.get(station_id)
+        # start a new segment when this one is full, when time went
+        # backwards (ranges assume a segment is in order), or when the
+        # station was away too long for the delta to fit an int32
+        if writer is not None and (writer.rows >= self.segment_rows or
+                                   not writer.fits(ms)):
+            writer.close()
+            writer = None
+        if writer is None:
+            writer = self._new_segment(station_id, ms)
+            self._writers[station_id] = writer
+        writer.append(ms, weather_data, self.log)
+        writer.flush(self.fsync)
+
+    def read(self, key, start=None, end=None, station_id=None):
+        """Return ([timestamps], [values]) for key between start and end
+        (epoch seconds, inclusive), skipping packets without it."""
+        start_ms = None if start is None else int(start * 1000)
+        end_ms = None if end is None else int(end * 1000)
+        segments = self._segments(station_id)
+        timestamps = []
+        values = []
+        for i, (seg_start, path) in enumerate(segments):
+            if end_ms is not None and seg_start > end_ms:
+                break
+            if (start_ms is not None and i + 1 < len(segments) and
+                    segments[i + 1][0] <= start_ms):
+                continue
+            reader = _SegmentReader(path)
+            first, times = reader.rows(start_ms, end_ms)
+            for ms, value in zip(times,
+                                 reader.values(key, first, len(times))):
+                if value is not None:
+                    timestamps.append(ms / 1000)
+                    values.append(value)
+        return timestamps, values
+
+    def close(self):
+        """Close the open segments; the next append starts new ones."""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
@@ -0,0 +1,91 @@
+"""
+Per-stage timing of the ingest path.
+
+With timing enabled, EcoWittListener records how long each stage of
+every packet takes into a fixed-bucket histogram per stage:
+
+    read        reading the POST body
+    decode      urlencoded body to a dict
+    convert     unit conversion
+    parse       updating the station and its sensors, including any
+                new-sensor callback
+    new_sensor  the new-sensor callback alone
+    dispatch    queueing the packet for the listeners
+    listener    each listener call, timeouts and failures included
+
+Disabled, the hot path pays one "is None" test per stage.
+"""
+
+from bisect import bisect_left
+import time
+
+# upper bounds in seconds; a last, open bucket catches the rest
+TIMING_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+class StageHistogram:
+    """Counts of durations per bucket, plus their sum."""
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=TIMING_BUCKETS):
+        """Initialize."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        """Record one duration."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self):
+        """Return [(upper bound, count at or below it)], ending with inf."""
+        out = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            out.append((bound, total))
+        return out
+
+    def get_stats(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "buckets": self.cumulative(),
+        }
+
+
+class StageTimings:
+    """A StageHistogram per stage name, created on first use."""
+    def __init__(self, buckets=TIMING_BUCKETS):
+        """Initialize."""
+        self.buckets = buckets
+        self.stages = {}
+
+    def observe(self, stage, seconds):
+        """Record a duration for stage."""
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = StageHistogram(self.buckets)
+        hist.observe(seconds)
+
+    def record(self, stage, start):
+        """Record the time since start (a perf_counter()) for stage and
+        return now, ready to time the next stage."""
+        now = time.perf_counter()
+        self.observe(stage, now - start)
+        return now
+
+    def get_stats(self):
+        """Return the stats of every stage, see StageHistogram."""
+        return {stage: hist.get_stats() for stage, hist in self.stages.items()}
+
+    def reset(self):
+        """Forget everything recorded."""
+        self.stages = {}
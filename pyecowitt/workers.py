@@ -0,0 +1,172 @@
+"""
+Multi-process ingest.
+
+Decoding and converting packets is pure Python and CPU bound, so one
+process caps throughput at one core.  An EcoWittSupervisor starts N
+worker processes that all bind the listener's port with SO_REUSEPORT,
+letting the kernel spread connections across them.  Workers decode and
+convert, then send the converted packets down a pipe to the parent,
+whose EcoWittListener keeps the merged per-station state and runs the
+registered listeners, exactly as it would single process.
+
+Routing, station state, history and stats, storage and listener
+dispatch all stay in the parent, on one core; only decoding and
+converting scale with the number of workers.  Settings the workers
+need that change after start, the windchill mode, are sent down the
+pipe each worker watches for its parent.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+
+# packets handed to the listener per pipe callback, so one busy worker
+# cannot keep the parent's loop from everything else
+READ_BATCH = 64
+# seconds to wait for workers to exit, before and after terminating them
+STOP_TIMEOUT = 5.0
+# listener methods the parent may call in a worker after start
+_WORKER_SETTERS = frozenset(("set_windchill",))
+
+
+async def _worker_run(ws, lifeline):
+    # The parent holds the other end of lifeline and sends setting
+    # changes down it; it reads EOF when the parent exits for any
+    # reason, and then so do we.
+    loop = asyncio.get_running_loop()
+    parent_gone = asyncio.Event()
+
+    def control():
+        try:
+            while lifeline.poll():
+                name, args = lifeline.recv()
+                if name in _WORKER_SETTERS:
+                    getattr(ws, name)(*args)
+        except (EOFError, OSError):
+            loop.remove_reader(lifeline.fileno())
+            parent_gone.set()
+
+    loop.add_reader(lifeline.fileno(), control)
+    task = asyncio.ensure_future(ws.listen())
+    await parent_gone.wait()
+    task.cancel()
+
+
+def _worker_main(port, options, windchill_type, conn, lifeline):
+    """Entry point of a worker process."""
+    from .ecowitt import EcoWittListener
+
+    # the supervisor decides when we stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ws = EcoWittListener(port=port, reuse_port=True, **options)
+    ws.set_windchill(windchill_type)
+    # hand converted packets to the parent instead of keeping them
+    ws.ingest = conn.send
+    asyncio.run(_worker_run(ws, lifeline))
+
+
+class EcoWittSupervisor:
+    """Worker processes feeding one EcoWittListener."""
+    def __init__(self, listener, workers):
+        """Initialize."""
+        self.listener = listener
+        self.workers = workers
+        self.log = logging.getLogger(__name__)
+        self._procs = []
+        self._conns = []
+        self._lifelines = []
+
+    def worker_options(self):
+        """The listener settings a worker needs to decode like we do."""
+        options = {"fast_decode": self.listener.fast_decode,
+                   "systems": self.listener.converter.systems}
+        if self.listener.ingest_queue is not None:
+            options["ingest_queue_size"] = self.listener.ingest_queue.queue_size
+            options["ingest_policy"] = self.listener.ingest_queue.policy
+        return options
+
+    def start(self):
+        """Start the workers and read their packets on the running loop."""
+        loop = asyncio.get_running_loop()
+        # spawn, not fork: we already have a running event loop
+        ctx = multiprocessing.get_context("spawn")
+        options = self.worker_options()
+        for _ in range(self.workers):
+            reader, writer = ctx.Pipe(duplex=False)
+            life_r, life_w = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_worker_main,
+                               args=(self.listener.port, options,
+                                     self.listener.windchill_type, writer,
+                                     life_r),
+                               daemon=True)
+            proc.start()
+            writer.close()
+            life_r.close()
+            self._lifelines.append(life_w)
+            self._procs.append(proc)
+            self._conns.append(reader)
+            loop.add_reader(reader.fileno(), self._read, reader)
+
+    def _read(self, conn):
+        # at most READ_BATCH packets, then back to the loop; the reader
+        # fires again while the pipe has more
+        try:
+            for _ in range(READ_BATCH):
+                if not conn.poll():
+                    break
+                self.listener.ingest(conn.recv())
+        except (EOFError, OSError):
+            self.log.error("Ingest worker exited")
+            asyncio.get_running_loop().remove_reader(conn.fileno())
+            self._conns.remove(conn)
+            conn.close()
+
+    def update(self, name, *args):
+        """Call the listener method name with args in every worker."""
+        for lifeline in self._lifelines:
+            try:
+                lifeline.send((name, args))
+            except OSError:
+                # gone; _read logs it
+                pass
+
+    def set_windchill(self, wind):
+        """Switch the workers to windchill mode wind."""
+        self.update("set_windchill", wind)
+
+    async def _wait_exit(self, procs, timeout):
+        """Wait up to timeout seconds for procs to exit, without
+        blocking the loop; return those still running."""
+        deadline = time.monotonic() + timeout
+        alive = [proc for proc in procs if proc.is_alive()]
+        while alive and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            alive = [proc for proc in alive if proc.is_alive()]
+        return alive
+
+    async def stop(self):
+        """Stop all workers."""
+        loop = asyncio.get_running_loop()
+        for conn in self._conns:
+            loop.remove_reader(conn.fileno())
+            conn.close()
+        for lifeline in self._lifelines:
+            lifeline.close()
+        alive = await self._wait_exit(self._procs, STOP_TIMEOUT)
+        for proc in alive:
+            proc.terminate()
+        stuck = await self._wait_exit(alive, STOP_TIMEOUT)
+        for proc in stuck:
+            self.log.error("Ingest worker %d ignored SIGTERM", proc.pid)
+            proc.kill()
+        # is_alive() reaps the processes that have exited
+        await self._wait_exit(stuck, STOP_TIMEOUT)
+        self._conns = []
+        self._lifelines = []
+        self._procs = []
+
+    def is_alive(self):
+        """True while every worker is running."""
+        return all(proc.is_alive() for proc in self._procs)
@@ -0,0 +1,96 @@
+"""
+A bounded queue drained by its own worker task.
+
+The machinery shared by IngestQueue and ListenerQueue: a deque of
+pending items, a worker task started on the first put() and parked on an
+event while the queue is empty, and join()/stop() to drain or cancel it.
+What to do with each item, and with a full queue, is up to the subclass.
+"""
+
+import asyncio
+import collections
+
+
+class WorkerQueue:
+    """Items waiting for the worker, and the worker itself."""
+    def __init__(self, queue_size):
+        """Initialize."""
+        self.queue_size = max(1, queue_size)
+        self._queue = collections.deque()
+        # created with the worker, inside the running loop
+        self._wakeup = None
+        self._idle = None
+        self._task = None
+
+    def __len__(self):
+        return len(self._queue)
+
+    def pending(self):
+        """Number of items waiting for the worker."""
+        return len(self._queue)
+
+    def full(self):
+        """True if the queue holds queue_size items."""
+        return len(self._queue) >= self.queue_size
+
+    def _running(self):
+        """True if the worker is alive in the running loop.  A worker
+        from a loop that has since finished, as after asyncio.run(),
+        is as good as none."""
+        task = self._task
+        return (task is not None and not task.done() and
+                task.get_loop() is asyncio.get_running_loop())
+
+    def _wake(self):
+        """Start the worker if need be and tell it there is work.
+        Outside a loop the items wait for the next put() or join()."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if not self._running():
+            # events bind to the loop that first waits on them
+            self._wakeup = asyncio.Event()
+            self._idle = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+        self._idle.clear()
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            while not self._queue:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await self._handle(self._queue.popleft())
+
+    async def _handle(self, item):
+        """Process one item; must not raise."""
+        raise NotImplementedError
+
+    async def join(self):
+        """Wait until every queued item has been handled."""
+        if self._queue and not self._running():
+            self._wake()
+        if self._running():
+            await self._idle.wait()
+
+    def cancel(self):
+        """Cancel the worker, dropping anything still queued."""
+        task = self._task
+        self._task = None
+        self._queue.clear()
+        if task is None or task.done() or task.get_loop().is_closed():
+            return None
+        task.cancel()
+        return task
+
+    async def stop(self):
+        """Cancel the worker and wait for it to finish."""
+        task = self.cancel()
+        if task is not None and \
+                task.get_loop() is asyncio.get_running_loop():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
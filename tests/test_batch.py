@@ -0,0 +1,115 @@
+"""convert_columns must give exactly what the scalar converter gives."""
+import itertools
+import random
+import unittest
+from unittest import mock
+
+from pyecowitt import batch
+from pyecowitt.batch import (
+    columns_to_packets,
+    convert_columns,
+    packets_to_columns,
+)
+from pyecowitt.convert import (
+    EcoWittConverter,
+    INPUT_CASTS,
+    WINDCHILL_HYBRID,
+    WINDCHILL_NEW,
+    WINDCHILL_OLD,
+)
+from pyecowitt.fake_client import paramset_b
+from pyecowitt.sensor_map import (
+    SYSTEM_IMPERIAL,
+    SYSTEM_METRIC,
+    SYSTEM_METRIC_MS,
+)
+
+WINDCHILL_MODES = (WINDCHILL_OLD, WINDCHILL_NEW, WINDCHILL_HYBRID)
+SYSTEMS = (SYSTEM_METRIC, SYSTEM_IMPERIAL, SYSTEM_METRIC_MS)
+
+
+def archive(count, seed=1):
+    """count uploads of paramset_b's shape, plus dewpoint, lightning and
+    battery inputs, with values on a random walk wide enough to cross
+    the windchill and heat index thresholds."""
+    rnd = random.Random(seed)
+    packet = dict(paramset_b, humidity1=50, temp1f=60.0, windspeedmph=5.0,
+                  tempf=60.0, wh90batt=2.8, lightning="", lightning_num=0,
+                  lightning_time="")
+    packets = []
+    for i in range(count):
+        for key, value in packet.items():
+            if key in ("tempf", "temp1f"):
+                packet[key] = round(min(110.0, max(-20.0, value +
+                                                   rnd.uniform(-4, 4))), 1)
+            elif type(value) is float:
+                packet[key] = round(max(0.0, value + rnd.uniform(-1, 1)), 1)
+            elif type(value) is int and key.startswith("humid"):
+                packet[key] = min(100, max(1, value + rnd.randint(-5, 5)))
+        # gateways send lightning fields empty until a strike
+        if i % 3 == 0:
+            packet["lightning"] = str(rnd.randint(1, 40))
+            packet["lightning_time"] = str(1605541824 + i)
+        else:
+            packet["lightning"] = packet["lightning_time"] = ""
+        packets.append({k: str(v) for k, v in packet.items()})
+    return packets
+
+
+class TestConvertColumns(unittest.TestCase):
+    def setUp(self):
+        self.packets = archive(300)
+        self.columns = packets_to_columns(self.packets)
+
+    def assert_same(self, windchill_type, systems=None, columns=None,
+                    check_types=True):
+        converter = EcoWittConverter(systems=systems)
+        expected = [converter.convert(dict(p), windchill_type)
+                    for p in self.packets]
+        rows = columns_to_packets(convert_columns(
+            columns or self.columns, windchill_type, systems=systems))
+        self.assertEqual(len(rows), len(expected))
+        for n, (want, got) in enumerate(zip(expected, rows)):
+            # a derived value that does not apply to a row is None in the
+            # batch result, and missing from the scalar one
+            got = {key: value for key, value in got.items()
+                   if value is not None or key in want}
+            self.assertEqual(list(got), list(want), "row %d keys" % n)
+            for key, value in want.items():
+                self.assertEqual(got[key], value, "row %d %s" % (n, key))
+                if check_types:
+                    self.assertIs(type(got[key]), type(value),
+                                  "row %d %s" % (n, key))
+
+    def test_windchill_modes(self):
+        for mode in WINDCHILL_MODES:
+            with self.subTest(windchill_type=mode):
+                self.assert_same(mode)
+
+    def test_systems(self):
+        for n in range(1, len(SYSTEMS) + 1):
+            for systems in itertools.combinations(SYSTEMS, n):
+                with self.subTest(systems=systems):
+                    self.assert_same(WINDCHILL_HYBRID, systems)
+
+    def test_without_numpy(self):
+        with mock.patch.object(batch, "numpy", None):
+            for mode in WINDCHILL_MODES:
+                with self.subTest(windchill_type=mode):
+                    self.assert_same(mode)
+
+    @unittest.skipIf(batch.numpy is None, "needs NumPy")
+    def test_numpy_columns(self):
+        """Typed NumPy input; the result is NumPy arrays, so only the
+        values are compared."""
+        columns = {key: batch.numpy.array(list(map(INPUT_CASTS[key],
+                                                   values)))
+                   if INPUT_CASTS.get(key) in (int, float) else values
+                   for key, values in self.columns.items()}
+        for mode in WINDCHILL_MODES:
+            with self.subTest(windchill_type=mode):
+                self.assert_same(mode, columns=columns, check_types=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Change-only listeners."""
+import asyncio
+import unittest
+
+from pyecowitt.dispatch import LISTENER_DROP_NEWEST
+from pyecowitt.ecowitt import EcoWittListener
+
+
+def packet(tempf, second):
+    return {"PASSKEY": "K", "stationtype": "GW1000", "tempf": str(tempf),
+            "humidity": "50", "runtime": str(second),
+            "dateutc": "2020-01-01 00:00:%02d" % second}
+
+
+class TestChangesOnly(unittest.TestCase):
+    def setUp(self):
+        self.ws = EcoWittListener()
+
+    def ingest(self, tempf, second):
+        self.ws.ingest(self.ws.convert_units(packet(tempf, second)))
+
+    def test_snapshot_then_changes(self):
+        """A late subscriber starts from the current values, and a new
+        timestamp alone is not a change."""
+        seen = []
+
+        async def listener(data):
+            seen.append(data)
+
+        async def run():
+            self.ingest(60, 1)
+            self.ws.register_listener(listener, changes_only=True)
+            await self.ws.wait_for_listeners()
+            self.ingest(60, 2)
+            self.ingest(61, 3)
+            await self.ws.wait_for_listeners()
+            await self.ws.stop()
+        asyncio.run(run())
+        self.assertEqual(len(seen), 2)
+        self.assertEqual(seen[0]["tempf"], 60.0)
+        self.assertEqual(seen[0]["humidity"], 50)
+        self.assertEqual(seen[1]["tempf"], 61.0)
+        self.assertNotIn("humidity", seen[1])
+        self.assertEqual(seen[1]["runtime"], "3")
+        self.assertEqual(seen[1]["PASSKEY"], "K")
+
+    def test_full_queue_keeps_changes(self):
+        """Changes from a burst that overflows the queue still arrive,
+        and listeners do not share what they were told."""
+        slow = []
+        fast = []
+
+        async def slow_listener(data):
+            slow.append(data)
+
+        async def fast_listener(data):
+            fast.append(data)
+
+        async def run():
+            self.ws.register_listener(slow_listener, changes_only=True,
+                                      queue_size=1,
+                                      policy=LISTENER_DROP_NEWEST)
+            self.ws.register_listener(fast_listener, changes_only=True,
+                                      queue_size=32)
+            for n in range(8):
+                self.ingest(60 + n, n)
+            await self.ws.wait_for_listeners()
+            await self.ws.stop()
+        asyncio.run(run())
+        self.assertEqual(slow[-1]["tempf"], 67.0)
+        self.assertIn("humidity", slow[0])
+        self.assertEqual([d["tempf"] for d in fast],
+                         [60.0 + n for n in range(8)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Replaying captures through an EcoWittListener."""
+import asyncio
+import os
+import tempfile
+import unittest
+
+from pyecowitt.ecowitt import EcoWittListener
+from pyecowitt.fake_client import paramset_b
+from pyecowitt.replay import replay_file, write_capture
+
+PACKETS = 20
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".capture")
+        with os.fdopen(fd, 'wb') as f:
+            for n in range(PACKETS):
+                write_capture(f, 1605541824 + 16 * n,
+                              dict(paramset_b, tempf=60.0 + n))
+        self.addCleanup(os.remove, self.path)
+
+    def test_replay_twice(self):
+        """Each replay_file runs its own event loop; the listener's
+        queues must follow it to the new one."""
+        ws = EcoWittListener()
+        seen = []
+
+        async def listener(data):
+            seen.append(data["tempf"])
+        ws.register_listener(listener)
+
+        for run in range(2):
+            stats = replay_file(ws, self.path, speed=None)
+            self.assertEqual(stats["packets"], PACKETS)
+            self.assertEqual(stats["errors"], 0)
+            self.assertEqual(stats["dropped"], 0)
+        expected = [60.0 + n for n in range(PACKETS)]
+        self.assertEqual(seen, expected * 2)
+        asyncio.run(ws.stop())
+
+
+if __name__ == "__main__":
+    unittest.main()
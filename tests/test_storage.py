@@ -0,0 +1,78 @@
+"""Writing packets to an EcoWittHistoryLog and reading them back."""
+import os
+import tempfile
+import unittest
+
+from pyecowitt.storage import EcoWittHistoryLog, INDEX_INTERVAL
+
+START = 1605541824
+# longer than an int32 of milliseconds
+GAP = 30 * 86400
+
+
+class TestHistoryLog(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = tmp.name
+
+    def segments(self, log, station=None):
+        return [path for _, path in log._segments(station)]
+
+    def test_round_trip(self):
+        """Several keyframes and segments, every third packet without
+        humidity, read back whole and in ranges spanning segments."""
+        log = EcoWittHistoryLog(self.path, segment_rows=INDEX_INTERVAL * 2)
+        times = [START + 16 * n for n in range(INDEX_INTERVAL * 5 + 7)]
+        temps = [round(60.0 + 0.37 * n, 2) for n in range(len(times))]
+        for n, (ts, temp) in enumerate(zip(times, temps)):
+            packet = {"PASSKEY": "K", "tempf": temp}
+            if n % 3:
+                packet["humidity"] = n % 100
+            log.append(None, ts, packet)
+        log.close()
+        self.assertEqual(len(self.segments(log)), 3)
+
+        self.assertEqual(log.read("tempf"), (times, temps))
+        ts, humidity = log.read("humidity")
+        self.assertEqual(ts, [t for n, t in enumerate(times) if n % 3])
+        self.assertEqual(humidity, [n % 100 for n in range(len(times))
+                                    if n % 3])
+        # across the first segment boundary, starting between keyframes
+        lo, hi = 100, INDEX_INTERVAL * 2 + 40
+        self.assertEqual(log.read("tempf", times[lo], times[hi]),
+                         (times[lo:hi + 1], temps[lo:hi + 1]))
+        self.assertEqual(log.read("uv"), ([], []))
+
+    def test_overflowing_delta_rolls_segment(self):
+        """A station away for longer than an int32 delta can hold starts
+        a new segment instead of corrupting the timestamps."""
+        log = EcoWittHistoryLog(self.path)
+        times = [START, START + 16, START + 16 + GAP, START + 32 + GAP]
+        for n, ts in enumerate(times):
+            log.append("K", ts, {"tempf": 60.0 + n})
+        log.close()
+        segments = self.segments(log, "K")
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(int(os.path.basename(segments[1])),
+                         (START + 16 + GAP) * 1000)
+        self.assertEqual(log.read("tempf", station_id="K"),
+                         (times, [60.0, 61.0, 62.0, 63.0]))
+        self.assertEqual(log.read("tempf", START + GAP, station_id="K"),
+                         (times[2:], [62.0, 63.0]))
+
+    def test_unstorable_value_is_missing(self):
+        """A value whose delta does not fit is stored as MISSING, and the
+        column picks up again after it."""
+        log = EcoWittHistoryLog(self.path)
+        values = [1.0, 1e9, 2.0, 3.0]
+        with self.assertLogs("pyecowitt.storage", "WARNING"):
+            for n, value in enumerate(values):
+                log.append(None, START + n, {"rainratein": value})
+        log.close()
+        self.assertEqual(log.read("rainratein"),
+                         ([START, START + 2, START + 3], [1.0, 2.0, 3.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()